@@ -0,0 +1,220 @@
+"""
+Benchmarks des modes de scan et des analyseurs de commentaires, sur des arborescences synthétiques.
+
+Exemples :
+    python -m benchmarks.run
+    python -m benchmarks.run --scale small --repeat 1 -o rapport.json
+    python -m benchmarks.run --scenario flutter --scenario wide --compare ancien_rapport.json
+
+Le rapport JSON contient, pour chaque couple (scénario, cible), le meilleur temps sur --repeat
+exécutions, le débit en fichiers/s et Mo/s et le pic mémoire mesuré par tracemalloc lors d'une
+exécution séparée (tracemalloc ralentit le code mesuré). Les fichiers et octets comptés sont ceux
+que la cible a réellement traités : texte produit pour les modes de scan, taille des fichiers
+analysés pour les commentaires. Le pic mémoire ne couvre que le processus principal.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import SCALES, SCENARIOS, build_tree
+from src.logic import comment_processor, file_processor
+from src.logic.comment_index import index_comments
+
+# Version du format du rapport, à incrémenter si les champs changent
+REPORT_FORMAT = 1
+
+# Scénarios mesurés par chaque cible ; les analyseurs de commentaires n'ont de sens que sur du code
+SCAN_SCENARIOS = ("deep", "wide", "tiny_files", "huge_files", "binary_blobs", "flutter")
+COMMENT_SCENARIOS = ("python_comments", "python_plain", "dart_comments", "flutter")
+
+
+def _consume_blocks(generator):
+    """Consomme un générateur de blocs ; renvoie (blocs produits, octets de texte produits)."""
+    items = 0
+    output_bytes = 0
+    for block in generator:
+        items += 1
+        output_bytes += sum(len(part.encode('utf-8')) for part in block[1:] if isinstance(part, str))
+    return items, output_bytes
+
+
+def _scan_target(mode):
+    def run(tree):
+        return _consume_blocks(file_processor.create_processor(mode, tree.path))
+    return run
+
+
+def _find_comments_target(tree):
+    """Analyse séquentielle : find_code_files puis find_comments_in_file sur chaque fichier."""
+    files = 0
+    read_bytes = 0
+    for file_path in comment_processor.find_code_files(tree.path):
+        files += 1
+        read_bytes += os.path.getsize(file_path)
+        for _ in comment_processor.find_comments_in_file(file_path, set()):
+            pass
+    return files, read_bytes
+
+
+def _index_comments_target(tree):
+    """Indexation parallèle (pool de processus), telle que lancée par l'interface."""
+    files = 0
+    read_bytes = 0
+    for file_path, _ in index_comments(comment_processor.find_code_files(tree.path), set()):
+        files += 1
+        read_bytes += os.path.getsize(file_path)
+    return files, read_bytes
+
+
+# Cible -> (fonction mesurée, scénarios concernés)
+TARGETS = {
+    "process_directory_content": (_scan_target("content"), SCAN_SCENARIOS),
+    "process_project_directory": (_scan_target("project_scan"), SCAN_SCENARIOS),
+    "process_flutter_project": (_scan_target("flutter"), SCAN_SCENARIOS),
+    "process_directory_architecture": (_scan_target("architecture"), SCAN_SCENARIOS),
+    "find_comments_in_file": (_find_comments_target, COMMENT_SCENARIOS),
+    "index_comments": (_index_comments_target, COMMENT_SCENARIOS),
+}
+
+
+def _measure(func, tree, repeat):
+    """Meilleur temps sur repeat exécutions, puis une exécution sous tracemalloc pour le pic mémoire."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        files, processed_bytes = func(tree)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func(tree)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, files, processed_bytes, peak
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _metadata(args):
+    return {
+        "format": REPORT_FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "repeat": args.repeat,
+    }
+
+
+def run_benchmarks(args, work_dir):
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        targets = [(target, func) for target, (func, scenarios) in TARGETS.items()
+                   if name in scenarios and (not args.target or target in args.target)]
+        if not targets:
+            continue
+
+        tree = build_tree(name, os.path.join(work_dir, name), SCALES[args.scale], args.seed)
+        print(f"{name} : {tree.files} fichiers, {tree.bytes / 1e6:.1f} Mo", file=sys.stderr)
+        for target, func in targets:
+            seconds, files, processed_bytes, peak = _measure(func, tree, args.repeat)
+            result = {
+                "scenario": name,
+                "target": target,
+                "tree_files": tree.files,
+                "tree_bytes": tree.bytes,
+                "files": files,
+                "bytes": processed_bytes,
+                "seconds": round(seconds, 6),
+                "files_per_s": round(files / seconds, 1) if seconds else None,
+                "mb_per_s": round(processed_bytes / 1e6 / seconds, 2) if seconds else None,
+                "peak_memory_bytes": peak,
+            }
+            results.append(result)
+            print(f"  {target:<32} {seconds:8.3f} s  {result['files_per_s'] or 0:>10.0f} fichiers/s"
+                  f"  {result['mb_per_s'] or 0:>8.1f} Mo/s  pic {peak / 1e6:7.1f} Mo", file=sys.stderr)
+    return results
+
+
+def compare_reports(baseline, results):
+    """Affiche le rapport de temps (actuel / référence) pour chaque mesure présente des deux côtés."""
+    previous = {(r["scenario"], r["target"]): r for r in baseline.get("results", [])}
+    print(f"Comparaison avec {baseline.get('metadata', {}).get('git_commit') or 'la référence'} :", file=sys.stderr)
+    for result in results:
+        old = previous.get((result["scenario"], result["target"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        memory_ratio = result["peak_memory_bytes"] / old["peak_memory_bytes"] if old["peak_memory_bytes"] else 0
+        print(f"  {result['scenario']:<16} {result['target']:<32} temps x{ratio:.2f}  mémoire x{memory_ratio:.2f}",
+              file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Benchmarks des modes de scan et des analyseurs de commentaires.")
+    parser.add_argument("--scale", choices=list(SCALES), default="default", help="Taille des arborescences")
+    parser.add_argument("--seed", type=int, default=1234, help="Graine des arborescences (défaut : 1234)")
+    parser.add_argument("--repeat", type=int, default=3, help="Exécutions par mesure, le meilleur temps est gardé")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scénario à mesurer (répétable, défaut : tous)")
+    parser.add_argument("--target", action="append", choices=list(TARGETS),
+                        help="Cible à mesurer (répétable, défaut : toutes)")
+    parser.add_argument("-o", "--output", help="Fichier du rapport JSON (défaut : sortie standard)")
+    parser.add_argument("--compare", help="Rapport JSON de référence à comparer")
+    parser.add_argument("--work-dir", help="Dossier des arborescences générées (conservé après l'exécution)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.repeat = max(1, args.repeat)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="code_reader_bench_")
+    try:
+        results = run_benchmarks(args, work_dir)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {"metadata": _metadata(args), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        try:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Erreur lecture {args.compare}: {e}", file=sys.stderr)
+            return 1
+        compare_reports(baseline, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
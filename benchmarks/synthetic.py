@@ -0,0 +1,192 @@
+"""
+Arborescences synthétiques reproductibles pour les benchmarks.
+
+Chaque scénario est construit à partir d'une graine fixe : deux exécutions produisent
+exactement les mêmes fichiers, octet pour octet, ce qui rend les rapports comparables
+d'une version à l'autre.
+"""
+import os
+import random
+from collections import namedtuple
+
+# Description d'une arborescence générée : nombre de fichiers écrits et taille totale
+TreeStats = namedtuple("TreeStats", "name path files bytes")
+
+# Facteur appliqué aux volumes de chaque scénario
+SCALES = {"small": 0.1, "default": 1.0, "large": 4.0}
+
+_WORDS = ("alpha", "beta", "gamma", "delta", "value", "index", "buffer", "result", "config", "widget",
+          "state", "build", "context", "item", "count", "parse", "render", "stream", "cache", "node")
+
+
+class _TreeWriter:
+    def __init__(self, root, seed):
+        self.root = root
+        self.rng = random.Random(seed)
+        self.files = 0
+        self.bytes = 0
+
+    def write(self, relative_path, data):
+        path = os.path.join(self.root, *relative_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.files += 1
+        self.bytes += len(data)
+
+    def words(self, count):
+        return " ".join(self.rng.choice(_WORDS) for _ in range(count))
+
+    def text_lines(self, count):
+        return "".join(f"{self.words(self.rng.randint(3, 12))}\n" for _ in range(count))
+
+    def python_source(self, functions):
+        """Source Python dense en commentaires : docstrings, # en fin de ligne, # dans des chaînes."""
+        rng = self.rng
+        parts = [f'"""{self.words(8)}."""\nimport os  # {self.words(3)}\n\n']
+        for i in range(functions):
+            name = f"{rng.choice(_WORDS)}_{i}"
+            parts.append(
+                f"def {name}(value):\n"
+                f'    """{self.words(6)}\n\n    {self.words(10)}\n    """\n'
+                f"    # {self.words(rng.randint(3, 9))}\n"
+                f"    text = \"# {self.words(2)}\"  # {self.words(4)}\n"
+                f"    return value * {i} + len(text)\n\n"
+            )
+        return "".join(parts)
+
+    def python_plain_source(self, functions):
+        """Source Python sans commentaire ni docstring (code généré, migrations) : chaînes dans des expressions."""
+        rng = self.rng
+        parts = ["import os\n\n"]
+        for i in range(functions):
+            name = f"{rng.choice(_WORDS)}_{i}"
+            parts.append(
+                f"def {name}(value):\n"
+                f"    text = \"{self.words(rng.randint(2, 6))}\"\n"
+                f"    return value * {i} + len(text)\n\n"
+            )
+        return "".join(parts)
+
+    def dart_source(self, classes):
+        """Source Dart dense en commentaires : //, ///, blocs imbriqués, chaînes interpolées et brutes."""
+        rng = self.rng
+        parts = ["// Copyright (c) Synthetic Authors. All rights reserved.\n",
+                 "import 'package:flutter/material.dart'; // import\n\n"]
+        for i in range(classes):
+            name = f"{rng.choice(_WORDS).capitalize()}Widget{i}"
+            parts.append(
+                f"/// {self.words(8)}\n"
+                f"class {name} extends StatelessWidget {{\n"
+                f"  /* {self.words(6)}\n     /* {self.words(3)} */\n  */\n"
+                f"  final String label = 'http://example.com/{i} // ${{{i} + 1}}'; // {self.words(4)}\n"
+                f"  final String raw = r'\\d+ /* pas un commentaire */';\n"
+                f"  @override\n"
+                f"  Widget build(BuildContext context) {{\n"
+                f"    // {self.words(rng.randint(3, 9))}\n"
+                f"    return Text(label);\n"
+                f"  }}\n"
+                f"}}\n\n"
+            )
+        return "".join(parts)
+
+
+def _count(base, scale):
+    return max(1, int(base * scale))
+
+
+def _deep_tree(writer, scale):
+    """Chaînes de dossiers profondes, quelques fichiers à chaque niveau."""
+    for branch in range(_count(8, scale)):
+        path = f"branch{branch}"
+        for depth in range(24):
+            path += f"/level{depth}"
+            for i in range(3):
+                writer.write(f"{path}/file{i}.txt", writer.text_lines(20))
+
+
+def _wide_tree(writer, scale):
+    """Un seul dossier contenant des milliers de fichiers."""
+    for i in range(_count(5000, scale)):
+        writer.write(f"flat/file{i:05d}.py", writer.text_lines(10))
+
+
+def _tiny_files(writer, scale):
+    """Beaucoup de très petits fichiers répartis dans de nombreux dossiers."""
+    for i in range(_count(20000, scale)):
+        writer.write(f"pkg{i % 200}/mod{i}.js", f"export const v{i} = {i};\n")
+
+
+def _huge_files(writer, scale):
+    """Quelques fichiers volumineux (tronqués par le seuil d'extrait)."""
+    line = "x" * 79 + "\n"
+    size = _count(24 * 1024 * 1024, scale)
+    for i in range(3):
+        writer.write(f"data/huge{i}.log", line * (size // len(line)))
+    writer.write("data/README.md", writer.text_lines(50))
+
+
+def _binary_blobs(writer, scale):
+    """Fichiers binaires sans extension révélatrice, mélangés à du texte."""
+    for i in range(_count(300, scale)):
+        blob = bytes(writer.rng.getrandbits(8) for _ in range(writer.rng.randint(2048, 65536)))
+        writer.write(f"blobs/blob{i}.dat", blob)
+        writer.write(f"blobs/notes{i}.txt", writer.text_lines(15))
+
+
+def _flutter_project(writer, scale):
+    """Structure Flutter : lib/, assets/, test/, android/, ios/Pods (ignoré), build/ (ignoré)."""
+    writer.write("pubspec.yaml", "name: synthetic_app\ndependencies:\n  flutter:\n    sdk: flutter\n")
+    writer.write("analysis_options.yaml", "include: package:flutter_lints/flutter.yaml\n")
+    for i in range(_count(400, scale)):
+        writer.write(f"lib/feature{i % 20}/widget{i}.dart", writer.dart_source(3))
+    for i in range(_count(100, scale)):
+        writer.write(f"test/widget{i}_test.dart", writer.dart_source(1))
+    for i in range(_count(200, scale)):
+        writer.write(f"assets/images/img{i}.png", b"\x89PNG\r\n\x1a\n" + bytes(4096))
+    for i in range(_count(30, scale)):
+        writer.write(f"lib/l10n/app_{i}.arb", '{"hello": "%s"}\n' % writer.words(3))
+    writer.write("android/app/build.gradle", writer.text_lines(40))
+    writer.write("android/app/src/main/AndroidManifest.xml", "<manifest>\n</manifest>\n")
+    for i in range(_count(300, scale)):
+        writer.write(f"ios/Pods/Lib{i % 10}/file{i}.h", writer.text_lines(30))
+    for i in range(_count(300, scale)):
+        writer.write(f"build/intermediates/out{i}.dart", writer.dart_source(1))
+
+
+def _python_comments(writer, scale):
+    for i in range(_count(400, scale)):
+        writer.write(f"py/module{i % 25}/file{i}.py", writer.python_source(25))
+
+
+def _python_plain(writer, scale):
+    for i in range(_count(400, scale)):
+        writer.write(f"py/module{i % 25}/plain{i}.py", writer.python_plain_source(25))
+
+
+def _dart_comments(writer, scale):
+    for i in range(_count(400, scale)):
+        writer.write(f"dart/feature{i % 25}/file{i}.dart", writer.dart_source(12))
+
+
+SCENARIOS = {
+    "deep": _deep_tree,
+    "wide": _wide_tree,
+    "tiny_files": _tiny_files,
+    "huge_files": _huge_files,
+    "binary_blobs": _binary_blobs,
+    "flutter": _flutter_project,
+    "python_comments": _python_comments,
+    "python_plain": _python_plain,
+    "dart_comments": _dart_comments,
+}
+
+
+def build_tree(name, root, scale=1.0, seed=1234):
+    """Génère le scénario name dans root (qui doit être vide ou absent) ; renvoie TreeStats."""
+    os.makedirs(root, exist_ok=True)
+    writer = _TreeWriter(root, f"{name}:{seed}")
+    SCENARIOS[name](writer, scale)
+    return TreeStats(name, root, writer.files, writer.bytes)
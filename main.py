@@ -1,5 +1,9 @@
+import multiprocessing
+
 from src.app import DirectoryReaderApp
 
 if __name__ == "__main__":
+    # Indispensable pour le pool de processus d'indexation dans un exécutable figé (PyInstaller)
+    multiprocessing.freeze_support()
     app = DirectoryReaderApp()
     app.mainloop()
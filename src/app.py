@@ -3,18 +3,39 @@ from tkinter import ttk, filedialog, messagebox, simpledialog
 import os
 import threading
 import queue
+import time
 
 import sv_ttk
 import darkdetect
 from src.utils.windows_style import apply_windows_titlebar_style
 
-from src.logic.config_manager import ConfigManager
-from src.logic import file_processor, comment_processor
+from src.logic.config_manager import ConfigManager, SCAN_PROFILES_DIR
+from src.logic.scan_cache import ScanCache
+from src.logic.scan_channel import ScanChannel
+from src.logic.scan_stats import ScanProfiler, ScanStats
+from src.logic.comment_index import CommentIndex, index_comments
+from src.logic.kept_comments import GLOBAL_SCOPE, project_scope
+from src.logic.live_scan import create_live_scan, shown_block
+from src.logic import file_processor, comment_processor, exporter
 from src.ui.favorites_view import FavoritesView
 from src.ui.text_view import TextView
 from src.ui.comment_remover_view import CommentRemoverView
 from src.ui.settings_view import SettingsView
 
+# Le thread de scan regroupe le texte produit avant de l'envoyer à l'interface
+APPEND_BATCH_CHARS = 256 * 1024
+APPEND_BATCH_SECONDS = 0.05
+# Temps maximal passé par le thread Tk à vider la file, par cycle
+FRAME_BUDGET_SECONDS = 0.012
+QUEUE_POLL_IDLE_MS = 30
+# Fréquence de lecture des mises à jour du suivi de dossier
+WATCH_POLL_MS = 200
+
+
+def _format_count(count):
+    """Nombre avec séparateur de milliers à la française (1 204)."""
+    return f"{count:,}".replace(",", "\u202f")
+
 
 class DirectoryReaderApp(tk.Tk):
     def __init__(self):
@@ -29,20 +50,62 @@ class DirectoryReaderApp(tk.Tk):
         self.mode = 'content'
         
         self.saved_paths = ConfigManager.load_saved_paths()
-        self.kept_comments = ConfigManager.load_kept_comments()
+        # Hashes gardés visibles depuis le projet en revue (globaux + propres au projet), chargés depuis la base
+        self.kept_store = ConfigManager.open_kept_comments()
+        self.kept_comments = set()
+        self.kept_scope = GLOBAL_SCOPE
         self.ignored_extensions = ConfigManager.load_ignored_extensions()
         self.ignored_folders = ConfigManager.load_ignored_folders()
+        self.scan_options = ConfigManager.load_scan_options()
 
-        self.comment_files_to_process = []
-        self.current_comment_file_index = 0
-        self.current_comment_iterator = None
+        # Revue des commentaires : index alimenté par les processus d'analyse, position de la revue
+        self.comment_index = None
+        self.comment_position = 0
         self.current_comment_info = None
-
-        self.msg_queue = queue.Queue()
+        # Fichiers revus gardés en mémoire, chacun écrit une fois (voir ReviewSession)
+        self.review_session = None
+        # Suppression d'un groupe en cours dans un thread, qui modifie et écrit la session de revue
+        self.group_discard_running = False
+        self.group_discard_thread = None
+        self.comment_queue = queue.Queue()
+        self.comment_job = 0  # Incrémenté à chaque projet : les messages d'une indexation précédente sont ignorés
+
+        # Résultat de l'export en cours, posé par son thread : None tant qu'il n'est pas terminé
+        self.export_result = None
+
+        # File bornée entre le thread de scan et l'interface, une par scan (voir ScanChannel)
+        self.scan_channel = ScanChannel()
         self.is_processing = False
+        # Chaque scan est un job numéroté : lancer un nouveau scan, revenir à l'accueil ou fermer la fenêtre
+        # annule le job en cours, et les messages d'un job remplacé sont ignorés
+        self.scan_job = 0
+        self.scan_cancel = threading.Event()
+        # Seul le dernier statut compte : il n'est pas mis en file, le thread Tk le lit à chaque cycle.
+        # (job, texte) : le statut d'un scan remplacé n'est jamais affiché
+        self.latest_status = None
+        self.scan_has_output = False
+        # Blocs affichés (chemin relatif, lignes, est_un_asset) en mode contenu, pour le suivi du dossier
+        self.scan_blocks = []
+        self.scan_complete = False
+        # Compteurs et chronomètres du scan en cours ; profilage si l'option profile_scans est active
+        self.scan_stats = None
+        self.scan_profiler = None
+
+        # Cache du dernier répertoire scanné (clé : chemin + mode), réutilisé par le refresh
+        self.scan_cache_key = None
+        self.scan_cache = None
+
+        # Suivi du dossier affiché (bouton Suivre) : numéroté comme les scans, les messages d'un suivi arrêté
+        # sont ignorés. Il reprend à la fin de chaque scan tant que le bouton reste enfoncé.
+        self.watch_var = tk.BooleanVar(value=False)
+        self.watch_job = 0
+        self.watch_stop = threading.Event()
+        self.watch_queue = queue.Queue()
+        self.watch_kind = None
 
         self.create_widgets()
         self.show_favorites_screen()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def create_widgets(self):
         style = ttk.Style()
@@ -57,6 +120,8 @@ class DirectoryReaderApp(tk.Tk):
         self.select_button.pack(side=tk.LEFT)
         self.copy_button = ttk.Button(top_frame, text="📋 Copier", command=self.copy_to_clipboard, state=tk.DISABLED)
         self.copy_button.pack(side=tk.LEFT, padx=10)
+        self.export_button = ttk.Button(top_frame, text="📤 Exporter", command=self.export_to_file, state=tk.DISABLED)
+        self.export_button.pack(side=tk.LEFT)
 
         right_frame = ttk.Frame(top_frame)
         right_frame.pack(side=tk.RIGHT)
@@ -66,6 +131,9 @@ class DirectoryReaderApp(tk.Tk):
         self.refresh_button = ttk.Button(right_frame, text="🔄 Refresh", command=self.refresh_directory,
                                          state=tk.DISABLED)
         self.refresh_button.pack(side=tk.LEFT, padx=5)
+        self.watch_button = ttk.Checkbutton(right_frame, text="👁 Suivre", variable=self.watch_var,
+                                            command=self.toggle_watch, style="Toggle.TButton", state=tk.DISABLED)
+        self.watch_button.pack(side=tk.LEFT)
         
         self.status_frame = ttk.Frame(right_frame)
         self.status_frame.pack(side=tk.LEFT, padx=10)
@@ -74,6 +142,7 @@ class DirectoryReaderApp(tk.Tk):
         self.status_label.pack(side=tk.LEFT)
         
         self.progress_bar = ttk.Progressbar(self.status_frame, mode='indeterminate', length=100)
+        self.cancel_button = ttk.Button(self.status_frame, text="⏹ Annuler", command=self.cancel_scan)
 
         self.main_container = ttk.Frame(self)
         self.main_container.pack(expand=True, fill=tk.BOTH, padx=10, pady=5)
@@ -85,6 +154,8 @@ class DirectoryReaderApp(tk.Tk):
 
 
     def show_favorites_screen(self):
+        self._abandon_scan()
+        self._stop_watch()
         self._hide_all_views()
         self.home_button.pack_forget()
         self.select_button.pack(side=tk.LEFT, before=self.copy_button)
@@ -103,6 +174,8 @@ class DirectoryReaderApp(tk.Tk):
         self.text_view.pack(expand=True, fill=tk.BOTH)
 
     def show_comment_remover_screen(self):
+        self._abandon_scan()
+        self._stop_watch()
         self._hide_all_views()
         self.home_button.pack(side=tk.LEFT, padx=(0, 10), before=self.select_button)
         self.select_button.pack_forget()
@@ -111,6 +184,8 @@ class DirectoryReaderApp(tk.Tk):
         self._disable_action_buttons()
 
     def show_settings_screen(self):
+        self._abandon_scan()
+        self._stop_watch()
         self._hide_all_views()
         self.home_button.pack_forget()
         self.select_button.pack_forget()
@@ -127,58 +202,227 @@ class DirectoryReaderApp(tk.Tk):
         self.settings_view.pack_forget()
         
     def _disable_action_buttons(self):
-        for btn in [self.copy_button, self.refresh_button, self.save_button]:
+        for btn in [self.copy_button, self.export_button, self.refresh_button, self.save_button, self.watch_button]:
             btn.config(state=tk.DISABLED)
             
     def _enable_action_buttons(self):
-        for btn in [self.copy_button, self.refresh_button, self.save_button]:
+        for btn in [self.copy_button, self.export_button, self.refresh_button, self.save_button, self.watch_button]:
             btn.config(state=tk.NORMAL)
 
     def start_comment_scan(self):
-        project_path = filedialog.askdirectory(title="Choisissez un projet (Dart/Python)")
-        if not project_path: return
-        self.comment_files_to_process = comment_processor.find_code_files(project_path)
-        if not self.comment_files_to_process:
-            messagebox.showinfo("Information", "Aucun fichier .dart ou .py n'a été trouvé.")
+        if self.group_discard_running:
+            # La session de revue ne peut pas être fermée pendant que ses fichiers sont modifiés
+            messagebox.showinfo("Information", "Suppression des occurrences en cours, réessayez dans un instant.")
             return
-        self.current_comment_file_index = 0
-        self.process_next_comment_file()
+        project_path = filedialog.askdirectory(title="Choisissez un projet (Dart, Python, JS/TS, C#, Java, Kotlin, Go, C/C++)")
+        if not project_path: return
+
+        self._close_review_session()
+        self.comment_job += 1
+        job = self.comment_job
+        scope = project_scope(project_path)
+        self.kept_comments = self.kept_store.hashes_for(scope)
+        # Les nouveaux choix vont au projet ou à la portée globale selon le réglage
+        self.kept_scope = scope if self.scan_options.get("kept_comments_per_project") else GLOBAL_SCOPE
+        self.review_session = comment_processor.ReviewSession()
+        self.comment_index = CommentIndex()
+        self.comment_position = 0
+        self.current_comment_info = None
+        self.comment_remover_view.show_indexing(project_path)
+
+        threading.Thread(target=self._background_comment_index, args=(job, project_path, set(self.kept_comments)),
+                         daemon=True).start()
+        self.after(50, lambda: self._process_comment_queue(job))
+
+    def _background_comment_index(self, job, project_path, kept_hashes):
+        """
+        Recherche les fichiers (parcours élagué selon les paramètres) et les indexe au fil de l'eau
+        dans le pool de processus ; chaque fichier analysé est transmis à l'interface.
+        """
+        def discovered_files():
+            count = 0
+            for file_path in comment_processor.find_code_files(
+                    project_path, self.ignored_extensions, self.ignored_folders,
+                    self.scan_options.get("use_gitignore", False)):
+                if job != self.comment_job: return
+                count += 1
+                yield file_path
+            self.comment_queue.put(("discovered", job, count))
 
-    def process_next_comment_file(self):
-        if self.current_comment_file_index < len(self.comment_files_to_process):
-            file_path = self.comment_files_to_process[self.current_comment_file_index]
-            self.current_comment_iterator = comment_processor.find_comments_in_file(file_path, self.kept_comments)
+        try:
+            for file_path, comments in index_comments(discovered_files(), kept_hashes):
+                if job != self.comment_job: break
+                self.comment_queue.put(("file", job, (file_path, comments)))
+            self.comment_queue.put(("done", job, None))
+        except Exception as e:
+            self.comment_queue.put(("error", job, str(e)))
+
+    def _process_comment_queue(self, job):
+        if job != self.comment_job: return
+        deadline = time.perf_counter() + FRAME_BUDGET_SECONDS
+        finished = False
+        try:
+            while time.perf_counter() < deadline:
+                msg_type, msg_job, data = self.comment_queue.get_nowait()
+                if msg_job != job: continue
+                if msg_type == "file":
+                    self.comment_index.add_file(*data)
+                elif msg_type == "discovered":
+                    self.comment_index.total_files = data
+                elif msg_type == "error":
+                    messagebox.showerror("Erreur", f"Erreur durant l'indexation des commentaires : {data}")
+                    finished = True
+                    break
+                elif msg_type == "done":
+                    finished = True
+                    break
+        except queue.Empty:
+            pass
+
+        if finished:
+            self.comment_index.complete = True
+            if self.comment_index.total_files == 0:
+                self.comment_index = None
+                self.comment_remover_view.show_final_message("Aucun fichier de code pris en charge n'a été trouvé.")
+                messagebox.showinfo("Information", "Aucun fichier de code pris en charge n'a été trouvé.")
+                return
+        # La revue démarre dès le premier fichier indexé ; sinon on met simplement à jour les compteurs
+        if self.group_discard_running:
+            pass
+        elif self.current_comment_info is None:
             self.show_next_comment()
         else:
-            self.comment_remover_view.show_final_message("Tous les fichiers ont été traités !")
-            messagebox.showinfo("Terminé", "Traitement terminé.")
+            self._update_comment_progress()
+
+        if not finished:
+            self.after(1 if not self.comment_queue.empty() else QUEUE_POLL_IDLE_MS,
+                       lambda: self._process_comment_queue(job))
+
+    def _update_comment_progress(self):
+        index = self.comment_index
+        counts = (f"{_format_count(len(index))} commentaires distincts ({_format_count(index.comment_count)} occurrences)"
+                  f" dans {_format_count(index.files_with_comments)} fichiers")
+        if self.current_comment_info is not None:
+            text = f"Commentaire {_format_count(self.comment_position + 1)} sur {counts}"
+        else:
+            text = counts
+        if not index.complete:
+            if index.total_files is None:
+                text += f" — indexation : {_format_count(index.indexed_files)} fichiers (recherche en cours)"
+            else:
+                text += f" — indexation : {_format_count(index.indexed_files)} / {_format_count(index.total_files)} fichiers"
+        self.comment_remover_view.update_progress(text)
 
     def show_next_comment(self):
+        index = self.comment_index
+        if index is None: return
+        # Groupe entièrement traité, ou commentaire identique gardé depuis l'indexation
+        while self.comment_position < len(index):
+            group = index.group_at(self.comment_position)
+            group[:] = [comment for comment in group if comment["hash"] not in self.kept_comments]
+            if group:
+                break
+            self.comment_position += 1
+
+        if self.comment_position >= len(index):
+            self.current_comment_info = None
+            self._update_comment_progress()
+            if index.complete:
+                self._close_review_session()
+                self.comment_remover_view.show_final_message("Tous les fichiers ont été traités !")
+                messagebox.showinfo("Terminé", "Traitement terminé.")
+                self.comment_index = None
+            else:
+                self.comment_remover_view.show_waiting("En attente des prochains fichiers indexés...")
+            return
+
+        group = index.group_at(self.comment_position)
+        self.current_comment_info = group[0]
+        file_path = self.current_comment_info["file_path"]
         try:
-            self.current_comment_info = next(self.current_comment_iterator)
-            file_path = self.current_comment_info["file_path"]
-            with open(file_path, 'r', encoding='utf-8') as f: lines = f.readlines()
-            self.comment_remover_view.update_display(file_path, self.current_comment_info, lines)
-        except StopIteration:
-            self.current_comment_file_index += 1
-            self.process_next_comment_file()
+            lines = self.review_session.lines(file_path)
+            occurrence_files = len({comment["file_path"] for comment in group})
+            self.comment_remover_view.update_display(file_path, self.current_comment_info, lines,
+                                                     len(group), occurrence_files)
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lecture commentaires: {e}")
+        self._update_comment_progress()
 
     def keep_comment(self):
+        """Garder un commentaire garde toutes ses occurrences (hashes enregistrés de chacune)."""
         if self.current_comment_info:
-            self.kept_comments.add(self.current_comment_info["hash"])
-            ConfigManager.save_kept_comments(self.kept_comments)
+            hashes = {comment["hash"] for comment in self.comment_index.group_at(self.comment_position)}
+            self.kept_comments.update(hashes)
+            ConfigManager.save_kept_comments(self.kept_store, hashes, self.kept_scope)
+            self.comment_position += 1
             self.show_next_comment()
 
     def discard_comment(self):
         if self.current_comment_info:
-            if comment_processor.remove_comment_from_file(self.current_comment_info):
-                current_file = self.current_comment_info["file_path"]
-                self.current_comment_iterator = comment_processor.find_comments_in_file(current_file, self.kept_comments)
-                self.show_next_comment()
-            else:
-                self.show_next_comment()
+            comment_info = self.current_comment_info
+            following = self.comment_index.following_in_file(comment_info)
+            try:
+                self.review_session.discard(comment_info, following)
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Erreur lors de la suppression du commentaire : {e}")
+            # L'occurrence suivante du groupe, s'il y en a, est présentée ensuite
+            self.comment_index.group_at(self.comment_position).remove(comment_info)
+            self.show_next_comment()
+
+    def discard_comment_group(self):
+        """Jette toutes les occurrences du commentaire, en une passe d'écriture parallèle sur les fichiers touchés."""
+        if not self.current_comment_info: return
+        group = self.comment_index.group_at(self.comment_position)
+        removals = self.comment_index.removals_for(group)
+        group.clear()
+        self.current_comment_info = None
+        self.group_discard_running = True
+        self.comment_remover_view.disable_buttons()
+        self.comment_remover_view.update_progress(f"Suppression dans {_format_count(len(removals))} fichiers...")
+
+        session = self.review_session
+        result = []
+
+        def task():
+            try:
+                result.append(session.discard_in_files(removals))
+            except Exception as e:
+                result.append((0, [str(e)]))
+
+        self.group_discard_thread = threading.Thread(target=task, daemon=True)
+        self.group_discard_thread.start()
+        self.after(50, lambda: self._poll_group_discard(result))
+
+    def _poll_group_discard(self, result):
+        if not result:
+            self.after(50, lambda: self._poll_group_discard(result))
+            return
+        removed, errors = result[0]
+        self.group_discard_running = False
+        self.group_discard_thread = None
+        if errors:
+            messagebox.showerror("Erreur", "Impossible d'écrire certains fichiers :\n" + "\n".join(errors))
+        self.status_label.config(text=f"{_format_count(removed)} commentaires supprimés")
+        self.show_next_comment()
+
+    def _close_review_session(self):
+        """Écrit les fichiers modifiés par la revue en cours."""
+        if self.review_session is None: return
+        errors = self.review_session.close()
+        self.review_session = None
+        if errors:
+            messagebox.showerror("Erreur", "Impossible d'écrire certains fichiers :\n" + "\n".join(errors))
+
+    def _on_close(self):
+        self.comment_job += 1  # Arrête l'indexation en cours
+        self._abandon_scan()
+        self._stop_watch()
+        if self.group_discard_thread is not None:
+            # Les fichiers du groupe en cours de suppression sont terminés avant la fermeture de la session
+            self.group_discard_thread.join()
+        self._close_review_session()
+        self.kept_store.close()
+        self.destroy()
 
 
     def select_directory(self, mode):
@@ -205,16 +449,30 @@ class DirectoryReaderApp(tk.Tk):
             if messagebox.askyesno("Erreur", f"Chemin introuvable :\n{path}\nSupprimer ?"):
                 self.delete_favorite(path)
 
-    def update_settings(self, new_extensions, new_folders):
+    def update_settings(self, new_extensions, new_folders, new_scan_options):
         self.ignored_extensions = new_extensions
         self.ignored_folders = new_folders
+        self.scan_options = new_scan_options
         ConfigManager.save_ignored_extensions(self.ignored_extensions)
         ConfigManager.save_ignored_folders(self.ignored_folders)
+        ConfigManager.save_scan_options(self.scan_options)
+        self.scan_cache_key = None
+        self.scan_cache = None
         messagebox.showinfo("Succès", "Paramètres sauvegardés.")
         self.show_favorites_screen()
 
+    def forget_kept_comments(self):
+        if not messagebox.askyesno("Confirmation", "Oublier tous les commentaires gardés ?\n"
+                                                   "Ils seront de nouveau proposés à la revue."):
+            return
+        removed = ConfigManager.forget_kept_comments(self.kept_store)
+        self.kept_comments = set()
+        messagebox.showinfo("Succès", f"{removed} commentaires gardés oubliés.")
+
     
     def load_directory_content(self):
+        self._abandon_scan()
+        self._stop_watch()
         self.show_text_area_screen()
         self.text_view.clear()
         self._disable_action_buttons()
@@ -222,86 +480,297 @@ class DirectoryReaderApp(tk.Tk):
         self.status_label.config(text="Chargement en cours...")
         self.progress_bar.pack(side=tk.LEFT, padx=5)
         self.progress_bar.start(10)
-
+        self.cancel_button.config(state=tk.NORMAL)
+        self.cancel_button.pack(side=tk.LEFT)
+
+        self.scan_job += 1
+        job = self.scan_job
+        self.scan_cancel = threading.Event()
+        self.scan_channel = ScanChannel(int(self.scan_options["queue_budget_mb"] * 1024 * 1024),
+                                        spill=self.scan_options["spill_to_disk"])
         self.is_processing = True
+        self.latest_status = None
+        self.scan_has_output = False
+        self.scan_blocks = []
+        self.scan_complete = False
+        self.scan_stats = ScanStats()
+        self.scan_profiler = ScanProfiler(SCAN_PROFILES_DIR) if self.scan_options["profile_scans"] else None
+
+        cache_key = (self.current_directory, self.mode)
+        if cache_key != self.scan_cache_key:
+            self.scan_cache_key = cache_key
+            self.scan_cache = ScanCache()
+
+        # Le thread reçoit sa propre copie des paramètres : un scan suivant peut les changer à tout moment
+        processor = file_processor.create_processor(
+            self.mode, self.current_directory, self.ignored_extensions, self.ignored_folders,
+            stats=self.scan_stats, cancel=self.scan_cancel, cache=self.scan_cache,
+            **file_processor.processor_options_from_settings(self.scan_options)
+        )
+        threading.Thread(
+            target=self._background_scan_task,
+            args=(job, processor, self.mode in file_processor.CONTENT_MODES, self.scan_channel, self.scan_cancel,
+                  self.scan_stats, self.scan_profiler, self.scan_blocks),
+            daemon=True
+        ).start()
         
-        threading.Thread(target=self._background_scan_task, daemon=True).start()
-        
-        self.after(100, self._process_queue_msg)
+        self.after(100, lambda: self._process_queue_msg(job))
+
+    def cancel_scan(self):
+        """Bouton Annuler : arrête les lectures ; le résultat partiel reste affiché."""
+        if self.is_processing:
+            self.scan_cancel.set()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_label.config(text="Annulation...")
+
+    def _abandon_scan(self):
+        """Scan remplacé ou quitté : arrêt des lectures, ses messages restants seront ignorés."""
+        if not self.is_processing:
+            return
+        self.scan_cancel.set()
+        self.scan_job += 1
+        self.is_processing = False
+        # Débloque le thread de scan s'il attend de la place, et libère le texte en attente
+        self.scan_channel.close()
+        self._stop_progress()
 
-    def _background_scan_task(self):
+    def _stop_progress(self):
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
+        self.cancel_button.pack_forget()
+
+    def _background_scan_task(self, job, processor, is_content_mode, channel, cancel, stats, profiler, blocks):
+        """
+        Lit le scan et envoie le texte par lots dans channel ; quand l'interface a du retard,
+        channel.put bloque ce thread (temps compté dans la phase "queue").
+        En mode contenu, blocks reçoit la liste des blocs produits (voir ContentLiveScan).
+        """
+        if profiler is not None:
+            profiler.start()
         try:
-            processor = None
-            if self.mode == 'project_scan':
-                processor = file_processor.process_project_directory(
-                    self.current_directory, self.ignored_extensions, self.ignored_folders
-                )
-            elif self.mode == 'flutter':
-                processor = file_processor.process_flutter_project(
-                    self.current_directory, self.ignored_extensions, self.ignored_folders
-                )
-            elif self.mode == 'content':
-                processor = file_processor.process_directory_content(
-                    self.current_directory, self.ignored_extensions, self.ignored_folders
-                )
-            elif self.mode in ['architecture', 'folders_only']:
-                processor = file_processor.process_directory_architecture(
-                    self.current_directory, self.mode == 'folders_only',
-                    self.ignored_extensions, self.ignored_folders
-                )
-
-            if processor:
-                batch_text = []
-                count = 0
-                
-                for type, *args in processor:
-                    if not self.is_processing: break
-                    
-                    if type == "data":
-                        if self.mode in ['content', 'project_scan', 'flutter']:
-                            header, content, total_lines = args
-                            self.msg_queue.put(("append", header + content))
-                            self.msg_queue.put(("status", f"Lignes lues : {total_lines}"))
-                        else:
-                            line, total_elements = args
-                            self.msg_queue.put(("append", line))
-                            self.msg_queue.put(("status", f"Éléments : {total_elements}"))
-
-            self.msg_queue.put(("done", None))
+            batch_text = []
+            batch_chars = 0
+            last_flush = time.perf_counter()
+
+            for type, *args in processor:
+                if cancel.is_set(): break
+
+                if type == "data":
+                    if is_content_mode:
+                        header, content, total_lines = args
+                        batch_text.append(header)
+                        batch_text.append(content)
+                        batch_chars += len(header) + len(content)
+                        blocks.append(shown_block(header, content))
+                        self.latest_status = (job, f"Lignes lues : {total_lines}")
+                    else:
+                        line, total_elements = args
+                        batch_text.append(line)
+                        batch_chars += len(line)
+                        self.latest_status = (job, f"Éléments : {total_elements}")
+
+                    now = time.perf_counter()
+                    if batch_chars >= APPEND_BATCH_CHARS or now - last_flush >= APPEND_BATCH_SECONDS:
+                        channel.put(("append", job, "".join(batch_text)), batch_chars)
+                        batch_text = []
+                        batch_chars = 0
+                        last_flush = time.perf_counter()
+                        stats.add_time("queue", last_flush - now)
+
+            # Scan annulé : le dernier lot lu fait partie du résultat partiel.
+            # (un scan abandonné a fermé son canal : put ne bloque plus et ignore le texte)
+            if batch_text:
+                queued = time.perf_counter()
+                channel.put(("append", job, "".join(batch_text)), batch_chars)
+                stats.add_time("queue", time.perf_counter() - queued)
+            final_msg = ("cancelled" if cancel.is_set() else "done", job, None)
 
         except Exception as e:
-            self.msg_queue.put(("error", str(e)))
-
-    def _process_queue_msg(self):
+            final_msg = ("error", job, str(e))
+        finally:
+            # Fermeture explicite : les lectures non démarrées sont abandonnées tout de suite
+            processor.close()
+
+        stats.finish()
+        # Le profil est écrit avant le message final : _finish_loading y ajoute le rapport JSON
+        if profiler is not None:
+            profiler.stop()
+        channel.put(final_msg)
+
+    def _process_queue_msg(self, job):
+        """
+        Vide la file dans la limite de FRAME_BUDGET_SECONDS, puis insère tout le texte
+        reçu en un seul appel au widget et affiche le dernier statut connu.
+        Les messages d'un scan remplacé sont ignorés.
+        """
+        if job != self.scan_job: return
+        deadline = time.perf_counter() + FRAME_BUDGET_SECONDS
+        chunks = []
+        finished = None
         try:
-            for _ in range(50): 
-                msg_type, data = self.msg_queue.get_nowait()
-                
+            while time.perf_counter() < deadline:
+                msg_type, msg_job, data = self.scan_channel.get_nowait()
+                if msg_job != job: continue
+
                 if msg_type == "append":
-                    self.text_view.append_text(data)
-                elif msg_type == "status":
-                    self.status_label.config(text=data)
+                    chunks.append(data)
                 elif msg_type == "error":
+                    self._flush_chunks(chunks)
                     messagebox.showerror("Erreur", f"Erreur durant le scan : {data}")
-                elif msg_type == "done":
-                    self._finish_loading()
-                    return
-                
-            if self.is_processing:
-                self.after(50, self._process_queue_msg)
-                
+                    finished = msg_type
+                    break
+                elif msg_type in ("done", "cancelled"):
+                    finished = msg_type
+                    break
         except queue.Empty:
-            if self.is_processing:
-                self.after(50, self._process_queue_msg)
-
-    def _finish_loading(self):
+            pass
+
+        self._flush_chunks(chunks)
+        status = self._current_status(job)
+        if status is not None and not self.scan_cancel.is_set():
+            self.status_label.config(text=f"{status} · {self.scan_stats.summary()}")
+
+        if finished:
+            self.scan_complete = finished == "done"
+            self._finish_loading(cancelled=finished == "cancelled")
+        elif self.is_processing:
+            # File non vide : cycle suivant immédiat, sinon on laisse respirer la boucle Tk
+            self.after(1 if not self.scan_channel.empty() else QUEUE_POLL_IDLE_MS,
+                       lambda: self._process_queue_msg(job))
+
+    def _current_status(self, job):
+        latest = self.latest_status
+        if latest is None or latest[0] != job:
+            return None
+        return latest[1]
+
+    def _flush_chunks(self, chunks):
+        if chunks:
+            started = time.perf_counter()
+            self.text_view.append_text("".join(chunks))
+            self.scan_stats.add_time("render", time.perf_counter() - started)
+            self.scan_has_output = True
+            chunks.clear()
+
+    def _finish_loading(self, cancelled=False):
         self.is_processing = False
-        self.progress_bar.stop()
-        self.progress_bar.pack_forget()
+        self.scan_channel.close()
+        self._stop_progress()
         self._enable_action_buttons()
-        if self.text_view.get_content() == "":
+        stats = self.scan_stats
+        if cancelled:
+            self.text_view.append_text(f"\n[... scan annulé après {stats.elapsed:.1f} s : résultat partiel ...]\n")
+        elif not self.scan_has_output:
             self.text_view.append_text("Aucun contenu trouvé avec les filtres actuels.")
 
+        status = f"{'Annulé après' if cancelled else 'Terminé en'} {stats.elapsed:.1f} s"
+        latest = self._current_status(self.scan_job)
+        if latest is not None:
+            status += f" · {latest}"
+        status += f" · {stats.summary()}"
+        if self.scan_profiler is not None:
+            report_path = self.scan_profiler.write_report(
+                stats, path=self.current_directory, mode=self.mode, cancelled=cancelled,
+                queue_peak_chars=self.scan_channel.peak_chars, spilled_chars=self.scan_channel.spilled_chars
+            )
+            if report_path:
+                status += f" · rapport : {os.path.basename(report_path)}"
+            self.scan_profiler = None
+        self.status_label.config(text=status)
+        if self.watch_var.get():
+            self._start_watch()
+
+    def toggle_watch(self):
+        if self.watch_var.get():
+            self._start_watch()
+        else:
+            self._stop_watch()
+            self.status_label.config(text="Suivi arrêté")
+
+    def _start_watch(self):
+        """
+        Suit le dossier affiché : un fichier modifié n'est relu que lui-même, une création ou une suppression
+        ne remplace que les blocs ou lignes d'arbre concernés, sans rescan (voir live_scan).
+        """
+        self._stop_watch()
+        if not self.scan_complete:
+            # Un résultat partiel ne peut pas être tenu à jour bloc par bloc
+            self.watch_var.set(False)
+            self.status_label.config(text="Suivi impossible sur un scan incomplet : relancez le scan")
+            return
+
+        self.watch_job += 1
+        job = self.watch_job
+        self.watch_stop = threading.Event()
+        if self.mode in file_processor.CONTENT_MODES:
+            shown = list(self.scan_blocks)
+        else:
+            shown = self.text_view.store.get_text().split('\n')[:-1]
+        # Comme pour le scan, le thread reçoit sa propre copie des paramètres
+        live_scan = create_live_scan(
+            self.mode, self.current_directory, shown, list(self.ignored_extensions), list(self.ignored_folders),
+            **file_processor.processor_options_from_settings(self.scan_options)
+        )
+        threading.Thread(
+            target=self._background_watch, args=(job, live_scan, self.watch_stop, self.watch_queue), daemon=True
+        ).start()
+        self.after(WATCH_POLL_MS, lambda: self._process_watch_queue(job))
+
+    def _stop_watch(self):
+        self.watch_stop.set()
+        self.watch_job += 1
+
+    def _background_watch(self, job, live_scan, stop, watch_queue):
+        try:
+            watcher = live_scan.create_watcher()
+        except Exception as e:
+            watch_queue.put(("error", job, str(e)))
+            return
+        watch_queue.put(("started", job, watcher.kind))
+        try:
+            for _, edits in live_scan.watch(watcher, stop):
+                if edits is None:
+                    watch_queue.put(("overflow", job, None))
+                    return
+                if edits:
+                    watch_queue.put(("edits", job, edits))
+        except Exception as e:
+            watch_queue.put(("error", job, str(e)))
+        finally:
+            watcher.close()
+
+    def _process_watch_queue(self, job):
+        """Applique les remplacements envoyés par le thread de suivi ; ignore ceux d'un suivi arrêté."""
+        if job != self.watch_job: return
+        try:
+            while True:
+                msg_type, msg_job, data = self.watch_queue.get_nowait()
+                if msg_job != job: continue
+
+                if msg_type == "started":
+                    self.watch_kind = data
+                    self.status_label.config(text=f"{self.status_label.cget('text')} · suivi actif ({data})")
+                elif msg_type == "edits":
+                    if not self.scan_has_output:
+                        # Retire le message « Aucun contenu trouvé » avant le premier bloc
+                        self.text_view.clear()
+                        self.scan_has_output = True
+                    self.text_view.apply_edits(data)
+                    updated = time.strftime('%H:%M:%S')
+                    self.status_label.config(text=f"Suivi ({self.watch_kind}) : mis à jour à {updated}")
+                elif msg_type == "overflow":
+                    # Événements perdus par le système : seul un scan complet est fiable, le suivi reprend après
+                    self.load_directory_content()
+                    return
+                elif msg_type == "error":
+                    self._stop_watch()
+                    self.watch_var.set(False)
+                    messagebox.showerror("Erreur", f"Erreur durant le suivi : {data}")
+                    return
+        except queue.Empty:
+            pass
+        self.after(WATCH_POLL_MS, lambda: self._process_watch_queue(job))
+
     def save_current_path(self):
         if not self.current_directory: return
         # Vérification si déjà existant (sur le path uniquement)
@@ -336,6 +805,43 @@ class DirectoryReaderApp(tk.Tk):
         self.clipboard_append(content)
         messagebox.showinfo("Copié", "Contenu copié.")
 
+    def export_to_file(self):
+        """Écrit le résultat affiché dans un fichier (gzip si .gz), en streaming depuis le store de la vue."""
+        default_name = os.path.basename(os.path.normpath(self.current_directory or "scan")) + ".txt"
+        path = filedialog.asksaveasfilename(
+            title="Exporter le résultat", initialfile=default_name, defaultextension=".txt",
+            filetypes=[("Texte", "*.txt"), ("Texte compressé (gzip)", "*.gz"), ("Tous les fichiers", "*.*")]
+        )
+        if not path: return
+
+        self.export_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Export en cours...")
+        self.export_result = None
+        # Instantané pris ici : le suivi ou un refresh peuvent modifier le store pendant l'écriture
+        chunks = self.text_view.store.iter_text()
+
+        def task():
+            try:
+                self.export_result = ("ok", exporter.export_chunks(chunks, path))
+            except (OSError, ValueError) as e:
+                self.export_result = ("error", str(e))
+
+        threading.Thread(target=task, daemon=True).start()
+        self.after(100, lambda: self._poll_export(path))
+
+    def _poll_export(self, path):
+        if self.export_result is None:
+            self.after(100, lambda: self._poll_export(path))
+            return
+        status, data = self.export_result
+        self.export_button.config(state=tk.NORMAL)
+        if status == "ok":
+            self.status_label.config(text=f"Exporté : {data} caractères")
+            messagebox.showinfo("Exporté", f"Résultat exporté dans :\n{path}")
+        else:
+            self.status_label.config(text="Échec de l'export")
+            messagebox.showerror("Erreur", f"Impossible d'exporter le résultat : {data}")
+
 if __name__ == "__main__":
     app = DirectoryReaderApp()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Point d'entrée en ligne de commande (sans interface graphique).
+
+Exemples :
+    python cli.py scan ./mon_projet
+    python cli.py scan ./mon_projet --mode flutter -o sortie.txt
+    python cli.py scan ./mon_projet --mode architecture --ignore-folder generated
+    python cli.py strip ./vendor --dry-run -o commentaires.patch
+
+Ce module ne doit jamais importer tkinter, afin de démarrer rapidement
+dans les scripts et les conteneurs CI.
+"""
+import argparse
+import gzip
+import io
+import os
+import sys
+import time
+
+import sqlite3
+
+from src.logic import comment_processor, exporter, file_processor
+from src.logic.comment_index import map_files
+from src.logic.config_manager import (
+    ConfigManager, DEFAULT_IGNORED_EXTENSIONS, DEFAULT_IGNORED_FOLDERS, DEFAULT_SCAN_OPTIONS,
+    KEPT_COMMENTS_DB, KEPT_COMMENTS_FILE
+)
+from src.logic.kept_comments import project_scope, read_kept_hashes
+from src.logic.scan_stats import ScanStats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Lecteur de code en ligne de commande.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser("scan", help="Scanner un dossier et écrire le résultat.")
+    scan_parser.add_argument("path", help="Dossier à scanner")
+    scan_parser.add_argument("-m", "--mode", choices=file_processor.MODES, default="content",
+                             help="Mode de scan (défaut : content)")
+    scan_parser.add_argument("-o", "--output", help="Fichier de sortie (défaut : sortie standard)")
+    scan_parser.add_argument("-z", "--gzip", action="store_true", default=None,
+                             help="Compresser la sortie en gzip (automatique si le fichier se termine par .gz)")
+    scan_parser.add_argument("-w", "--workers", type=int, default=None,
+                             help="Threads de lecture (défaut : option de l'application)")
+    scan_parser.add_argument("--binary", choices=(file_processor.BINARY_LABEL, file_processor.BINARY_SKIP),
+                             default=None, help="Fichiers binaires : marqueur (label) ou omis (skip)")
+    scan_parser.add_argument("--max-file-size", type=float, default=None, metavar="MO",
+                             help="Taille au-delà de laquelle seul un extrait tête/queue est écrit (0 : désactivé)")
+    scan_parser.add_argument("--dedupe", action=argparse.BooleanOptionalAction, default=None,
+                             help="Remplacer les fichiers identiques à un fichier déjà écrit par un renvoi "
+                                  "(défaut : option de l'application)")
+    _add_filter_arguments(scan_parser)
+    scan_parser.set_defaults(func=run_scan)
+
+    strip_parser = subparsers.add_parser(
+        "strip", help="Retirer tous les commentaires non conservés des fichiers de code d'un dossier."
+    )
+    strip_parser.add_argument("path", help="Dossier à nettoyer")
+    strip_parser.add_argument("-n", "--dry-run", action="store_true",
+                              help="Ne rien modifier : écrire le diff unifié des suppressions")
+    strip_parser.add_argument("-o", "--output", help="Fichier du diff en simulation (défaut : sortie standard)")
+    strip_parser.add_argument("-w", "--workers", type=int, default=None,
+                              help="Processus d'analyse (défaut : un par cœur)")
+    strip_parser.add_argument("--ignore-kept", action="store_true",
+                              help="Retirer aussi les commentaires marqués comme gardés")
+    _add_filter_arguments(strip_parser)
+    strip_parser.set_defaults(func=run_strip)
+
+    return parser
+
+
+def _add_filter_arguments(parser):
+    parser.add_argument("--gitignore", action=argparse.BooleanOptionalAction, default=None,
+                        help="Respecter les .gitignore du projet (défaut : option de l'application)")
+    parser.add_argument("--ignore-ext", action="append", default=[], metavar="EXT",
+                        help="Extension ou motif de fichier supplémentaire à ignorer (répétable)")
+    parser.add_argument("--ignore-folder", action="append", default=[], metavar="NOM",
+                        help="Nom ou motif de dossier supplémentaire à ignorer (répétable)")
+    parser.add_argument("--no-config", action="store_true",
+                        help="Ignorer les paramètres enregistrés et partir des listes par défaut")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Ne pas afficher le résumé sur stderr")
+
+
+def _load_settings(args):
+    if args.no_config:
+        ignored_extensions = list(DEFAULT_IGNORED_EXTENSIONS)
+        ignored_folders = list(DEFAULT_IGNORED_FOLDERS)
+        processor_options = file_processor.processor_options_from_settings(DEFAULT_SCAN_OPTIONS)
+        processor_options["max_workers"] = None
+    else:
+        ignored_extensions = ConfigManager.load_ignored_extensions()
+        ignored_folders = ConfigManager.load_ignored_folders()
+        processor_options = file_processor.processor_options_from_settings(ConfigManager.load_scan_options())
+
+    if args.workers is not None:
+        processor_options["max_workers"] = args.workers
+    if getattr(args, "max_file_size", None) is not None:
+        processor_options["large_file_threshold"] = int(args.max_file_size * 1024 * 1024) or None
+    if args.gitignore is not None:
+        processor_options["use_gitignore"] = args.gitignore
+    if getattr(args, "binary", None) is not None:
+        processor_options["binary_files"] = args.binary
+    if getattr(args, "dedupe", None) is not None:
+        processor_options["dedupe"] = args.dedupe
+    return ignored_extensions + args.ignore_ext, ignored_folders + args.ignore_folder, processor_options
+
+
+def _open_output(path, compress):
+    if path is None:
+        if compress:
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=sys.stdout.buffer, mode='wb'), encoding='utf-8', newline='')
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except (AttributeError, ValueError):
+            pass
+        return sys.stdout
+    return exporter.open_export_file(path, compress)
+
+
+def run_scan(args):
+    base_path = os.path.abspath(args.path)
+    if not os.path.isdir(base_path):
+        print(f"Erreur : dossier introuvable : {args.path}", file=sys.stderr)
+        return 2
+
+    ignored_extensions, ignored_folders, processor_options = _load_settings(args)
+    stats = ScanStats()
+    processor = file_processor.create_processor(
+        args.mode, base_path, ignored_extensions, ignored_folders, stats=stats, **processor_options
+    )
+
+    start = time.perf_counter()
+    blocks = 0
+    total = 0
+    output = _open_output(args.output, args.gzip)
+    try:
+        for type, *data in processor:
+            if type != "data":
+                continue
+            if args.mode in file_processor.CONTENT_MODES:
+                header, content, total = data
+                output.write(header)
+                output.write(content)
+            else:
+                line, total = data
+                output.write(line)
+            blocks += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        else:
+            output.flush()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        unit = "lignes lues" if args.mode in file_processor.CONTENT_MODES else "éléments"
+        if blocks == 0:
+            print("Aucun contenu trouvé avec les filtres actuels.", file=sys.stderr)
+        print(f"{blocks} blocs, {total} {unit} en {elapsed:.2f} s", file=sys.stderr)
+        if stats.duplicate_files:
+            print(f"{stats.duplicate_files} fichiers identiques remplacés par un renvoi, "
+                  f"{stats.duplicate_bytes_saved} octets évités", file=sys.stderr)
+    return 0
+
+
+def _load_kept_hashes(base_path):
+    """
+    Hashes gardés (globaux et propres au projet) ; aucun si l'application n'en a jamais enregistré.
+    Lecture seule : même une simulation (--dry-run) ne doit rien modifier, pas même migrer l'ancien JSON.
+    """
+    return read_kept_hashes(KEPT_COMMENTS_DB, KEPT_COMMENTS_FILE, project_scope(base_path))
+
+
+def run_strip(args):
+    base_path = os.path.abspath(args.path)
+    if not os.path.isdir(base_path):
+        print(f"Erreur : dossier introuvable : {args.path}", file=sys.stderr)
+        return 2
+
+    ignored_extensions, ignored_folders, processor_options = _load_settings(args)
+    if args.ignore_kept:
+        kept_hashes = set()
+    else:
+        try:
+            kept_hashes = _load_kept_hashes(base_path)
+        except sqlite3.Error as e:
+            print(f"Erreur : impossible de lire les commentaires gardés : {e}", file=sys.stderr)
+            return 2
+
+    start = time.perf_counter()
+    code_files = comment_processor.find_code_files(
+        base_path, ignored_extensions, ignored_folders, processor_options["use_gitignore"]
+    )
+    results = []
+    scanned = 0
+    for file_path, result in map_files(comment_processor.strip_comments_from_file, code_files, kept_hashes,
+                                       max_workers=args.workers, dry_run=args.dry_run, base_path=base_path):
+        scanned += 1
+        removed, diff, error = result
+        if removed or error:
+            results.append((os.path.relpath(file_path, base_path).replace('\\', '/'), removed, diff, error))
+    # Les fichiers se terminent dans le désordre : la sortie est triée pour rester reproductible
+    results.sort()
+
+    if args.dry_run:
+        output = _open_output(args.output, False)
+        try:
+            for relative_path, removed, diff, error in results:
+                if diff:
+                    output.write(diff)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+            else:
+                output.flush()
+
+    errors = 0
+    total_removed = 0
+    for relative_path, removed, diff, error in results:
+        if error:
+            errors += 1
+            print(f"Erreur : {relative_path} : {error}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{removed:6d}  {relative_path}", file=sys.stderr)
+        total_removed += removed
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        verb = "seraient retirés" if args.dry_run else "retirés"
+        touched = len(results) - errors
+        print(f"{total_removed} commentaires {verb} dans {touched} fichiers ({scanned} analysés) en {elapsed:.2f} s",
+              file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Sortie fermée par le consommateur (ex : | head) : stdout est redirigé vers devnull pour que
+        # le vidage à la sortie de l'interpréteur n'échoue pas à son tour ; stderr reste utilisable
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
@@ -0,0 +1,120 @@
+import os
+import threading
+
+# Taille de la fenêtre lue en tête de fichier pour décider texte / binaire
+SNIFF_SIZE = 8192
+# Proportion maximale d'octets suspects (contrôle ou UTF-8 invalide) pour un fichier texte
+MAX_SUSPICIOUS_RATIO = 0.30
+# Nombre de verdicts concordants avant de figer le verdict d'une extension
+SETTLE_COUNT = 3
+
+MAGIC_NUMBERS = (
+    b'\x7fELF',              # Exécutables / .so Linux
+    b'MZ\x90\x00',           # Exécutables Windows
+    b'\xca\xfe\xba\xbe',     # Mach-O universel / .class Java
+    b'\xcf\xfa\xed\xfe',     # Mach-O 64 bits
+    b'\x00asm',              # WebAssembly
+    b'%PDF-',
+    b'SQLite format 3\x00',
+    b'wOFF', b'wOF2',        # Polices web
+    b'\x00\x01\x00\x00',     # TrueType
+    b'OTTO',                 # OpenType
+    b'PK\x03\x04',           # zip, jar, apk, docx, poids PyTorch
+    b'\x1f\x8b',             # gzip
+    b'BZh',                  # bzip2
+    b'\xfd7zXZ\x00',         # xz
+    b'7z\xbc\xaf\x27\x1c',   # 7z
+    b'(\xb5/\xfd',           # zstd
+    b'Rar!\x1a\x07',
+    b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'RIFF', b'OggS', b'ID3', b'fLaC',
+    b'\xd0\xcf\x11\xe0',     # Documents Office anciens
+    b'\x93NUMPY',            # .npy
+    b'\x89HDF',              # HDF5 / .h5
+    b'GGUF',                 # Poids de modèles llama.cpp
+    b'PAR1',                 # Parquet
+)
+# Signatures en ASCII imprimable ("BZh", "RIFF"...) : un fichier texte peut commencer par ces lettres,
+# elles ne suffisent qu'accompagnées d'octets NUL ou de contrôle dans la fenêtre lue
+_ASCII_MAGIC_NUMBERS = tuple(magic for magic in MAGIC_NUMBERS if all(32 <= b < 127 for b in magic))
+_BYTE_MAGIC_NUMBERS = tuple(magic for magic in MAGIC_NUMBERS if magic not in _ASCII_MAGIC_NUMBERS)
+
+# Extensions normalement textuelles : jamais figées comme binaires, chaque fichier reste analysé
+TEXT_EXTENSIONS = frozenset((
+    '.txt', '.md', '.rst', '.adoc', '.log', '.csv', '.tsv', '.json', '.xml', '.html', '.htm', '.css',
+    '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.env', '.properties',
+))
+
+# Octets de contrôle tolérés dans un fichier texte : \b \t \n \f \r ESC
+_TEXT_CONTROL_BYTES = {8, 9, 10, 12, 13, 27}
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in _TEXT_CONTROL_BYTES) + b'\x7f'
+
+
+def looks_binary(sample):
+    """Heuristique sur les premiers octets d'un fichier : True si le contenu semble binaire."""
+    if not sample:
+        return False
+    if sample.startswith(_BYTE_MAGIC_NUMBERS):
+        return True
+    if b'\x00' in sample:
+        return True
+
+    suspicious = len(sample) - len(sample.translate(None, _CONTROL_BYTES))
+    if suspicious and sample.startswith(_ASCII_MAGIC_NUMBERS):
+        return True
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # Une séquence multi-octets coupée par la fenêtre n'est pas une erreur
+        if e.start < len(sample) - 3 or e.reason != 'unexpected end of data':
+            text = sample[:-3].decode('utf-8', errors='replace')
+            suspicious += text.count('�')
+    return suspicious > len(sample) * MAX_SUSPICIOUS_RATIO
+
+
+class BinarySniffer:
+    """
+    Détection des fichiers binaires pendant un scan, avec un cache de verdicts par extension.
+    Une extension dont les SETTLE_COUNT premiers fichiers concordent n'est plus analysée :
+    binaire, ses fichiers ne sont même plus ouverts ; texte, seule la recherche d'octets NUL subsiste.
+    Les fichiers sans extension sont toujours analysés, ainsi que ceux des TEXT_EXTENSIONS
+    tant qu'elles ne sont pas figées comme texte (un .txt binaire ne condamne pas les autres).
+    """
+
+    def __init__(self):
+        self._verdicts = {}  # extension -> (est_binaire, nombre de verdicts), None si mixte
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _extension(file_path):
+        return os.path.splitext(file_path)[1].lower()
+
+    def _settled(self, extension):
+        verdict = self._verdicts.get(extension)
+        if verdict is None or verdict[1] < SETTLE_COUNT:
+            return None
+        if verdict[0] and extension in TEXT_EXTENSIONS:
+            return None
+        return verdict[0]
+
+    def known_binary(self, file_path):
+        """True si l'extension est déjà reconnue comme binaire (aucune lecture nécessaire)."""
+        extension = self._extension(file_path)
+        return bool(extension) and self._settled(extension) is True
+
+    def is_binary(self, file_path, sample):
+        extension = self._extension(file_path)
+        if not extension:
+            return looks_binary(sample)
+
+        if self._settled(extension) is False:
+            return b'\x00' in sample
+
+        result = looks_binary(sample)
+        with self._lock:
+            if extension in self._verdicts:
+                verdict = self._verdicts[extension]
+                if verdict is not None:
+                    self._verdicts[extension] = (result, verdict[1] + 1) if verdict[0] == result else None
+            else:
+                self._verdicts[extension] = (result, 1)
+        return result
@@ -0,0 +1,146 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.logic import comment_processor
+
+# L'analyse des commentaires est du calcul pur (tokenize, lexer) : un processus par cœur
+DEFAULT_INDEX_WORKERS = os.cpu_count() or 1
+# Fichiers envoyés ensemble à un processus, pour amortir les allers-retours
+FILES_PER_TASK = 8
+# Lots soumis en avance par processus
+TASKS_PER_WORKER = 4
+
+# État d'un processus du pool : hashes conservés et options de la tâche, transmis une seule fois
+_worker_state = {"kept_hashes": frozenset(), "options": {}}
+
+
+def _init_worker(kept_hashes, options):
+    _worker_state["kept_hashes"] = frozenset(kept_hashes)
+    _worker_state["options"] = options
+
+
+def _run_batch(file_task, file_paths):
+    """Applique file_task à un lot de fichiers dans un processus du pool ; renvoie [(fichier, résultat)]."""
+    kept_hashes = _worker_state["kept_hashes"]
+    options = _worker_state["options"]
+    return [(file_path, file_task(file_path, kept_hashes, **options)) for file_path in file_paths]
+
+
+def _batches(file_paths, size):
+    batch = []
+    for file_path in file_paths:
+        batch.append(file_path)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _map_sequentially(file_task, file_paths, kept_hashes, options):
+    for file_path in file_paths:
+        yield file_path, file_task(file_path, kept_hashes, **options)
+
+
+def map_files(file_task, file_paths, kept_hashes, max_workers=None, **options):
+    """
+    Applique file_task(fichier, hashes_conservés, **options) dans un pool de processus et produit
+    (fichier, résultat) dans l'ordre où les tâches se terminent. file_task doit être une fonction
+    de module (sérialisable). file_paths peut être un itérable paresseux : seuls quelques lots
+    par processus sont en vol à la fois.
+    Sans pool de processus disponible, les fichiers sont traités dans le processus courant.
+    """
+    if max_workers is None:
+        max_workers = DEFAULT_INDEX_WORKERS
+    max_workers = max(1, max_workers)
+    if max_workers == 1:
+        yield from _map_sequentially(file_task, file_paths, kept_hashes, options)
+        return
+
+    try:
+        pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                   initargs=(tuple(kept_hashes), options))
+    except (OSError, NotImplementedError) as e:
+        print(f"Erreur création du pool de processus, traitement séquentiel : {e}")
+        yield from _map_sequentially(file_task, file_paths, kept_hashes, options)
+        return
+
+    window = max_workers * TASKS_PER_WORKER
+    pending = set()
+    try:
+        for batch in _batches(file_paths, FILES_PER_TASK):
+            pending.add(pool.submit(_run_batch, file_task, batch))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        # Traitement interrompu : les lots non démarrés sont abandonnés
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _find_comments(file_path, kept_hashes):
+    return list(comment_processor.find_comments_in_file(file_path, kept_hashes))
+
+
+def index_comments(file_paths, kept_hashes, max_workers=None):
+    """Indexe les commentaires non conservés de chaque fichier : produit (fichier, commentaires)."""
+    return map_files(_find_comments, file_paths, kept_hashes, max_workers)
+
+
+class CommentIndex:
+    """
+    Commentaires à revoir, alimentés au fil de l'indexation et regroupés par le texte du commentaire (key) :
+    les occurrences identiques (bannières de licence, marqueurs de lint...) forment un seul groupe,
+    revu en une fois. Garde aussi les compteurs affichés par la vue.
+    """
+
+    def __init__(self):
+        self.groups = {}       # key -> occurrences en attente de revue
+        self.order = []        # keys dans l'ordre de première apparition : ordre de la revue
+        self.by_file = {}      # fichier -> ses commentaires dans l'ordre du fichier
+        self.total_files = None  # Connu à la fin de la recherche des fichiers
+        self.indexed_files = 0
+        self.files_with_comments = 0
+        self.comment_count = 0
+        self.complete = False
+
+    def add_file(self, file_path, comments):
+        self.indexed_files += 1
+        if not comments:
+            return
+        self.files_with_comments += 1
+        self.comment_count += len(comments)
+        self.by_file[file_path] = comments
+        for comment in comments:
+            group = self.groups.get(comment["key"])
+            if group is None:
+                group = self.groups[comment["key"]] = []
+                self.order.append(comment["key"])
+            group.append(comment)
+
+    def group_at(self, position):
+        """Occurrences encore en attente du groupe à cette position de la revue."""
+        return self.groups[self.order[position]]
+
+    def following_in_file(self, comment):
+        """Commentaires du même fichier situés après celui-ci (positions à décaler après une suppression)."""
+        comments = self.by_file[comment["file_path"]]
+        for i, other in enumerate(comments):
+            if other is comment:
+                return comments[i + 1:]
+        return []
+
+    def removals_for(self, occurrences):
+        """Lot de suppressions par fichier pour ReviewSession.discard_in_files."""
+        removals = {}
+        for comment in occurrences:
+            removals.setdefault(comment["file_path"], []).append((comment, self.following_in_file(comment)))
+        return removals
+
+    def __len__(self):
+        return len(self.order)
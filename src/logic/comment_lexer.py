@@ -0,0 +1,299 @@
+"""
+Lexer de commentaires pour les langages à syntaxe C, piloté par une table de langages.
+
+Chaque langage décrit ses délimiteurs de commentaires et ses formes de chaînes
+(échappements, chaînes brutes, interpolation). Le lexer est une machine à états
+(code, chaîne, code interpolé dans une chaîne) qui parcourt le fichier une seule fois ;
+dans chaque état, une expression régulière compilée saute directement au prochain
+caractère significatif pour cet état.
+"""
+import os
+import re
+from collections import namedtuple
+
+# prefix : lettres collées devant le guillemet ('r', '@', '$@'...) ; quote : délimiteur ouvrant et fermant ;
+# escape : caractère d'échappement ou None ; interpolation : ouverture d'une expression ('${', '{') ou None ;
+# multiline : la chaîne peut contenir un saut de ligne ; doubled : le délimiteur doublé est un littéral ('""') ;
+# raw_delimiter : chaîne brute C++ R"delim( ... )delim".
+StringSpec = namedtuple("StringSpec", "prefix quote escape interpolation multiline doubled raw_delimiter")
+
+LanguageSpec = namedtuple(
+    "LanguageSpec", "name extensions line_comment block_comment nested_blocks strings regex_literals"
+)
+
+
+def _string(quote, prefix='', multiline=False, interpolation=None, escape='\\', doubled=False):
+    return StringSpec(prefix, quote, escape, interpolation, multiline, doubled, False)
+
+
+_C_QUOTES = [_string('"'), _string("'")]
+
+LANGUAGES = [
+    LanguageSpec("dart", ('.dart',), '//', ('/*', '*/'), True, [
+        _string("'''", prefix='r', multiline=True, escape=None),
+        _string('"""', prefix='r', multiline=True, escape=None),
+        _string("'", prefix='r', escape=None),
+        _string('"', prefix='r', escape=None),
+        _string("'''", multiline=True, interpolation='${'),
+        _string('"""', multiline=True, interpolation='${'),
+        _string("'", interpolation='${'),
+        _string('"', interpolation='${'),
+    ], False),
+    LanguageSpec("javascript", ('.js', '.jsx', '.mjs', '.cjs'), '//', ('/*', '*/'), False, [
+        _string('`', multiline=True, interpolation='${'),
+    ] + _C_QUOTES, True),
+    LanguageSpec("typescript", ('.ts', '.tsx', '.mts', '.cts'), '//', ('/*', '*/'), False, [
+        _string('`', multiline=True, interpolation='${'),
+    ] + _C_QUOTES, True),
+    LanguageSpec("csharp", ('.cs',), '//', ('/*', '*/'), False, [
+        _string('"""', prefix='$', multiline=True, interpolation='{', escape=None),
+        _string('"""', multiline=True, escape=None),
+        _string('"', prefix='$@', multiline=True, interpolation='{', escape=None, doubled=True),
+        _string('"', prefix='@$', multiline=True, interpolation='{', escape=None, doubled=True),
+        _string('"', prefix='@', multiline=True, escape=None, doubled=True),
+        _string('"', prefix='$', interpolation='{'),
+    ] + _C_QUOTES, False),
+    LanguageSpec("java", ('.java',), '//', ('/*', '*/'), False, [
+        _string('"""', multiline=True),
+    ] + _C_QUOTES, False),
+    LanguageSpec("kotlin", ('.kt', '.kts'), '//', ('/*', '*/'), True, [
+        _string('"""', multiline=True, interpolation='${', escape=None),
+        _string('"', interpolation='${'),
+        _string("'"),
+    ], False),
+    LanguageSpec("go", ('.go',), '//', ('/*', '*/'), False, [
+        _string('`', multiline=True, escape=None),
+    ] + _C_QUOTES, False),
+    LanguageSpec("c", ('.c', '.h'), '//', ('/*', '*/'), False, list(_C_QUOTES), False),
+    LanguageSpec("cpp", ('.cpp', '.cc', '.cxx', '.c++', '.hpp', '.hh', '.hxx', '.ipp'), '//', ('/*', '*/'), False, [
+        StringSpec(prefix, '"', None, None, True, False, True) for prefix in ('u8R', 'uR', 'UR', 'LR', 'R')
+    ] + _C_QUOTES, False),
+]
+
+_LANGUAGES_BY_EXTENSION = {ext: language for language in LANGUAGES for ext in language.extensions}
+SUPPORTED_EXTENSIONS = tuple(_LANGUAGES_BY_EXTENSION)
+
+# Caractères après lesquels un '/' ouvre une expression régulière JavaScript (et non une division)
+_REGEX_PRECEDING_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_PRECEDING_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+                          'throw', 'yield', 'await', 'instanceof'}
+
+
+_RAW_DELIMITER_RE = re.compile(r'([^()\\\s"]{0,16})\(')
+
+
+def _is_identifier_char(c):
+    return c.isalnum() or c in '_$'
+
+
+def language_for_path(file_path):
+    """LanguageSpec du fichier d'après son extension, ou None."""
+    return _LANGUAGES_BY_EXTENSION.get(os.path.splitext(file_path)[1].lower())
+
+
+class _CompiledLanguage:
+    """Expressions régulières de transition d'un langage, compilées une seule fois."""
+
+    def __init__(self, language):
+        self.language = language
+        block_open, block_close = language.block_comment
+
+        # Guillemets distincts, les plus longs d'abord ('\'\'\'' avant '\''), et pour chacun
+        # les formes de chaînes possibles, préfixe le plus long d'abord
+        quotes = sorted({spec.quote for spec in language.strings}, key=len, reverse=True)
+        self.specs_by_quote = {
+            quote: sorted((spec for spec in language.strings if spec.quote == quote),
+                          key=lambda spec: len(spec.prefix), reverse=True)
+            for quote in quotes
+        }
+        self.quote_groups = {f'q{i}': quote for i, quote in enumerate(quotes)}
+
+        alternatives = [
+            ('line', re.escape(language.line_comment)),
+            ('block', re.escape(block_open)),
+        ]
+        alternatives += [(name, re.escape(quote)) for name, quote in self.quote_groups.items()]
+        if language.regex_literals:
+            alternatives.append(('regex', '/'))
+        # La lecture anticipée sur les premiers caractères permet au moteur de sauter le code ordinaire
+        first_chars = {language.line_comment[0], block_open[0]} | {quote[0] for quote in quotes}
+        lookahead = '(?=[' + ''.join(re.escape(c) for c in sorted(first_chars))
+        code_pattern = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in alternatives)
+        self.code_re = re.compile(lookahead + '])(?:' + code_pattern + ')')
+        # Dans une interpolation, les accolades délimitent la fin de l'expression
+        self.interpolated_code_re = re.compile(lookahead + r'{}])(?:' + code_pattern + r'|(?P<lbrace>\{)|(?P<rbrace>\}))')
+
+        self.block_close = block_close
+        self.nested_block_re = re.compile(f'(?P<open>{re.escape(block_open)})|(?P<close>{re.escape(block_close)})')
+
+        self.string_res = {spec: self._string_regex(spec, spec.quote)
+                           for spec in language.strings if not spec.raw_delimiter}
+        self._raw_string_res = {}
+
+    def string_at(self, text, quote, start, end):
+        """
+        Forme de chaîne ouverte par le guillemet text[start:end] d'après les lettres qui le précèdent.
+        Renvoie (regex de fermeture, position de reprise), ou None si le guillemet n'ouvre rien.
+        """
+        for spec in self.specs_by_quote[quote]:
+            prefix_start = start - len(spec.prefix)
+            if spec.prefix and (prefix_start < 0 or text[prefix_start:start] != spec.prefix
+                                or (prefix_start > 0 and _is_identifier_char(text[prefix_start - 1]))):
+                continue
+            if not spec.raw_delimiter:
+                return self.string_res[spec], end
+            delimiter = _RAW_DELIMITER_RE.match(text, end)
+            if delimiter is None:
+                continue
+            closer = ')' + delimiter.group(1) + '"'
+            regex = self._raw_string_res.get(closer)
+            if regex is None:
+                regex = self._raw_string_res[closer] = self._string_regex(spec, closer)
+            return regex, delimiter.end()
+        return None
+
+    @staticmethod
+    def _string_regex(spec, closer):
+        alternatives = []
+        if spec.escape:
+            alternatives.append(f'(?P<skip>{re.escape(spec.escape)}.)')
+        if spec.doubled:
+            alternatives.append(f'(?P<skip2>{re.escape(closer * 2)})')
+        if spec.interpolation == '{':
+            # Accolades doublées : littéraux dans une chaîne interpolée C#
+            alternatives.append(r'(?P<skip3>\{\{|\}\})')
+        if spec.interpolation:
+            alternatives.append(f'(?P<interp>{re.escape(spec.interpolation)})')
+        alternatives.append(f'(?P<close>{re.escape(closer)})')
+        if not spec.multiline:
+            alternatives.append(r'(?P<eol>\n)')
+        return re.compile('|'.join(alternatives), re.DOTALL)
+
+
+_compiled_languages = {}
+
+
+def _compiled(language):
+    compiled = _compiled_languages.get(language.name)
+    if compiled is None:
+        compiled = _compiled_languages[language.name] = _CompiledLanguage(language)
+    return compiled
+
+
+def _block_comment_end(compiled, text, start):
+    """Position juste après la fin du commentaire bloc ouvert en start (fin du texte s'il n'est pas fermé)."""
+    if not compiled.language.nested_blocks:
+        end = text.find(compiled.block_close, start + 2)
+        return len(text) if end == -1 else end + len(compiled.block_close)
+
+    depth = 0
+    for match in compiled.nested_block_re.finditer(text, start):
+        depth += 1 if match.lastgroup == 'open' else -1
+        if depth == 0:
+            return match.end()
+    return len(text)
+
+
+def _regex_literal_end(text, slash):
+    """Fin d'une expression régulière JavaScript ouverte en slash, ou None si ce '/' est une division."""
+    i = slash - 1
+    while i >= 0 and text[i] in ' \t\r\n':
+        i -= 1
+    if i >= 0 and text[i] not in _REGEX_PRECEDING_CHARS:
+        word_end = i + 1
+        while i >= 0 and _is_identifier_char(text[i]):
+            i -= 1
+        if text[i + 1:word_end] not in _REGEX_PRECEDING_WORDS:
+            return None
+
+    i = slash + 1
+    in_class = False
+    length = len(text)
+    while i < length:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return None
+        if in_class:
+            if c == ']':
+                in_class = False
+        elif c == '[':
+            in_class = True
+        elif c == '/':
+            return i + 1
+        i += 1
+    return None
+
+
+def scan_comments(text, language):
+    """
+    Parcourt text une seule fois et renvoie la liste des commentaires sous forme
+    (genre, début, fin) en positions absolues, genre valant "line" ou "block".
+    """
+    compiled = _compiled(language)
+    comments = []
+
+    pos = 0
+    string_state = None    # Regex de fermeture de la chaîne en cours
+    brace_depth = 0        # Accolades ouvertes dans l'expression interpolée courante
+    interpolations = []    # Chaînes suspendues par une interpolation ${...}
+    code_depths = []       # brace_depth du code englobant, restauré à la fermeture d'une chaîne
+
+    while True:
+        if string_state is None:
+            regex = compiled.interpolated_code_re if interpolations else compiled.code_re
+            match = regex.search(text, pos)
+            if match is None:
+                break
+            kind = match.lastgroup
+            start = match.start()
+
+            if kind == 'line':
+                end = text.find('\n', start)
+                end = len(text) if end == -1 else end
+                comments.append(("line", start, end))
+                pos = end
+            elif kind == 'block':
+                end = _block_comment_end(compiled, text, start)
+                comments.append(("block", start, end))
+                pos = end
+            elif kind == 'lbrace':
+                brace_depth += 1
+                pos = match.end()
+            elif kind == 'rbrace':
+                pos = match.end()
+                if brace_depth == 0:
+                    string_state = interpolations.pop()
+                else:
+                    brace_depth -= 1
+            elif kind == 'regex':
+                end = _regex_literal_end(text, start)
+                pos = end if end is not None else match.end()
+            else:
+                opened = compiled.string_at(text, compiled.quote_groups[kind], start, match.end())
+                if opened is None:
+                    pos = match.end()
+                else:
+                    string_state, pos = opened
+                    code_depths.append(brace_depth)
+        else:
+            match = string_state.search(text, pos)
+            if match is None:
+                break
+            kind = match.lastgroup
+            if kind == 'interp':
+                interpolations.append(string_state)
+                string_state = None
+                brace_depth = 0
+                pos = match.end()
+            elif kind in ('close', 'eol'):
+                # Une chaîne simple non fermée s'arrête en fin de ligne
+                string_state = None
+                brace_depth = code_depths.pop()
+                pos = match.end() if kind == 'close' else match.start()
+            else:
+                pos = match.end()
+
+    return comments
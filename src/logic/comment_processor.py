@@ -1,87 +1,42 @@
 import os
+import difflib
+import re
 import hashlib
-
-def find_code_files(directory):
-    """Trouve tous les fichiers .dart et .py dans un répertoire."""
-    code_files = []
-    supported_extensions = ('.dart', '.py')
-    for root_dir, _, files in os.walk(directory):
-        for file in files:
+import shutil
+import tempfile
+import threading
+import tokenize
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from src.logic.comment_lexer import SUPPORTED_EXTENSIONS, language_for_path, scan_comments
+from src.logic.ignore_rules import IgnoreMatcher
+from src.logic.walker import walk_directory
+
+# Fichiers gardés en mémoire par une revue avant d'écrire le moins récemment consulté
+MAX_OPEN_FILES = 32
+# Threads d'écriture pour les suppressions groupées (I/O : le GIL est relâché)
+DEFAULT_WRITE_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+
+def find_code_files(directory, ignored_extensions=None, ignored_folders=None, use_gitignore=False):
+    """
+    Trouve les fichiers de code pris en charge (Python et langages de la table du lexer), au fil du parcours.
+    Même parcours élagué que les lecteurs : les dossiers ignorés ne sont jamais visités.
+    """
+    supported_extensions = ('.py',) + SUPPORTED_EXTENSIONS
+    matcher = IgnoreMatcher(ignored_extensions, ignored_folders)
+    for root_dir, _, _, files in walk_directory(directory, matcher, use_gitignore):
+        for file in sorted(files):
             if file.lower().endswith(supported_extensions):
-                code_files.append(os.path.join(root_dir, file))
-    return code_files
+                yield os.path.join(root_dir, file)
 
 def get_comment_hash(comment_content):
     """Génère un hash SHA256 pour un contenu de commentaire."""
     return hashlib.sha256(comment_content.strip().encode('utf-8')).hexdigest()
 
-def _is_in_string(line, index):
-    """Vérifie si un index est à l'intérieur d'une chaîne (pour C-style/Dart)."""
-    sub_line = line[:index]
-    single_quotes = sub_line.count("'")
-    double_quotes = sub_line.count('"')
-    return single_quotes % 2 != 0 or double_quotes % 2 != 0
-
 def find_comments_in_file(file_path, kept_comments_hashes):
-    """Dispatche vers le bon parseur selon l'extension."""
-    if file_path.endswith('.dart'):
-        yield from _find_dart_comments(file_path, kept_comments_hashes)
-    elif file_path.endswith('.py'):
-        yield from _find_python_comments(file_path, kept_comments_hashes)
-
-def _find_dart_comments(file_path, kept_comments_hashes):
-    """Logique originale pour Dart (C-Style)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Erreur lecture {file_path}: {e}")
-        return
-
-    in_multiline_comment = False
-    comment_buffer = []
-    comment_start_line = -1
-
-    for i, line in enumerate(lines):
-        if in_multiline_comment:
-            comment_buffer.append(line)
-            end_ml_index = line.find('*/')
-            if end_ml_index != -1 and not _is_in_string(line, end_ml_index):
-                in_multiline_comment = False
-                full_comment = "".join(comment_buffer)
-                comment_hash = get_comment_hash(full_comment)
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "dart", "start_line": comment_start_line, "end_line": i,
-                           "content": full_comment, "hash": comment_hash}
-                comment_buffer = []
-        else:
-            sl_index = line.find('//')
-            start_ml_index = line.find('/*')
-
-            if start_ml_index != -1 and (sl_index == -1 or start_ml_index < sl_index):
-                if not _is_in_string(line, start_ml_index):
-                    in_multiline_comment = True
-                    comment_start_line = i
-                    comment_buffer.append(line)
-                    end_ml_index = line.find('*/', start_ml_index + 2)
-                    if end_ml_index != -1 and not _is_in_string(line, end_ml_index):
-                        in_multiline_comment = False
-                        full_comment = "".join(comment_buffer)
-                        comment_hash = get_comment_hash(full_comment)
-                        if comment_hash not in kept_comments_hashes:
-                            yield {"file_path": file_path, "type": "dart", "start_line": i, "end_line": i, "content": full_comment,
-                                   "hash": comment_hash}
-                        comment_buffer = []
-
-            elif sl_index != -1:
-                if not _is_in_string(line, sl_index):
-                    comment_hash = get_comment_hash(line[sl_index:])
-                    if comment_hash not in kept_comments_hashes:
-                        yield {"file_path": file_path, "type": "dart", "start_line": i, "end_line": i, "content": line,
-                               "hash": comment_hash}
-
-def _find_python_comments(file_path, kept_comments_hashes):
-    """Logique spécifique pour Python (# et Docstrings)."""
+    """Lit le fichier et renvoie ses commentaires non conservés, quel que soit le langage."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
@@ -89,424 +44,412 @@ def _find_python_comments(file_path, kept_comments_hashes):
         print(f"Erreur lecture {file_path}: {e}")
         return
 
-    in_docstring = False
-    docstring_marker = None # """ ou '''
-    comment_buffer = []
-    comment_start_line = -1
-
-    for i, line in enumerate(lines):
-        # 1. Gestion des Docstrings (Multi-lignes)
-        if in_docstring:
-            comment_buffer.append(line)
-            if docstring_marker in line:
-                # Simplification: on suppose que si on trouve le marker, ça ferme le docstring
-                in_docstring = False
-                full_comment = "".join(comment_buffer)
-                comment_hash = get_comment_hash(full_comment)
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "python_doc", "start_line": comment_start_line, "end_line": i,
-                           "content": full_comment, "hash": comment_hash}
-                comment_buffer = []
-            continue
-
-        # Détection début Docstring (""" ou ''')
-        triple_single = "'''"
-        triple_double = '"""'
-        
-        found_marker = None
-        if triple_double in line: found_marker = triple_double
-        elif triple_single in line: found_marker = triple_single
-
-        if found_marker:
-            start_idx = line.find(found_marker)
-            end_idx = line.find(found_marker, start_idx + 3)
-            
-            if end_idx != -1:
-                # Docstring sur une seule ligne
-                full_comment = line
-                comment_hash = get_comment_hash(full_comment)
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "python_doc", "start_line": i, "end_line": i,
-                           "content": full_comment, "hash": comment_hash}
-            else:
-                # Début docstring multi-lignes
-                in_docstring = True
-                docstring_marker = found_marker
-                comment_start_line = i
-                comment_buffer.append(line)
-            continue
-
-        # 2. Gestion des commentaires simples (#)
-        hash_index = line.find('#')
-        if hash_index != -1:
-            # Vérification basique si dans une string
-            if not _is_in_string(line, hash_index):
-                comment_hash = get_comment_hash(line[hash_index:])
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "python_single", "start_line": i, "end_line": i, "content": line,
-                           "hash": comment_hash}
-
-def remove_comment_from_file(comment_info):
-    """Supprime un commentaire d'un fichier selon son type."""
-    file_path = comment_info["file_path"]
-    c_type = comment_info.get("type", "dart")
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        start_line = comment_info["start_line"]
-        end_line = comment_info["end_line"]
-
-        # Suppression complète des lignes si c'est un bloc multi-lignes
-        if start_line != end_line:
-            new_lines = lines[:start_line] + lines[end_line + 1:]
-        
-        else:
-            # Gestion Mono-ligne
-            line_content = lines[start_line]
-            
-            if c_type == "python_doc":
-                # Docstring sur une ligne -> on supprime toute la ligne
-                new_lines = lines[:start_line] + lines[end_line + 1:]
-            
-            elif c_type == "python_single":
-                # Commentaire Python (#)
-                hash_index = line_content.find('#')
-                if hash_index != -1:
-                    # Si le # est au début (ou après des espaces), on vire la ligne
-                    if line_content[:hash_index].strip() == "":
-                         new_lines = lines[:start_line] + lines[end_line + 1:]
-                    else:
-                        # Commentaire inline (code = x # comment)
-                        new_lines = lines[:start_line] + [line_content[:hash_index].rstrip() + '\n'] + lines[start_line + 1:]
-                else:
-                    new_lines = lines
-            
-            else: 
-                # Logique C-Style / Dart
-                if line_content.strip().startswith('//') or line_content.strip().startswith('/*'):
-                     new_lines = lines[:start_line] + lines[end_line + 1:]
-                else:
-                    sl_index = line_content.find('//')
-                    if sl_index != -1:
-                        new_lines = lines[:start_line] + [line_content[:sl_index].rstrip() + '\n'] + lines[start_line + 1:]
-                    else:
-                         new_lines = lines[:start_line] + lines[end_line + 1:]
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
-        return True
-    except Exception as e:
-        print(f"Erreur lors de la modification du fichier {file_path}: {e}")
-        return False
-
+    yield from find_comments_in_lines(file_path, lines, kept_comments_hashes)
 
-def get_comment_hash(comment_content):
-    """Génère un hash SHA256 pour un contenu de commentaire."""
-    return hashlib.sha256(comment_content.strip().encode('utf-8')).hexdigest()
+def find_comments_in_lines(file_path, lines, kept_comments_hashes):
+    """Commentaires non conservés de lignes déjà lues (le langage est déduit de file_path)."""
+    for span in scan_file_comments(file_path, lines):
+        record = _comment_record(file_path, lines, span)
+        if record["hash"] not in kept_comments_hashes:
+            yield record
 
+# Positions d'un commentaire dans un fichier : lignes à partir de 0, colonnes de début et de fin (exclue).
+# kind vaut "line" (commentaire de fin de ligne) ou "block" (bloc ou docstring, éventuellement multi-lignes).
+CommentSpan = namedtuple("CommentSpan", "type kind start_line start_col end_line end_col")
 
-def _is_in_string(line, index):
-    """Vérifie si un index est à l'intérieur d'une chaîne (pour C-style/Dart)."""
-    sub_line = line[:index]
-    single_quotes = sub_line.count("'")
-    double_quotes = sub_line.count('"')
-    return single_quotes % 2 != 0 or double_quotes % 2 != 0
+# Jetons sans effet sur la détection d'un docstring (lignes vides, commentaires, indentation)
+_PYTHON_SKIPPED_TOKENS = {tokenize.NL, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT, tokenize.ENCODING}
 
+def _is_plain_string(token_string):
+    """Un docstring est une chaîne str littérale : ni bytes, ni f-string."""
+    prefix = token_string[:len(token_string) - len(token_string.lstrip('rRbBuUfF'))].lower()
+    return 'b' not in prefix and 'f' not in prefix
 
-def find_comments_in_file(file_path, kept_comments_hashes):
-    """Dispatche vers le bon parseur selon l'extension."""
-    if file_path.endswith('.dart'):
-        yield from _find_dart_comments(file_path, kept_comments_hashes)
-    elif file_path.endswith('.py'):
-        yield from _find_python_comments(file_path, kept_comments_hashes)
+# Positions où un docstring peut commencer : en début de ligne ou juste après un ':' (def f(): "doc")
+_PYTHON_DOCSTRING_START_RE = re.compile(r'(?:^|:)[ \t\f]*[rRuU]?["\']', re.MULTILINE)
 
+def _may_have_python_comments(lines):
+    """Préfiltre : False si le fichier n'a ni '#' ni chaîne en position de docstring (tokenize inutile)."""
+    text = "".join(lines)
+    return '#' in text or _PYTHON_DOCSTRING_START_RE.search(text) is not None
 
-def _find_dart_comments(file_path, kept_comments_hashes):
-    """Logique originale pour Dart (C-Style)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Erreur lecture {file_path}: {e}")
-        return
-
-    in_multiline_comment = False
-    comment_buffer = []
-    comment_start_line = -1
-
-    for i, line in enumerate(lines):
-        if in_multiline_comment:
-            comment_buffer.append(line)
-            end_ml_index = line.find('*/')
-            if end_ml_index != -1 and not _is_in_string(line, end_ml_index):
-                in_multiline_comment = False
-                full_comment = "".join(comment_buffer)
-                comment_hash = get_comment_hash(full_comment)
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "dart", "start_line": comment_start_line, "end_line": i,
-                           "content": full_comment, "hash": comment_hash}
-                comment_buffer = []
-        else:
-            sl_index = line.find('//')
-            start_ml_index = line.find('/*')
-
-            if start_ml_index != -1 and (sl_index == -1 or start_ml_index < sl_index):
-                if not _is_in_string(line, start_ml_index):
-                    in_multiline_comment = True
-                    comment_start_line = i
-                    comment_buffer.append(line)
-                    end_ml_index = line.find('*/', start_ml_index + 2)
-                    if end_ml_index != -1 and not _is_in_string(line, end_ml_index):
-                        in_multiline_comment = False
-                        full_comment = "".join(comment_buffer)
-                        comment_hash = get_comment_hash(full_comment)
-                        if comment_hash not in kept_comments_hashes:
-                            yield {"file_path": file_path, "type": "dart", "start_line": i, "end_line": i, "content": full_comment,
-                                   "hash": comment_hash}
-                        comment_buffer = []
-
-            elif sl_index != -1:
-                if not _is_in_string(line, sl_index):
-                    comment_hash = get_comment_hash(line[sl_index:])
-                    if comment_hash not in kept_comments_hashes:
-                        yield {"file_path": file_path, "type": "dart", "start_line": i, "end_line": i, "content": line,
-                               "hash": comment_hash}
-
-
-def _find_python_comments(file_path, kept_comments_hashes):
-    """Logique spécifique pour Python (# et Docstrings)."""
+def scan_python_comments(lines):
+    """
+    Parcourt le flux de jetons (module tokenize) en une seule passe et renvoie les CommentSpan :
+    - "python_single" : chaque jeton COMMENT, où qu'il soit (les # dans les chaînes et f-strings sont ignorés) ;
+    - "python_doc" : les vrais docstrings, c'est-à-dire une instruction composée uniquement d'une chaîne
+      littérale, en première position d'un module, d'une classe ou d'une fonction.
+    """
+    spans = []
+    # tokenize est lent (Python pur jusqu'à 3.11) : les fichiers sans commentaire possible sont écartés
+    if not _may_have_python_comments(lines):
+        return spans
+    expecting_docstring = True  # Début de module
+    in_def_header = False       # Entre 'def'/'class' et le ':' qui ouvre le corps
+    bracket_depth = 0
+    docstring_tokens = []       # Chaînes candidates de l'instruction en cours
+
+    tokens = tokenize.generate_tokens(iter(lines).__next__)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Erreur lecture {file_path}: {e}")
-        return
-
-    in_docstring = False
-    docstring_marker = None # """ ou '''
-    comment_buffer = []
-    comment_start_line = -1
-
-    for i, line in enumerate(lines):
+        for token in tokens:
+            token_type = token.type
+
+            if token_type == tokenize.COMMENT:
+                (row, col), _ = token.start, token.end
+                spans.append(CommentSpan("python_single", "line", row - 1, col, row - 1, token.end[1]))
+                continue
+
+            if docstring_tokens:
+                if token_type == tokenize.STRING:
+                    docstring_tokens.append(token)
+                    continue
+                if token_type in (tokenize.NEWLINE, tokenize.ENDMARKER) or (token_type == tokenize.OP and token.string == ';'):
+                    first, last = docstring_tokens[0], docstring_tokens[-1]
+                    spans.append(CommentSpan("python_doc", "block", first.start[0] - 1, first.start[1],
+                                             last.end[0] - 1, last.end[1]))
+                elif token_type in _PYTHON_SKIPPED_TOKENS:
+                    continue
+                # Sinon la chaîne fait partie d'une expression : ce n'est pas un docstring
+                docstring_tokens = []
+                expecting_docstring = False
+
+            if token_type in _PYTHON_SKIPPED_TOKENS or token_type == tokenize.NEWLINE:
+                continue
+
+            if expecting_docstring:
+                expecting_docstring = False
+                if token_type == tokenize.STRING and _is_plain_string(token.string):
+                    docstring_tokens = [token]
+                    continue
+
+            if token_type == tokenize.NAME and token.string in ('def', 'class') and bracket_depth == 0:
+                in_def_header = True
+            elif token_type == tokenize.OP:
+                if token.string in '([{':
+                    bracket_depth += 1
+                elif token.string in ')]}':
+                    bracket_depth = max(0, bracket_depth - 1)
+                elif token.string == ':' and in_def_header and bracket_depth == 0:
+                    in_def_header = False
+                    expecting_docstring = True
+    except (tokenize.TokenError, IndentationError, SyntaxError) as e:
+        # Fichier invalide : on garde ce qui a été trouvé avant l'erreur
+        print(f"Erreur d'analyse Python : {e}")
+
+    return spans
+
+def scan_c_style_comments(lines, language):
+    """CommentSpan des commentaires // et /* */ trouvés par le lexer du langage."""
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line))
+    text = "".join(lines)
+
+    record_type = language.name
+    spans = []
+    for kind, start, end in scan_comments(text, language):
+        start_line = bisect_right(line_starts, start) - 1
+        end_line = bisect_right(line_starts, max(start, end - 1)) - 1
+        spans.append(CommentSpan(record_type, kind, start_line, start - line_starts[start_line],
+                                 end_line, end - line_starts[end_line]))
+    return spans
+
+def scan_file_comments(file_path, lines):
+    """CommentSpan d'un fichier selon son extension (liste vide pour un langage non pris en charge)."""
+    if file_path.lower().endswith('.py'):
+        return scan_python_comments(lines)
+    language = language_for_path(file_path)
+    if language is None:
+        return []
+    return scan_c_style_comments(lines, language)
+
+def _comment_record(file_path, lines, span):
+    """
+    Enregistrement d'un commentaire, avec le contenu et le hash des anciens scanners :
+    un commentaire de ligne est haché à partir de sa colonne, un bloc sur ses lignes complètes.
+    Ce hash ne sert qu'aux commentaires gardés ; key, le hash du seul texte du commentaire,
+    distingue deux blocs d'une même ligne (regroupement des occurrences, recherche après décalage).
+    """
+    if span.kind == "line":
+        line = lines[span.start_line]
+        content = line
+        comment_hash = get_comment_hash(line[span.start_col:])
+        key = comment_hash
+    else:
+        content = "".join(lines[span.start_line:span.end_line + 1])
+        comment_hash = get_comment_hash(content)
+        key = get_comment_hash(_span_text(lines, span))
+    return {"file_path": file_path, "type": span.type, "kind": span.kind,
+            "start_line": span.start_line, "start_col": span.start_col,
+            "end_line": span.end_line, "end_col": span.end_col,
+            "content": content, "hash": comment_hash, "key": key}
+
+def _span_text(lines, span):
+    if span.start_line == span.end_line:
+        return lines[span.start_line][span.start_col:span.end_col]
+    return (lines[span.start_line][span.start_col:] + "".join(lines[span.start_line + 1:span.end_line])
+            + lines[span.end_line][:span.end_col])
+
+def _is_only_statement(lines, span, before, after):
+    """
+    Vrai si le docstring décrit par span est la seule instruction de son bloc (classe ou fonction) :
+    le retirer laisserait un corps vide. before et after sont le texte qui l'entoure sur ses lignes.
+    """
+    if after.strip() and not after.lstrip().startswith('#'):
+        return False
+    if before.strip():
+        # Corps sur la ligne de l'en-tête : def f(): "doc"
+        return before.rstrip().endswith(':')
+    if not before:
+        return False  # Docstring de module : un module vide reste valide
+    for line in lines[span.end_line + 1:]:
         stripped = line.strip()
+        if stripped and not stripped.startswith('#'):
+            return len(line) - len(line.lstrip(' \t')) < len(before)
+    return True
 
-        # 1. Gestion des Docstrings (Multi-lignes)
-        if in_docstring:
-            comment_buffer.append(line)
-            if docstring_marker in line:
-                # Attention: il faut vérifier que le marker n'est pas le début d'une nouvelle string sur la même ligne
-                # Simplification: on suppose que si on trouve le marker, ça ferme le docstring
-                in_docstring = False
-                full_comment = "".join(comment_buffer)
-                comment_hash = get_comment_hash(full_comment)
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "python_doc", "start_line": comment_start_line, "end_line": i,
-                           "content": full_comment, "hash": comment_hash}
-                comment_buffer = []
-            continue
-
-        # Détection début Docstring
-        # On cherche """ ou '''
-        # Note: ceci est une heuristique, ça peut détecter des chaines assignées à des variables
-        triple_single = "'''"
-        triple_double = '"""'
-        
-        found_marker = None
-        if triple_double in line: found_marker = triple_double
-        elif triple_single in line: found_marker = triple_single
-
-        if found_marker:
-            # Vérifier si c'est une ouverture
-            start_idx = line.find(found_marker)
-            # Vérifier si ça ferme sur la même ligne
-            end_idx = line.find(found_marker, start_idx + 3)
-            
-            if end_idx != -1:
-                # Docstring sur une seule ligne
-                full_comment = line
-                comment_hash = get_comment_hash(full_comment)
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "python_doc", "start_line": i, "end_line": i,
-                           "content": full_comment, "hash": comment_hash}
-            else:
-                # Début docstring multi-lignes
-                in_docstring = True
-                docstring_marker = found_marker
-                comment_start_line = i
-                comment_buffer.append(line)
-            continue
-
-        # 2. Gestion des commentaires simples (#)
-        hash_index = line.find('#')
-        if hash_index != -1:
-            # Vérification basique si dans une string
-            if not _is_in_string(line, hash_index):
-                comment_hash = get_comment_hash(line[hash_index:])
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "type": "python_single", "start_line": i, "end_line": i, "content": line,
-                           "hash": comment_hash}
-
+def _remove_span(lines, span):
+    """
+    Retire un commentaire des lignes, sur place. Les lignes ne contenant que le commentaire disparaissent ;
+    sinon le code qui l'entoure est conservé. Un docstring seul dans son bloc est remplacé par pass.
+    Renvoie (décalage de lignes, décalage de colonnes) : le texte qui suivait le commentaire sur sa
+    dernière ligne se retrouve à (ligne + décalage de lignes, colonne + décalage de colonnes).
+    """
+    before = lines[span.start_line][:span.start_col]
+    after = lines[span.end_line][span.end_col:]
+    line_ending = after[len(after.rstrip('\r\n')):]
+    after = after[:len(after) - len(line_ending)]
+    after_col = span.end_col  # Colonne d'origine du début de after
+
+    if span.type == "python_doc":
+        stripped_after = after.lstrip(' \t')
+        if stripped_after.startswith(';'):
+            # "doc"; instruction : le séparateur part avec le docstring
+            rest = stripped_after[1:].lstrip(' \t')
+            after_col += len(after) - len(rest)
+            after = rest
+        if _is_only_statement(lines, span, before, after):
+            lines[span.start_line:span.end_line + 1] = [before + "pass" + after + line_ending]
+            return span.start_line - span.end_line, len(before) + len("pass") - after_col
+
+    if not before.strip() and not after.strip():
+        del lines[span.start_line:span.end_line + 1]
+        return span.start_line - span.end_line - 1, 0
+
+    column_shift = 0
+    if not after.strip():
+        new_line = before.rstrip() + line_ending
+    elif not before.strip():
+        stripped_after = after.lstrip(' \t')
+        column_shift = len(before) - after_col - (len(after) - len(stripped_after))
+        new_line = before + stripped_after + line_ending
+    else:
+        column_shift = len(before) - after_col
+        new_line = before + after + line_ending
+    lines[span.start_line:span.end_line + 1] = [new_line]
+    return span.start_line - span.end_line, column_shift
+
+def _span_of(comment_info):
+    return CommentSpan(comment_info["type"], comment_info["kind"], comment_info["start_line"],
+                       comment_info["start_col"], comment_info["end_line"], comment_info["end_col"])
+
+def _find_span(lines, comment_info):
+    """Retrouve le commentaire décrit par comment_info dans l'état actuel du fichier (None s'il a changé)."""
+    file_path = comment_info["file_path"]
+    span = _span_of(comment_info)
+    # Cas courant : le commentaire est toujours à la position enregistrée, sans nouvelle analyse
+    if span.end_line < len(lines) and _comment_record(file_path, lines, span)["key"] == comment_info["key"]:
+        return span
+    for span in scan_file_comments(file_path, lines):
+        if span.start_line == comment_info["start_line"] and span.type == comment_info["type"]:
+            if _comment_record(file_path, lines, span)["key"] == comment_info["key"]:
+                return span
+    return None
+
+def write_lines_atomically(file_path, lines):
+    """Écrit les lignes dans un fichier temporaire voisin puis le substitue au fichier d'origine."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
 
 def remove_comment_from_file(comment_info):
-    """Supprime un commentaire d'un fichier selon son type."""
+    """Supprime un commentaire d'un fichier, à la position exacte retrouvée par le scanner du langage."""
     file_path = comment_info["file_path"]
-    c_type = comment_info.get("type", "dart") # par défaut dart pour compatibilité
 
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
 
-        start_line = comment_info["start_line"]
-        end_line = comment_info["end_line"]
+        span = _find_span(lines, comment_info)
+        if span is None:
+            print(f"Commentaire introuvable (fichier modifié ?) : {file_path}:{comment_info['start_line'] + 1}")
+            return False
+        _remove_span(lines, span)
 
-        # Suppression complète des lignes si c'est un bloc multi-lignes
-        if start_line != end_line:
-            new_lines = lines[:start_line] + lines[end_line + 1:]
-        
-        else:
-            # Gestion Mono-ligne
-            line_content = lines[start_line]
-            
-            if c_type == "python_doc":
-                # Docstring sur une ligne -> on supprime toute la ligne
-                new_lines = lines[:start_line] + lines[end_line + 1:]
-            
-            elif c_type == "python_single":
-                # Commentaire Python (#)
-                hash_index = line_content.find('#')
-                if hash_index != -1:
-                    # Si le # est au début (ou après des espaces), on vire la ligne
-                    if line_content[:hash_index].strip() == "":
-                         new_lines = lines[:start_line] + lines[end_line + 1:]
-                    else:
-                        # Commentaire inline (code = x # comment)
-                        new_lines = lines[:start_line] + [line_content[:hash_index].rstrip() + '\n'] + lines[start_line + 1:]
-                else:
-                    new_lines = lines # Sécurité
-            
-            else: 
-                if line_content.strip().startswith('//') or line_content.strip().startswith('/*'):
-                     new_lines = lines[:start_line] + lines[end_line + 1:]
-                else:
-                    # Inline
-                    sl_index = line_content.find('//')
-                    if sl_index != -1:
-                        new_lines = lines[:start_line] + [line_content[:sl_index].rstrip() + '\n'] + lines[start_line + 1:]
-                    else:
-                        # Pour simplifier ici, si on détecte pas
-                         new_lines = lines[:start_line] + lines[end_line + 1:]
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
+        write_lines_atomically(file_path, lines)
         return True
     except Exception as e:
         print(f"Erreur lors de la modification du fichier {file_path}: {e}")
         return False
-# src/logic/comment_processor.py
-import os
-import hashlib
 
+def _diff_lines(lines):
+    """Lignes prêtes pour un diff unifié : la dernière ligne sans fin de ligne reçoit le marqueur de patch."""
+    if lines and not lines[-1].endswith('\n'):
+        return lines[:-1] + [lines[-1] + "\n\\ No newline at end of file\n"]
+    return lines
 
-def find_dart_files(directory):
-    """Trouve tous les fichiers .dart dans un répertoire."""
-    dart_files = []
-    for root_dir, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(".dart"):
-                dart_files.append(os.path.join(root_dir, file))
-    return dart_files
-
-
-def get_comment_hash(comment_content):
-    """Génère un hash SHA256 pour un contenu de commentaire."""
-    return hashlib.sha256(comment_content.strip().encode('utf-8')).hexdigest()
-
-
-def _is_in_string(line, index):
-    """Vérifie si un index est à l'intérieur d'une chaîne de caractères."""
-    sub_line = line[:index]
-    single_quotes = sub_line.count("'")
-    double_quotes = sub_line.count('"')
-    return single_quotes % 2 != 0 or double_quotes % 2 != 0
-
-
-def find_comments_in_file(file_path, kept_comments_hashes):
+def strip_comments_from_file(file_path, kept_comments_hashes, dry_run=False, base_path=None):
     """
-    Générateur qui trouve et yield les commentaires d'un fichier,
-    en ignorant ceux dont le hash est déjà sauvegardé.
+    Retire d'un coup tous les commentaires non conservés d'un fichier (traitement par lot, sans revue).
+    Le fichier est réécrit de façon atomique, ou, en simulation, laissé intact : le diff unifié
+    est alors renvoyé, avec des chemins relatifs à base_path.
+    Renvoie (nombre de commentaires retirés, diff ou None, erreur ou None).
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
-    except Exception as e:
-        print(f"Erreur de lecture du fichier {file_path}: {e}")
-        return
-
-    in_multiline_comment = False
-    comment_buffer = []
-    comment_start_line = -1
-
-    for i, line in enumerate(lines):
-        if in_multiline_comment:
-            comment_buffer.append(line)
-            end_ml_index = line.find('*/')
-            if end_ml_index != -1 and not _is_in_string(line, end_ml_index):
-                in_multiline_comment = False
-                full_comment = "".join(comment_buffer)
-                comment_hash = get_comment_hash(full_comment)
-                if comment_hash not in kept_comments_hashes:
-                    yield {"file_path": file_path, "start_line": comment_start_line, "end_line": i,
-                           "content": full_comment, "hash": comment_hash}
-                comment_buffer = []
-        else:
-            sl_index = line.find('//')
-            start_ml_index = line.find('/*')
-
-            if start_ml_index != -1 and (sl_index == -1 or start_ml_index < sl_index):
-                if not _is_in_string(line, start_ml_index):
-                    in_multiline_comment = True
-                    comment_start_line = i
-                    comment_buffer.append(line)
-                    end_ml_index = line.find('*/', start_ml_index + 2)
-                    if end_ml_index != -1 and not _is_in_string(line, end_ml_index):
-                        in_multiline_comment = False
-                        full_comment = "".join(comment_buffer)
-                        comment_hash = get_comment_hash(full_comment)
-                        if comment_hash not in kept_comments_hashes:
-                            yield {"file_path": file_path, "start_line": i, "end_line": i, "content": full_comment,
-                                   "hash": comment_hash}
-                        comment_buffer = []
-
-            elif sl_index != -1:
-                if not _is_in_string(line, sl_index):
-                    comment_hash = get_comment_hash(line[sl_index:])
-                    if comment_hash not in kept_comments_hashes:
-                        yield {"file_path": file_path, "start_line": i, "end_line": i, "content": line,
-                               "hash": comment_hash}
+    except (OSError, UnicodeDecodeError) as e:
+        return 0, None, str(e)
+
+    comments = list(find_comments_in_lines(file_path, lines, kept_comments_hashes))
+    if not comments:
+        return 0, None, None
+
+    new_lines = list(lines)
+    # Du dernier au premier : les positions des commentaires restant à retirer ne bougent pas
+    for comment in sorted(comments, key=lambda c: (c["start_line"], c["start_col"]), reverse=True):
+        _remove_span(new_lines, _span_of(comment))
+
+    if file_path.lower().endswith('.py'):
+        # Dernier garde-fou avant l'écriture : le fichier obtenu doit rester du Python valide
+        try:
+            compile("".join(new_lines), file_path, "exec", dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            return 0, None, f"résultat invalide, fichier laissé intact : {e}"
+
+    if dry_run:
+        label = os.path.relpath(file_path, base_path).replace('\\', '/') if base_path else file_path
+        diff = "".join(difflib.unified_diff(_diff_lines(lines), _diff_lines(new_lines),
+                                            fromfile="a/" + label, tofile="b/" + label))
+        return len(comments), diff, None
+    try:
+        write_lines_atomically(file_path, new_lines)
+    except OSError as e:
+        return 0, None, str(e)
+    return len(comments), None, None
 
+class ReviewSession:
+    """
+    Modèle d'édition de la revue des commentaires : les lignes des fichiers revus restent en mémoire,
+    chaque suppression décale les positions des commentaires suivants du même fichier,
+    et un fichier modifié n'est écrit qu'à sa fermeture (fin de revue, ou fichier le moins
+    récemment consulté quand plus de MAX_OPEN_FILES sont ouverts).
+    """
 
-def remove_comment_from_file(comment_info):
-    """Supprime un commentaire d'un fichier et réécrit le fichier."""
-    file_path = comment_info["file_path"]
-    try:
+    def __init__(self):
+        self._lines = OrderedDict()
+        self._modified = set()
+        # Fichiers déjà réécrits par la session : les positions tenues à jour restent fiables
+        self._written = set()
+        self._lock = threading.Lock()
+
+    def _load(self, file_path):
+        with self._lock:
+            lines = self._lines.get(file_path)
+            if lines is not None:
+                self._lines.move_to_end(file_path)
+                return lines
         with open(file_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
-
-        start_line = comment_info["start_line"]
-        end_line = comment_info["end_line"]
-
-        if lines[start_line].strip().startswith('//') or '/*' in lines[start_line]:
-            new_lines = lines[:start_line] + lines[end_line + 1:]
+        with self._lock:
+            return self._lines.setdefault(file_path, lines)
+
+    def lines(self, file_path):
+        """Lignes actuelles du fichier (lues sur le disque à la première demande)."""
+        lines = self._load(file_path)
+        while len(self._lines) > MAX_OPEN_FILES:
+            self.close_file(next(iter(self._lines)))
+        return lines
+
+    def discard(self, comment_info, following_comments):
+        """
+        Retire le commentaire des lignes en mémoire et met à jour, sur place, les positions de
+        following_comments (commentaires suivants du même fichier). Renvoie False s'il est introuvable.
+        """
+        file_path = comment_info["file_path"]
+        lines = self._load(file_path)
+        if file_path in self._modified or file_path in self._written:
+            # Positions tenues à jour par les suppressions précédentes : aucune nouvelle analyse
+            span = _span_of(comment_info)
         else:
-            line_content = lines[start_line]
-            sl_index = line_content.find('//')
-            new_lines = lines[:start_line] + [line_content[:sl_index].rstrip() + '\n'] + lines[start_line + 1:]
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
+            # Première modification : le fichier a pu changer sur le disque depuis l'indexation
+            span = _find_span(lines, comment_info)
+        if span is None:
+            print(f"Commentaire introuvable (fichier modifié ?) : {file_path}:{comment_info['start_line'] + 1}")
+            return False
+
+        line_shift, column_shift = _remove_span(lines, span)
+        self._modified.add(file_path)
+        for other in following_comments:
+            if other["start_line"] == span.end_line:
+                other["start_col"] += column_shift
+            if other["end_line"] == span.end_line:
+                other["end_col"] += column_shift
+            other["start_line"] += line_shift
+            other["end_line"] += line_shift
         return True
-    except Exception as e:
-        print(f"Erreur lors de la modification du fichier {file_path}: {e}")
-        return False
\ No newline at end of file
+
+    def discard_in_files(self, removals, max_workers=None):
+        """
+        Retire un lot de commentaires répartis dans plusieurs fichiers, un fichier par tâche
+        dans un pool de threads ; chaque fichier touché est écrit une fois, à la fin de sa tâche.
+        removals : {fichier: [(commentaire, commentaires suivants du même fichier)]} dans l'ordre du fichier.
+        Renvoie (nombre de commentaires retirés, erreurs) ; l'échec d'un fichier n'interrompt pas les autres.
+        """
+        def apply(file_path):
+            removed = sum(1 for comment, following in removals[file_path] if self.discard(comment, following))
+            self.close_file(file_path)
+            return removed
+
+        removed = 0
+        errors = []
+        with ThreadPoolExecutor(max_workers=max_workers or DEFAULT_WRITE_WORKERS,
+                                thread_name_prefix="writer") as pool:
+            futures = {pool.submit(apply, file_path): file_path for file_path in removals}
+            for future, file_path in futures.items():
+                try:
+                    removed += future.result()
+                except Exception as e:
+                    # Fichier illisible, non UTF-8... : signalé, les autres fichiers sont traités
+                    errors.append(f"{file_path} : {e}")
+        return removed, errors
+
+    def close_file(self, file_path):
+        """Écrit le fichier s'il a été modifié et libère ses lignes."""
+        with self._lock:
+            lines = self._lines.pop(file_path, None)
+            modified = file_path in self._modified
+            self._modified.discard(file_path)
+        if modified:
+            write_lines_atomically(file_path, lines)
+            self._written.add(file_path)
+
+    def close(self):
+        """Écrit tous les fichiers modifiés ; renvoie la liste des erreurs d'écriture."""
+        errors = []
+        for file_path in list(self._lines):
+            try:
+                self.close_file(file_path)
+            except OSError as e:
+                errors.append(f"{file_path} : {e}")
+        return errors
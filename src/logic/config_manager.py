@@ -1,12 +1,16 @@
 import os
 import json
-from tkinter import messagebox
+import sqlite3
 from src.utils.constants import APP_CONFIG_DIR, SAVED_PATHS_FILE as FAVORITES_FILE
+from src.logic.kept_comments import KeptCommentStore
 
-KEPT_COMMENTS_FILE = os.path.join(APP_CONFIG_DIR, 'kept_comments.json')
+KEPT_COMMENTS_FILE = os.path.join(APP_CONFIG_DIR, 'kept_comments.json')  # Ancien format, migré vers la base
+KEPT_COMMENTS_DB = os.path.join(APP_CONFIG_DIR, 'kept_comments.sqlite3')
 
 IGNORED_EXTENSIONS_FILE = os.path.join(APP_CONFIG_DIR, 'ignored_extensions.json')
 IGNORED_FOLDERS_FILE = os.path.join(APP_CONFIG_DIR, 'ignored_folders.json')
+SCAN_OPTIONS_FILE = os.path.join(APP_CONFIG_DIR, 'scan_options.json')
+SCAN_PROFILES_DIR = os.path.join(APP_CONFIG_DIR, 'scan_profiles')  # Rapports de performance (option profile_scans)
 
 DEFAULT_IGNORED_EXTENSIONS = [
     ".exe", ".dll", ".obj", ".bin", ".pyc", ".git", ".idea", 
@@ -18,6 +22,24 @@ DEFAULT_IGNORED_FOLDERS = [
     "bin", "obj", "build", "dist", "target", "vendor"
 ]
 
+DEFAULT_SCAN_OPTIONS = {
+    "read_workers": 8,  # Threads de lecture des fichiers pendant un scan
+    "binary_files": "label",  # Fichiers binaires détectés : "label" (marqueur) ou "skip" (omis)
+    "large_file_threshold_mb": 5,  # Au-delà, seul un extrait tête/queue est affiché (0 : désactivé)
+    "use_gitignore": False,  # Élaguer les chemins exclus par les .gitignore du projet
+    "kept_comments_per_project": False,  # Commentaires gardés propres au projet revu plutôt que globaux
+    "profile_scans": False,  # Écrire un rapport JSON, un profil cProfile et un instantané tracemalloc par scan
+    "queue_budget_mb": 8,  # Texte en attente d'affichage au-delà duquel la lecture est mise en pause
+    "spill_to_disk": False,  # Au-delà du budget, déborder dans un fichier temporaire plutôt que ralentir la lecture
+    "dedupe_content": False,  # Fichiers identiques à un fichier déjà affiché remplacés par un renvoi vers celui-ci
+}
+
+def _show_error(message):
+    # Import différé : le CLI utilise ConfigManager sans charger tkinter
+    from tkinter import messagebox
+    messagebox.showerror("Erreur", message)
+
+
 class ConfigManager:
 
     @staticmethod
@@ -47,27 +69,35 @@ class ConfigManager:
             with open(FAVORITES_FILE, 'w', encoding='utf-8') as f:
                 json.dump(paths, f, indent=4)
         except IOError as e:
-            messagebox.showerror("Erreur", f"Impossible de sauvegarder les favoris : {e}")
+            _show_error(f"Impossible de sauvegarder les favoris : {e}")
 
     @staticmethod
-    def load_kept_comments():
+    def open_kept_comments():
         try:
-            if os.path.exists(KEPT_COMMENTS_FILE):
-                with open(KEPT_COMMENTS_FILE, "r") as f:
-                    return set(json.load(f))
-        except (IOError, json.JSONDecodeError):
-            return set()
-        return set()
+            os.makedirs(APP_CONFIG_DIR, exist_ok=True)
+            return KeptCommentStore(KEPT_COMMENTS_DB, legacy_json_path=KEPT_COMMENTS_FILE)
+        except (OSError, sqlite3.Error) as e:
+            _show_error(f"Impossible d'ouvrir les commentaires gardés : {e}")
+            # La revue reste possible, mais les choix ne survivront pas à la session
+            return KeptCommentStore(":memory:")
 
     @staticmethod
-    def save_kept_comments(hashes_set):
+    def save_kept_comments(store, hashes, scope):
+        """Enregistre des hashes gardés ; seule la nouvelle entrée est écrite."""
         try:
-            os.makedirs(APP_CONFIG_DIR, exist_ok=True)
-            with open(KEPT_COMMENTS_FILE, "w") as f:
-                json.dump(list(hashes_set), f, indent=4)
-        except IOError as e:
-            messagebox.showerror("Erreur", f"Impossible de sauvegarder les commentaires : {e}")
-    
+            store.add_many(hashes, scope)
+        except sqlite3.Error as e:
+            _show_error(f"Impossible de sauvegarder les commentaires : {e}")
+
+    @staticmethod
+    def forget_kept_comments(store):
+        """Oublie tous les commentaires gardés ; renvoie le nombre d'entrées supprimées."""
+        try:
+            return store.clear()
+        except sqlite3.Error as e:
+            _show_error(f"Impossible d'oublier les commentaires gardés : {e}")
+            return 0
+
     @staticmethod
     def load_ignored_extensions():
         try:
@@ -85,7 +115,7 @@ class ConfigManager:
             with open(IGNORED_EXTENSIONS_FILE, "w") as f:
                 json.dump(extensions, f, indent=4)
         except IOError as e:
-            messagebox.showerror("Erreur", f"Impossible de sauvegarder les extensions : {e}")
+            _show_error(f"Impossible de sauvegarder les extensions : {e}")
 
     @staticmethod
     def load_ignored_folders():
@@ -104,4 +134,24 @@ class ConfigManager:
             with open(IGNORED_FOLDERS_FILE, "w") as f:
                 json.dump(folders, f, indent=4)
         except IOError as e:
-            messagebox.showerror("Erreur", f"Impossible de sauvegarder les dossiers : {e}")
\ No newline at end of file
+            _show_error(f"Impossible de sauvegarder les dossiers : {e}")
+
+    @staticmethod
+    def load_scan_options():
+        options = dict(DEFAULT_SCAN_OPTIONS)
+        try:
+            if os.path.exists(SCAN_OPTIONS_FILE):
+                with open(SCAN_OPTIONS_FILE, "r") as f:
+                    options.update(json.load(f))
+        except (IOError, json.JSONDecodeError):
+            pass
+        return options
+
+    @staticmethod
+    def save_scan_options(options):
+        try:
+            os.makedirs(APP_CONFIG_DIR, exist_ok=True)
+            with open(SCAN_OPTIONS_FILE, "w") as f:
+                json.dump(options, f, indent=4)
+        except IOError as e:
+            _show_error(f"Impossible de sauvegarder les options de scan : {e}")
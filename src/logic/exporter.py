@@ -0,0 +1,34 @@
+import gzip
+import io
+
+# Taille du tampon d'écriture : les blocs sont écrits au fil de l'eau, sans jamais tout assembler
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+def wants_gzip(path, compress=None):
+    """compress=None : compression déduite de l'extension .gz du fichier."""
+    if compress is None:
+        return path.lower().endswith('.gz')
+    return compress
+
+
+def open_export_file(path, compress=None):
+    """Ouvre un fichier texte UTF-8 en écriture, compressé en gzip si demandé."""
+    if wants_gzip(path, compress):
+        raw = gzip.open(path, 'wb', compresslevel=6)
+        return io.TextIOWrapper(raw, encoding='utf-8', newline='', write_through=False)
+    return open(path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_BYTES)
+
+
+def export_chunks(chunks, path, compress=None):
+    """
+    Écrit un flux de morceaux de texte (OutputStore.iter_text, générateur de scan...) dans un fichier.
+    La mémoire utilisée ne dépend pas de la taille totale. Renvoie le nombre de caractères écrits.
+    """
+    written = 0
+    with open_export_file(path, compress) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
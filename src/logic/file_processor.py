@@ -1,99 +1,398 @@
+import hashlib
+import mmap
 import os
-
-
-def process_directory_content(base_path, ignored_extensions=None, ignored_folders=None):
-    if ignored_extensions is None:
-        ignored_extensions = []
-    if ignored_folders is None:
-        ignored_folders = []
-
-    ignored_folders_set = set(ignored_folders)
-
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.logic.binary_sniffer import BinarySniffer, SNIFF_SIZE
+from src.logic.ignore_rules import IgnoreMatcher
+from src.logic.walker import DirectoryTraversal, walk_directory
+
+# Nombre de threads de lecture par défaut (lecture disque = I/O, le GIL est relâché)
+DEFAULT_READ_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+# Nombre de lectures soumises en avance par thread
+PREFETCH_PER_WORKER = 4
+
+ASSET_PLACEHOLDER = "(Contenu binaire ou statique ignoré)\n"
+BINARY_PLACEHOLDER = "(Fichier binaire ignoré)\n"
+# Contenu d'un fichier identique à un fichier déjà affiché (option dedupe)
+DUPLICATE_PLACEHOLDER = "(Identique à {})\n"
+
+# Fichiers volumineux : seuls un extrait de tête et un extrait de queue sont affichés
+LARGE_FILE_EXCERPT_BYTES = 32 * 1024
+# Taille des tranches utilisées pour compter les lignes d'un fichier mappé en mémoire
+LINE_COUNT_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Traitement des fichiers binaires détectés : affichés avec un marqueur ou omis
+BINARY_LABEL = 'label'
+BINARY_SKIP = 'skip'
+
+# Étiquettes possibles d'un en-tête de bloc : "-- [ÉTIQUETTE] chemin --"
+BLOCK_LABELS = ("ASSET", "BINAIRE", "EXTRAIT", "DOUBLON")
+
+# Modes produisant ("data", header, content, total_lines)
+CONTENT_MODES = ('content', 'project_scan', 'flutter')
+# Modes produisant ("data", line, total_elements)
+TREE_MODES = ('architecture', 'folders_only')
+MODES = CONTENT_MODES + TREE_MODES
+
+
+def _decode_text(data):
+    """Décode des octets UTF-8 comme open(..., 'r') et renvoie (contenu, nombre de lignes)."""
+    content = data.decode('utf-8', errors='ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    line_count = content.count('\n')
+    if content and not content.endswith('\n'):
+        line_count += 1
+    return content, line_count
+
+
+def _count_lines(mm, size):
+    """Compte les lignes d'un fichier mappé en mémoire, sur les octets bruts et par tranches."""
+    line_count = 0
+    for start in range(0, size, LINE_COUNT_CHUNK_BYTES):
+        line_count += mm[start:start + LINE_COUNT_CHUNK_BYTES].count(b'\n')
+    if size and mm[size - 1] != ord('\n'):
+        line_count += 1
+    return line_count
+
+
+def _read_excerpt(f, size):
+    """
+    Extrait de tête et de queue d'un fichier volumineux via mmap, coupés sur des fins de ligne.
+    Le fichier n'est jamais décodé ni chargé entièrement en mémoire. Réservé aux fichiers de plus de
+    2 * LARGE_FILE_EXCERPT_BYTES : en deçà, les deux extraits se chevauchent et rien ne serait omis.
+    Renvoie (contenu, nombre de lignes total).
+    """
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        line_count = _count_lines(mm, size)
+
+        head_end = mm.rfind(b'\n', 0, LARGE_FILE_EXCERPT_BYTES) + 1 or min(size, LARGE_FILE_EXCERPT_BYTES)
+        tail_offset = max(0, size - LARGE_FILE_EXCERPT_BYTES)
+        tail_start = mm.find(b'\n', tail_offset) + 1 or tail_offset
+        tail_start = max(tail_start, head_end)
+        head = mm[:head_end]
+        tail = mm[tail_start:]
+
+    head_text, head_lines = _decode_text(head)
+    tail_text, tail_lines = _decode_text(tail)
+    omitted_lines = max(0, line_count - head_lines - tail_lines)
+    omitted_bytes = tail_start - head_end
+    marker = (
+        f"\n[... fichier tronqué : {omitted_lines} lignes ({omitted_bytes} octets) omises "
+        f"sur {line_count} lignes ({size} octets) ...]\n\n"
+    )
+    return head_text + marker + tail_text, line_count
+
+
+def _ordered_map(func, items, max_workers=None):
+    """
+    Applique func à chaque élément via un pool de threads, en restituant
+    les paires (élément, future) dans l'ordre d'entrée.
+    Les lectures sont soumises en avance sur une fenêtre bornée pendant
+    que le parcours des dossiers continue.
+    """
+    if max_workers is None:
+        max_workers = DEFAULT_READ_WORKERS
+    max_workers = max(1, max_workers)
+
+    window = max_workers * PREFETCH_PER_WORKER
+    pending = deque()
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="reader")
+    try:
+        for item in items:
+            pending.append((item, pool.submit(func, item)))
+            if len(pending) >= window:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        # Arrêt anticipé (scan interrompu) : on abandonne les lectures non démarrées
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _FileLoader:
+    """
+    Lecture d'un candidat dans un thread du pool.
+    Renvoie un bloc (étiquette, contenu, nombre de lignes, empreinte) ; étiquette vaut None pour un fichier texte.
+    dedupe : calculer l'empreinte du contenu des fichiers texte lus en entier (None sinon), ici plutôt que
+    dans le thread de scan pour profiter des threads de lecture.
+    """
+
+    def __init__(self, cache=None, large_file_threshold=None, stats=None, dedupe=False):
+        self.cache = cache
+        self.large_file_threshold = large_file_threshold
+        self.stats = stats
+        self.dedupe = dedupe
+        self.sniffer = BinarySniffer()
+
+    def __call__(self, candidate):
+        file_path, _, is_asset = candidate
+        if is_asset:
+            return "ASSET", ASSET_PLACEHOLDER, 0, None
+
+        if self.cache is None:
+            return self._load(file_path)
+
+        # Signature prise avant la lecture : une modification concurrente sera relue au prochain refresh
+        signature = self.cache.signature(file_path)
+        block = self.cache.lookup(file_path, signature)
+        if block is None:
+            block = self._load(file_path)
+            self.cache.store(file_path, signature, block)
+        elif self.stats is not None:
+            self.stats.count_cache_hit()
+        return block
+
+    def _load(self, file_path):
+        if self.sniffer.known_binary(file_path):
+            return "BINAIRE", BINARY_PLACEHOLDER, 0, None
+
+        started = time.perf_counter()
+        with open(file_path, 'rb') as f:
+            # Seule la fenêtre de tête est lue avant de décider si le fichier est binaire
+            sample = f.read(SNIFF_SIZE)
+            if self.sniffer.is_binary(file_path, sample):
+                self._record(file_path, started, None, len(sample))
+                return "BINAIRE", BINARY_PLACEHOLDER, 0, None
+
+            if self.large_file_threshold:
+                size = os.fstat(f.fileno()).st_size
+                # Un fichier que les deux extraits couvriraient en entier est lu normalement
+                if size > max(self.large_file_threshold, 2 * LARGE_FILE_EXCERPT_BYTES):
+                    content, line_count = _read_excerpt(f, size)
+                    self._record(file_path, started, None, size)
+                    return "EXTRAIT", content + "\n", line_count, None
+
+            data = sample + f.read()
+
+        read_done = time.perf_counter()
+        content, line_count = _decode_text(data)
+        digest = hashlib.blake2b(data, digest_size=16).digest() if self.dedupe else None
+        self._record(file_path, started, read_done, len(data))
+        return None, content + "\n", line_count, digest
+
+    def _record(self, file_path, started, read_done, size):
+        """Temps de lecture et de décodage d'un fichier ; read_done vaut None si tout compte comme lecture."""
+        if self.stats is None:
+            return
+        now = time.perf_counter()
+        if read_done is None:
+            read_done = now
+        self.stats.record_file(file_path, read_done - started, now - read_done, size)
+
+
+def _block_header(label, relative_path, is_first):
+    """En-tête d'un bloc de fichier ; les blocs suivants le premier sont précédés d'une ligne vide."""
+    if label:
+        header = f"-- [{label}] {relative_path} --\n"
+    else:
+        header = f"-- {relative_path} --\n"
+    return header if is_first else "\n" + header
+
+
+def parse_block_header(header):
+    """Inverse de _block_header : renvoie (étiquette ou None, chemin relatif)."""
+    text = header.lstrip('\n')[len("-- "):-len(" --\n")]
+    if text.startswith('['):
+        label, _, relative_path = text[1:].partition('] ')
+        if label in BLOCK_LABELS:
+            return label, relative_path
+    return None, text
+
+
+def parse_duplicate_reference(content):
+    """Inverse de DUPLICATE_PLACEHOLDER : chemin relatif de la première copie, ou None."""
+    prefix, _, suffix = DUPLICATE_PLACEHOLDER.partition("{}")
+    if content.startswith(prefix) and content.endswith(suffix):
+        return content[len(prefix):len(content) - len(suffix)]
+    return None
+
+
+def read_file_block(candidate, is_first=False, binary_files=BINARY_LABEL, large_file_threshold=None):
+    """
+    Bloc (en-tête + contenu) d'un seul candidat, tel que le produirait un scan ;
+    None si le fichier est omis (binaire avec BINARY_SKIP) ou illisible. Utilisé par le mode suivi.
+    """
+    try:
+        label, content, _, _ = _FileLoader(large_file_threshold=large_file_threshold)(candidate)
+    except Exception as e:
+        print(f"Erreur lecture fichier {candidate[0]}: {e}")
+        return None
+    if label == "BINAIRE" and binary_files == BINARY_SKIP:
+        return None
+    return _block_header(label, candidate[1], is_first) + content
+
+
+def _emit_file_blocks(candidates, max_workers=None, cache=None, binary_files=BINARY_LABEL,
+                      large_file_threshold=None, dedupe=False, stats=None, cancel=None):
+    """
+    Moteur de lecture commun aux modes contenu.
+    candidates : itérable de (chemin absolu, chemin relatif, est_un_asset), dans l'ordre d'affichage.
+    max_workers : nombre de threads de lecture.
+    cache : ScanCache optionnel, seuls les fichiers modifiés depuis le scan précédent sont relus.
+    binary_files : BINARY_LABEL (fichier listé avec un marqueur) ou BINARY_SKIP (fichier omis).
+    large_file_threshold : taille en octets au-delà de laquelle seul un extrait tête/queue est lu (None : aucune).
+    dedupe : un fichier texte au contenu identique à un fichier déjà produit est remplacé par un renvoi
+    vers celui-ci (bloc [DOUBLON]) ; les octets évités sont comptés dans stats.
+    stats : ScanStats optionnel (lectures, attente des résultats, fichiers produits ou écartés).
+    cancel : threading.Event optionnel ; une fois levé, plus aucun bloc n'est produit et les lectures
+    non démarrées sont abandonnées.
+    Yield des tuples ("data", header, content, total_lines) dans l'ordre des candidats.
+    """
     is_first_file = True
     total_lines = 0
-    
-    for root, dirs, files in os.walk(base_path):
-        dirs[:] = [d for d in dirs if d not in ignored_folders_set]
-
+    first_paths = {}  # empreinte -> chemin relatif de la première occurrence
+
+    if cache is not None:
+        cache.begin_scan()
+
+    loader = _FileLoader(cache, large_file_threshold, stats, dedupe)
+    for (file_path, relative_path, _), future in _ordered_map(loader, candidates, max_workers):
+        if cancel is not None and cancel.is_set():
+            break
+        try:
+            if stats is None:
+                label, content, line_count, digest = future.result()
+            else:
+                waiting = time.perf_counter()
+                label, content, line_count, digest = future.result()
+                stats.add_time("wait", time.perf_counter() - waiting)
+        except Exception as e:
+            print(f"Erreur lecture fichier {file_path}: {e}")
+            if stats is not None:
+                stats.skip("read_error", files=1)
+            continue
+
+        if label == "BINAIRE" and binary_files == BINARY_SKIP:
+            if stats is not None:
+                stats.skip("binary", files=1)
+            continue
+
+        # Empreinte absente : fichier non dédupliqué (binaire, extrait, ou bloc mis en cache sans dedupe)
+        if dedupe and digest is not None:
+            first_path = first_paths.setdefault(digest, relative_path)
+            if first_path != relative_path:
+                reference = DUPLICATE_PLACEHOLDER.format(first_path)
+                saved = len(content.encode('utf-8')) - len(reference.encode('utf-8'))
+                if saved > 0:
+                    label, content = "DOUBLON", reference
+                    if stats is not None:
+                        stats.count_duplicate(saved)
+
+        header = _block_header(label, relative_path, is_first_file)
+        is_first_file = False
+
+        total_lines += line_count
+        if stats is not None:
+            stats.count_emitted()
+        yield "data", header, content, total_lines
+
+    # Un scan annulé n'a pas tout revu : le cache garde ses entrées
+    if cache is not None and not (cancel is not None and cancel.is_set()):
+        cache.end_scan()
+
+
+def process_directory_content(base_path, ignored_extensions=None, ignored_folders=None, use_gitignore=False,
+                              stats=None, cancel=None, **read_options):
+    """
+    use_gitignore : respecter les .gitignore du projet (voir walker.walk_directory).
+    stats : ScanStats optionnel, alimenté par le parcours et les lectures.
+    cancel : threading.Event optionnel, arrête le parcours et les lectures une fois levé.
+    read_options : options du moteur de lecture, voir _emit_file_blocks.
+    """
+    yield from _emit_file_blocks(
+        _content_candidates(base_path, ignored_extensions, ignored_folders, use_gitignore, stats, cancel),
+        stats=stats, cancel=cancel, **read_options
+    )
+
+
+def _content_candidates(base_path, ignored_extensions, ignored_folders, use_gitignore, stats=None, cancel=None):
+    matcher = IgnoreMatcher(ignored_extensions, ignored_folders)
+
+    for root, relative_root, dirs, files in walk_directory(base_path, matcher, use_gitignore, stats=stats,
+                                                           cancel=cancel):
         for filename in sorted(files):
-            if any(filename.lower().endswith(ext.lower()) for ext in ignored_extensions):
-                continue
+            yield os.path.join(root, filename), relative_root + filename, False
 
-            file_path = os.path.join(root, filename)
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                content = "".join(lines)
-                relative_path = os.path.relpath(file_path, base_path).replace('\\', '/')
-
-                header = f"-- {relative_path} --\n"
-                if not is_first_file:
-                    header = "\n" + header
-                is_first_file = False
-
-                total_lines += len(lines)
-                yield "data", header, content + "\n", total_lines
-            except Exception as e:
-                print(f"Erreur lecture fichier {file_path}: {e}")
 
+def _tree_children(traversal, root, relative_root, folders_only):
+    """Entrées (nom, est_un_dossier, à_parcourir) d'un dossier : dossiers triés puis fichiers triés."""
+    listing = traversal.listing(root, relative_root)
+    if listing is None:
+        return deque()
+    dirs, files, linked_dirs = listing
+    entries = deque((name, True, name not in linked_dirs) for name in sorted(dirs))
+    if not folders_only:
+        entries.extend((name, False, False) for name in sorted(files))
+    return entries
 
-def process_directory_architecture(base_path, folders_only=False, ignored_extensions=None, ignored_folders=None):
-    if ignored_extensions is None:
-        ignored_extensions = []
-    if ignored_folders is None:
-        ignored_folders = []
 
-    ignored_folders_set = set(ignored_folders)
+def process_directory_architecture(base_path, folders_only=False, ignored_extensions=None, ignored_folders=None,
+                                   use_gitignore=False, stats=None, cancel=None):
+    matcher = IgnoreMatcher(ignored_extensions, ignored_folders)
+    traversal = DirectoryTraversal(base_path, matcher, use_gitignore, filter_files=not folders_only, stats=stats,
+                                   cancel=cancel)
 
     element_count = 1
-    yield "data", f"{os.path.basename(base_path)}/\n", element_count
-
-    for root, dirs, files in os.walk(base_path):
-        dirs[:] = [d for d in dirs if d not in ignored_folders_set]
-        dirs.sort()
-
-        level = root.replace(base_path, '').count(os.sep)
-        indent = '│   ' * level
-
-        if not folders_only and ignored_extensions:
-            files = [f for f in files if not any(f.lower().endswith(ext.lower()) for ext in ignored_extensions)]
-            files.sort()
-
-        entries = dirs
-        if not folders_only:
-            entries = dirs + files
-
-        for i, name in enumerate(entries):
-            is_last = i == (len(entries) - 1)
-            prefix = '└── ' if is_last else '├── '
-            display_name = name
-            
-            if os.path.isdir(os.path.join(root, name)):
-                display_name += '/'
-
-            element_count += 1
-            yield "data", f"{indent}{prefix}{display_name}\n", element_count
-
-
-def process_project_directory(base_path, ignored_extensions=None, ignored_folders=None):
-    if ignored_extensions is None:
-        ignored_extensions = []
-    if ignored_folders is None:
-        ignored_folders = []
-
-    ignored_folders_set = set(ignored_folders)
+    yield "data", f"{os.path.basename(os.path.normpath(base_path))}/\n", element_count
+
+    # Parcours en profondeur : chaque niveau garde son chemin, son indentation et ses entrées restantes
+    stack = [(base_path, "", "", _tree_children(traversal, base_path, "", folders_only))]
+    while stack and not traversal.cancelled():
+        root, relative_root, indent, entries = stack[-1]
+        if not entries:
+            stack.pop()
+            continue
+
+        name, is_dir, descend = entries.popleft()
+        is_last = not entries
+        prefix = '└── ' if is_last else '├── '
+        display_name = name + '/' if is_dir else name
+
+        element_count += 1
+        if stats is not None:
+            stats.count_emitted()
+        yield "data", f"{indent}{prefix}{display_name}\n", element_count
+
+        if descend:
+            child_root = os.path.join(root, name)
+            child_relative_root = relative_root + name + "/"
+            child_indent = indent + ('    ' if is_last else '│   ')
+            stack.append((child_root, child_relative_root, child_indent,
+                          _tree_children(traversal, child_root, child_relative_root, folders_only)))
+
+
+def process_project_directory(base_path, ignored_extensions=None, ignored_folders=None, use_gitignore=False,
+                              stats=None, cancel=None, **read_options):
+    """
+    use_gitignore : respecter les .gitignore du projet (voir walker.walk_directory).
+    stats : ScanStats optionnel, alimenté par le parcours et les lectures.
+    cancel : threading.Event optionnel, arrête le parcours et les lectures une fois levé.
+    read_options : options du moteur de lecture, voir _emit_file_blocks.
+    """
+    yield from _emit_file_blocks(
+        _project_candidates(base_path, ignored_extensions, ignored_folders, use_gitignore, stats, cancel),
+        stats=stats, cancel=cancel, **read_options
+    )
+
+
+def _project_candidates(base_path, ignored_extensions, ignored_folders, use_gitignore, stats=None, cancel=None):
+    matcher = IgnoreMatcher(ignored_extensions, ignored_folders)
 
     backend_exclude = {'venv', '__pycache__'}
     frontend_exclude = {'bin', 'obj', 'AppIcon', 'Fonts', 'Images', 'Raw', 'Splash', 'Properties'}
     uploads_exclude = {'annals', 'tutorials'}
-    
-    is_first_file = True
-    total_lines = 0
 
-    for root, dirs, files in os.walk(base_path, topdown=True):
+    for root, relative_root, dirs, files in walk_directory(base_path, matcher, use_gitignore, stats=stats,
+                                                           cancel=cancel):
+        dir_count = len(dirs)
         dirs[:] = [d for d in dirs if not d.startswith('.')]
-
-        dirs[:] = [d for d in dirs if d not in ignored_folders_set]
+        if stats is not None:
+            stats.skip("hidden", dirs=dir_count - len(dirs))
+            dir_count = len(dirs)
 
         if 'backend' in root:
             dirs[:] = [d for d in dirs if d not in backend_exclude]
@@ -101,45 +400,41 @@ def process_project_directory(base_path, ignored_extensions=None, ignored_folder
             dirs[:] = [d for d in dirs if d not in frontend_exclude]
         elif 'uploads' in root:
             dirs[:] = [d for d in dirs if d not in uploads_exclude]
+        if stats is not None:
+            stats.skip("project_rules", dirs=dir_count - len(dirs))
 
         for filename in sorted(files):
             if filename.startswith('.'):
+                if stats is not None:
+                    stats.skip("hidden", files=1)
                 continue
 
-            if any(filename.lower().endswith(ext.lower()) for ext in ignored_extensions):
-                continue
-
-            file_path = os.path.join(root, filename)
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                content = "".join(lines)
-                relative_path = os.path.relpath(file_path, base_path).replace('\\', '/')
-
-                header = f"-- {relative_path} --\n"
-                if not is_first_file:
-                    header = "\n" + header
-                is_first_file = False
-
-                total_lines += len(lines)
-                yield "data", header, content + "\n", total_lines
-            except Exception as e:
-                print(f"Erreur lors de la lecture du fichier {file_path}: {e}")
+            yield os.path.join(root, filename), relative_root + filename, False
 
 
 # === Mode Flutter ===
-def process_flutter_project(base_path, ignored_extensions=None, ignored_folders=None):
-    if ignored_extensions is None:
-        ignored_extensions = []
-    if ignored_folders is None:
-        ignored_folders = []
-
+def process_flutter_project(base_path, ignored_extensions=None, ignored_folders=None, use_gitignore=False,
+                            stats=None, cancel=None, **read_options):
+    """
+    use_gitignore : respecter les .gitignore du projet (voir walker.walk_directory).
+    stats : ScanStats optionnel, alimenté par le parcours et les lectures.
+    cancel : threading.Event optionnel, arrête le parcours et les lectures une fois levé.
+    read_options : options du moteur de lecture, voir _emit_file_blocks.
+    """
+    yield from _emit_file_blocks(
+        _flutter_candidates(base_path, ignored_extensions, ignored_folders, use_gitignore, stats, cancel),
+        stats=stats, cancel=cancel, **read_options
+    )
+
+
+def _flutter_candidates(base_path, ignored_extensions, ignored_folders, use_gitignore, stats=None, cancel=None):
     # Ignorer les dossiers de build et caches Flutter classiques
-    flutter_ignored = {
+    # ('ios/Pods' et 'macos/Pods' sont des motifs de chemin relatifs à la racine)
+    flutter_ignored = [
         '.dart_tool', 'build', '.pub-cache', '.fvm', 
         'ios/Pods', 'macos/Pods', '.git', '.idea'
-    }
-    ignored_folders_set = set(ignored_folders).union(flutter_ignored)
+    ]
+    matcher = IgnoreMatcher(ignored_extensions, list(ignored_folders or []) + flutter_ignored)
 
     # Extensions utiles pour un projet Flutter complet
     relevant_extensions = {
@@ -153,16 +448,18 @@ def process_flutter_project(base_path, ignored_extensions=None, ignored_folders=
         '.arb'         # Fichiers de traduction (l10n)
     }
 
-    is_first_file = True
-    total_lines = 0
-
-    for root, dirs, files in os.walk(base_path):
+    # Les règles de fichiers sont appliquées plus bas, après la détection des assets
+    for root, relative_root, dirs, files in walk_directory(base_path, matcher, use_gitignore, filter_files=False,
+                                                           stats=stats, cancel=cancel):
         # Filtrage des dossiers
-        dirs[:] = [d for d in dirs if d not in ignored_folders_set and not d.startswith('.')]
+        dir_count = len(dirs)
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        if stats is not None:
+            stats.skip("hidden", dirs=dir_count - len(dirs))
 
         for filename in sorted(files):
             file_path = os.path.join(root, filename)
-            relative_path = os.path.relpath(file_path, base_path).replace('\\', '/')
+            relative_path = relative_root + filename
             
             # Gestion du dossier ASSETS (et sous-dossiers)
             # Si le chemin contient "assets/" ou "images/" ou "fonts/", on affiche juste le nom
@@ -171,16 +468,14 @@ def process_flutter_project(base_path, ignored_extensions=None, ignored_folders=
             
             # Si c'est un asset (et pas un fichier de code égaré dedans), on liste juste le nom
             if is_asset and not filename.endswith('.dart'):
-                header = f"-- [ASSET] {relative_path} --\n"
-                if not is_first_file:
-                    header = "\n" + header
-                is_first_file = False
-                # On yield un contenu vide pour les assets
-                yield "data", header, "(Contenu binaire ou statique ignoré)\n", total_lines
+                # Contenu remplacé par un simple marqueur, aucune lecture disque
+                yield file_path, relative_path, True
                 continue
 
             # Vérification des extensions ignorées globalement
-            if any(filename.lower().endswith(ext.lower()) for ext in ignored_extensions):
+            if matcher.ignores_file(filename, relative_root):
+                if stats is not None:
+                    stats.skip("ignore_rules", files=1)
                 continue
 
             # Vérification si c'est un fichier pertinent pour Flutter
@@ -191,17 +486,52 @@ def process_flutter_project(base_path, ignored_extensions=None, ignored_folders=
                 is_relevant = True
 
             if is_relevant:
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                    
-                    content = "".join(lines)
-                    header = f"-- {relative_path} --\n"
-                    if not is_first_file:
-                        header = "\n" + header
-                    is_first_file = False
-
-                    total_lines += len(lines)
-                    yield "data", header, content + "\n", total_lines
-                except Exception as e:
-                    print(f"Erreur lecture {file_path}: {e}")
\ No newline at end of file
+                yield file_path, relative_path, False
+            elif stats is not None:
+                stats.skip("not_flutter", files=1)
+
+
+_CANDIDATES = {
+    'content': _content_candidates,
+    'project_scan': _project_candidates,
+    'flutter': _flutter_candidates,
+}
+
+
+def iter_candidates(mode, base_path, ignored_extensions=None, ignored_folders=None, use_gitignore=False):
+    """Fichiers (chemin, chemin relatif, est_un_asset) qu'un mode contenu afficherait, sans les lire."""
+    return _CANDIDATES[mode](base_path, ignored_extensions, ignored_folders, use_gitignore)
+
+
+def processor_options_from_settings(scan_options):
+    """Traduit les options de scan enregistrées (ConfigManager) en arguments de create_processor."""
+    return {
+        "use_gitignore": scan_options["use_gitignore"],
+        "max_workers": scan_options["read_workers"],
+        "binary_files": scan_options["binary_files"],
+        "large_file_threshold": int(scan_options["large_file_threshold_mb"] * 1024 * 1024) or None,
+        "dedupe": scan_options["dedupe_content"],
+    }
+
+
+def create_processor(mode, base_path, ignored_extensions=None, ignored_folders=None, use_gitignore=False,
+                     stats=None, cancel=None, **read_options):
+    """
+    Renvoie le générateur correspondant au mode de scan (interface graphique et CLI).
+    stats : ScanStats optionnel, transmis à tous les modes.
+    cancel : threading.Event optionnel ; une fois levé, le scan s'arrête sans attendre la fin du parcours.
+    read_options n'est transmis qu'aux modes contenu (voir _emit_file_blocks).
+    """
+    if mode == 'project_scan':
+        return process_project_directory(base_path, ignored_extensions, ignored_folders, use_gitignore, stats,
+                                         cancel, **read_options)
+    if mode == 'flutter':
+        return process_flutter_project(base_path, ignored_extensions, ignored_folders, use_gitignore, stats,
+                                       cancel, **read_options)
+    if mode == 'content':
+        return process_directory_content(base_path, ignored_extensions, ignored_folders, use_gitignore, stats,
+                                         cancel, **read_options)
+    if mode in TREE_MODES:
+        return process_directory_architecture(base_path, mode == 'folders_only', ignored_extensions, ignored_folders,
+                                              use_gitignore, stats, cancel)
+    raise ValueError(f"Mode de scan inconnu : {mode}")
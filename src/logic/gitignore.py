@@ -0,0 +1,139 @@
+import os
+import re
+
+from src.logic.ignore_rules import glob_to_regex
+
+
+def _parse_line(line):
+    """Renvoie (motif, négation, dossier_seulement) ou None pour une ligne vide / un commentaire."""
+    line = line.rstrip('\n').rstrip('\r')
+    if not line or line.startswith('#'):
+        return None
+    # Espaces finaux ignorés sauf s'ils sont échappés
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\#') or line.startswith('\\!'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    return line, negated, dir_only
+
+
+class _RuleFile:
+    """Règles d'un fichier .gitignore, relatives au dossier qui le contient."""
+
+    def __init__(self, base_relative, lines):
+        self.base_relative = base_relative  # '' ou 'a/b/'
+        self.rules = []
+        for line in lines:
+            parsed = _parse_line(line)
+            if parsed is None:
+                continue
+            pattern, negated, dir_only = parsed
+            # Le contenu des dossiers exclus n'est jamais parcouru : inutile de le couvrir
+            regex = re.compile(glob_to_regex(pattern, include_contents=False))
+            self.rules.append((regex, negated, dir_only))
+        # Pré-filtre : une seule regex pour savoir si au moins une règle s'applique
+        self.any_rule = re.compile('|'.join(f'(?:{r.pattern})' for r, _, _ in self.rules)) if self.rules else None
+
+    def verdict(self, relative_path, is_dir):
+        """True (ignoré), False (réintégré) ou None (aucune règle). La dernière règle qui correspond l'emporte."""
+        if self.any_rule is None or not relative_path.startswith(self.base_relative):
+            return None
+        local_path = relative_path[len(self.base_relative):]
+        if not self.any_rule.fullmatch(local_path):
+            return None
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(local_path):
+                return not negated
+        return None
+
+
+def _read_rule_file(path, base_relative):
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return _RuleFile(base_relative, f.readlines())
+    except OSError:
+        return None
+
+
+def _find_repository_root(path):
+    current = os.path.abspath(path)
+    while True:
+        if os.path.isdir(os.path.join(current, '.git')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+class GitignoreFilter:
+    """
+    Exclusions .gitignore pendant un parcours : .gitignore imbriqués, .gitignore des dossiers parents
+    jusqu'à la racine du dépôt et .git/info/exclude. Les chemins manipulés sont relatifs à la racine du scan.
+    """
+
+    def __init__(self, base_path):
+        self._chains = {}
+        root_chain = []
+
+        repository_root = _find_repository_root(base_path)
+        if repository_root is not None:
+            # Les règles des dossiers parents sont ré-exprimées relativement à la racine du scan
+            scan_prefix = os.path.relpath(os.path.abspath(base_path), repository_root).replace('\\', '/')
+            scan_prefix = "" if scan_prefix == "." else scan_prefix + "/"
+            self._prefix = scan_prefix
+
+            exclude = _read_rule_file(os.path.join(repository_root, '.git', 'info', 'exclude'), "")
+            if exclude is not None:
+                root_chain.append(exclude)
+
+            parent = repository_root
+            parent_relative = ""
+            for part in scan_prefix.split('/')[:-1]:
+                rule_file = _read_rule_file(os.path.join(parent, '.gitignore'), parent_relative)
+                if rule_file is not None:
+                    root_chain.append(rule_file)
+                parent = os.path.join(parent, part)
+                parent_relative += part + "/"
+        else:
+            self._prefix = ""
+
+        self._chains[""] = root_chain
+
+    def enter(self, root, relative_root, files):
+        """À appeler en entrant dans un dossier : charge son .gitignore. Renvoie la chaîne de règles active."""
+        chain = self._chains.pop(relative_root, [])
+        if '.gitignore' in files:
+            rule_file = _read_rule_file(os.path.join(root, '.gitignore'), self._prefix + relative_root)
+            if rule_file is not None and rule_file.rules:
+                chain = chain + [rule_file]
+        return chain
+
+    def _ignored(self, chain, relative_path, is_dir):
+        full_path = self._prefix + relative_path
+        # Les .gitignore les plus profonds sont prioritaires
+        for rule_file in reversed(chain):
+            verdict = rule_file.verdict(full_path, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+    def filter_dirs(self, chain, dirs, relative_root):
+        kept = [d for d in dirs if d != '.git' and not self._ignored(chain, relative_root + d, True)]
+        for d in kept:
+            self._chains[relative_root + d + "/"] = chain
+        return kept
+
+    def filter_files(self, chain, files, relative_root):
+        return [f for f in files if not self._ignored(chain, relative_root + f, False)]
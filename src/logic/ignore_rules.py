@@ -0,0 +1,221 @@
+import re
+
+_GLOB_CHARS = set('*?[')
+
+
+def is_pattern(rule):
+    """True si la règle est un motif (glob ou chemin) plutôt qu'un simple suffixe / nom."""
+    return '/' in rule or any(c in _GLOB_CHARS for c in rule)
+
+
+def glob_to_regex(pattern, include_contents=True):
+    """
+    Traduit un motif de type .gitignore en expression régulière sur un chemin relatif ('/' comme séparateur).
+    - sans '/' (hors '/' final) : le motif s'applique au nom, à n'importe quelle profondeur ;
+    - avec '/' : le motif est ancré à la racine du scan (un '/' initial est facultatif) ;
+    - '**' traverse les dossiers, '*' et '?' restent dans un segment, '[...]' est une classe.
+    include_contents : les éléments contenus dans un dossier désigné sont aussi couverts.
+    """
+    pattern = pattern.rstrip('/')
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    parts = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                if pattern.startswith('**/', i):
+                    parts.append('(?:.*/)?')
+                    i += 3
+                else:
+                    parts.append('.*')
+                    i += 2
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2 if pattern.startswith('[!', i) else i + 1)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+
+    prefix = '' if anchored else '(?:.*/)?'
+    suffix = '(?:/.*)?' if include_contents else ''
+    return prefix + ''.join(parts) + suffix
+
+
+class _RuleSet:
+    """Règles compilées : suffixes groupés par longueur, noms exacts et motifs réunis en une regex."""
+
+    def __init__(self, suffixes=(), names=(), patterns=(), include_contents=True):
+        self.suffixes_by_length = {}
+        for suffix in suffixes:
+            suffix = suffix.lower()
+            self.suffixes_by_length.setdefault(len(suffix), set()).add(suffix)
+        # Longueurs décroissantes : un seul slice par longueur distincte
+        self.suffix_lengths = sorted(self.suffixes_by_length, reverse=True)
+        self.names = frozenset(names)
+        self.regex = None
+        if patterns:
+            self.regex = re.compile('|'.join(f'(?:{glob_to_regex(p, include_contents)})' for p in patterns),
+                                    re.IGNORECASE)
+
+    def __bool__(self):
+        return bool(self.suffix_lengths or self.names or self.regex)
+
+    @property
+    def needs_path(self):
+        return self.regex is not None
+
+    def matches(self, name, relative_path=None):
+        if name in self.names:
+            return True
+        if self.suffix_lengths:
+            lower_name = name.lower()
+            for length in self.suffix_lengths:
+                if lower_name[-length:] in self.suffixes_by_length[length]:
+                    return True
+        if self.regex is not None:
+            return self.regex.fullmatch(relative_path if relative_path is not None else name) is not None
+        return False
+
+
+def _split_rules(rules):
+    positives, negatives = [], []
+    for rule in rules or ():
+        rule = rule.strip()
+        if not rule or rule == '!':
+            continue
+        if rule.startswith('!'):
+            negatives.append(rule[1:])
+        else:
+            positives.append(rule)
+    return positives, negatives
+
+
+def _compile_file_rules(rules):
+    suffixes = [r for r in rules if not is_pattern(r)]
+    patterns = [r for r in rules if is_pattern(r)]
+    return _RuleSet(suffixes=suffixes, patterns=patterns)
+
+
+def _compile_file_negations(rules):
+    # Une négation désigne un fichier précis : "!keep.json" ne réintègre pas "mykeep.json"
+    names = [r for r in rules if not is_pattern(r)]
+    patterns = [r for r in rules if is_pattern(r)]
+    return _RuleSet(names=names, patterns=patterns)
+
+
+def _compile_keep_ancestors(rules):
+    """
+    Regex des dossiers à traverser pour atteindre les négations de dossiers ancrées :
+    "vendor/ma_lib" -> "vendor". Un segment '**' arrête la liste (profondeur inconnue). None si aucun.
+    """
+    ancestors = []
+    for rule in rules:
+        segments = rule.strip('/').split('/')
+        for depth in range(1, len(segments)):
+            if '**' in segments[depth - 1]:
+                break
+            ancestors.append('/' + '/'.join(segments[:depth]))
+    if not ancestors:
+        return None
+    return re.compile('|'.join(f'(?:{glob_to_regex(a, include_contents=False)})' for a in ancestors),
+                      re.IGNORECASE)
+
+
+def _compile_folder_rules(rules, include_contents=True):
+    names = [r for r in rules if not is_pattern(r)]
+    patterns = [r for r in rules if is_pattern(r)]
+    return _RuleSet(names=names, patterns=patterns, include_contents=include_contents)
+
+
+class IgnoreMatcher:
+    """
+    Règles d'exclusion des paramètres (ConfigManager / SettingsView), compilées une fois par scan.
+
+    Extensions / fichiers :
+        ".exe"                       suffixe du nom, insensible à la casse (comportement historique)
+        "src/**/generated/*.dart"    motif sur le chemin relatif
+        "!keep.json"                 négation : réintègre les fichiers de ce nom exact (ou ce motif)
+    Dossiers :
+        "node_modules"               nom exact, à n'importe quelle profondeur
+        "*.egg-info", "ios/Pods"     motif sur le nom ou sur le chemin relatif
+        "!vendor/ma_lib"             négation : réintègre ce dossier même sous un dossier exclu
+    Contrairement à .gitignore, un dossier exclu qui mène à une négation de dossier ancrée n'est pas élagué :
+    il est parcouru, mais seul le chemin réintégré en ressort (le reste de son contenu reste exclu).
+    """
+
+    def __init__(self, ignored_extensions=None, ignored_folders=None):
+        file_rules, file_negations = _split_rules(ignored_extensions)
+        folder_rules, folder_negations = _split_rules(ignored_folders)
+        self._files = _compile_file_rules(file_rules)
+        self._files_keep = _compile_file_negations(file_negations)
+        self._folders = _compile_folder_rules(folder_rules)
+        self._folders_keep = _compile_folder_rules(folder_negations)
+        self._file_needs_path = self._files.needs_path or self._files_keep.needs_path
+        self._folder_needs_path = self._folders.needs_path or self._folders_keep.needs_path
+        # Dossiers exclus traversés vers une négation ancrée ; chemin relatif -> exclu (directement ou par un parent)
+        self._keep_ancestors = _compile_keep_ancestors(folder_negations) if self._folders else None
+        self._excluded_dirs = {}
+        if self._keep_ancestors is not None:
+            # Les parents sont évalués d'abord : chaque règle ne désigne ici que le dossier lui-même,
+            # sans quoi "ios/Pods" recouvrirait le contenu d'un "!ios/Pods/Keep"
+            self._folders_exact = _compile_folder_rules(folder_rules, include_contents=False)
+
+    def _excluded_dir(self, relative_path):
+        """Dossier exclu par une règle ou par un dossier parent exclu, sauf négation (chemin sans '/' final)."""
+        excluded = self._excluded_dirs.get(relative_path)
+        if excluded is None:
+            parent, _, name = relative_path.rpartition('/')
+            if self._folders_keep and self._folders_keep.matches(name, relative_path):
+                excluded = False
+            else:
+                excluded = (bool(parent and self._excluded_dir(parent))
+                            or self._folders_exact.matches(name, relative_path))
+            self._excluded_dirs[relative_path] = excluded
+        return excluded
+
+    def ignores_file(self, name, relative_root=""):
+        """relative_root : chemin relatif du dossier parent, vide ou terminé par '/'."""
+        relative_path = relative_root + name if self._file_needs_path else None
+        if self._keep_ancestors is not None and relative_root and self._excluded_dir(relative_root[:-1]):
+            # Fichier d'un dossier exclu, traversé seulement pour atteindre une négation
+            return not (self._files_keep and self._files_keep.matches(name, relative_root + name))
+        if not self._files:
+            return False
+        if not self._files.matches(name, relative_path):
+            return False
+        return not (self._files_keep and self._files_keep.matches(name, relative_path))
+
+    def ignores_dir(self, name, relative_root=""):
+        if not self._folders:
+            return False
+        relative_path = relative_root + name if self._folder_needs_path else None
+        if self._keep_ancestors is not None:
+            return self._excluded_dir(relative_path) and not self._keep_ancestors.fullmatch(relative_path)
+        if not self._folders.matches(name, relative_path):
+            return False
+        return not (self._folders_keep and self._folders_keep.matches(name, relative_path))
+
+    def filter_files(self, names, relative_root=""):
+        if not self._files and self._keep_ancestors is None:
+            return list(names)
+        return [name for name in names if not self.ignores_file(name, relative_root)]
+
+    def filter_dirs(self, names, relative_root=""):
+        if not self._folders:
+            return list(names)
+        return [name for name in names if not self.ignores_dir(name, relative_root)]
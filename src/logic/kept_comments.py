@@ -0,0 +1,168 @@
+import json
+import os
+import sqlite3
+from urllib.request import pathname2url
+
+# Version du schéma, conservée dans PRAGMA user_version
+SCHEMA_VERSION = 1
+# Proportion de pages libres au-delà de laquelle la base est compactée (ouverture, suppressions)
+COMPACT_FREE_RATIO = 0.25
+# Portée des commentaires gardés pour tous les projets
+GLOBAL_SCOPE = ""
+
+
+def project_scope(project_path):
+    """Clé de portée d'un projet : son chemin absolu normalisé."""
+    return os.path.normcase(os.path.abspath(project_path))
+
+
+class KeptCommentStore:
+    """
+    Hashes des commentaires gardés, dans une base SQLite.
+    Chaque « Garder » est une insertion (aucune réécriture complète) et les hashes sont stockés
+    sous forme binaire (32 octets au lieu de 64 caractères hexadécimaux).
+    Une entrée est globale ou propre à un projet ; la recherche d'un projet voit les deux.
+    Les suppressions (remove_many, clear) compactent la base dès que les pages libres dépassent
+    COMPACT_FREE_RATIO, pour que le fichier rétrécisse réellement.
+    """
+
+    def __init__(self, db_path, legacy_json_path=None):
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._create_schema(legacy_json_path)
+        else:
+            self._compact_if_fragmented()
+
+    def _create_schema(self, legacy_json_path):
+        """Crée la table et importe une seule fois l'ancien fichier kept_comments.json."""
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS kept_comments ("
+                " scope TEXT NOT NULL,"
+                " digest BLOB NOT NULL,"
+                " PRIMARY KEY (scope, digest)"
+                ") WITHOUT ROWID"
+            )
+            imported = self._import_legacy_json(legacy_json_path)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if imported:
+            # Le fichier est conservé sous un autre nom, mais n'est plus relu
+            try:
+                os.replace(legacy_json_path, legacy_json_path + ".migrated")
+            except OSError as e:
+                print(f"Erreur renommage {legacy_json_path}: {e}")
+
+    def _import_legacy_json(self, legacy_json_path):
+        hashes = _load_legacy_json(legacy_json_path)
+        if hashes is None:
+            return False
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO kept_comments (scope, digest) VALUES (?, ?)",
+            ((GLOBAL_SCOPE, digest) for digest in _digests(hashes))
+        )
+        return True
+
+    def _compact_if_fragmented(self):
+        page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._connection.execute("PRAGMA freelist_count").fetchone()[0]
+        if page_count and free_pages / page_count > COMPACT_FREE_RATIO:
+            self.compact()
+
+    def compact(self):
+        """Reconstruit la base sans pages libres et vide le journal WAL."""
+        self._connection.execute("VACUUM")
+        self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def hashes_for(self, scope=GLOBAL_SCOPE):
+        """Hashes (hexadécimaux) visibles depuis une portée : globaux, plus ceux du projet."""
+        rows = self._connection.execute(
+            "SELECT digest FROM kept_comments WHERE scope IN (?, ?)", (GLOBAL_SCOPE, scope)
+        )
+        return {digest.hex() for (digest,) in rows}
+
+    def add(self, comment_hash, scope=GLOBAL_SCOPE):
+        self.add_many([comment_hash], scope)
+
+    def add_many(self, comment_hashes, scope=GLOBAL_SCOPE):
+        """Ajoute des hashes en une transaction."""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO kept_comments (scope, digest) VALUES (?, ?)",
+                ((scope, digest) for digest in _digests(comment_hashes))
+            )
+
+    def remove_many(self, comment_hashes, scope=GLOBAL_SCOPE):
+        """Retire des hashes d'une portée en une transaction ; renvoie le nombre d'entrées supprimées."""
+        with self._connection:
+            removed = self._connection.executemany(
+                "DELETE FROM kept_comments WHERE scope = ? AND digest = ?",
+                ((scope, digest) for digest in _digests(comment_hashes))
+            ).rowcount
+        if removed:
+            self._compact_if_fragmented()
+        return removed
+
+    def clear(self, scope=None):
+        """Oublie les hashes d'une portée, ou tous si scope vaut None ; renvoie le nombre d'entrées supprimées."""
+        with self._connection:
+            if scope is None:
+                removed = self._connection.execute("DELETE FROM kept_comments").rowcount
+            else:
+                removed = self._connection.execute("DELETE FROM kept_comments WHERE scope = ?", (scope,)).rowcount
+        if removed:
+            self._compact_if_fragmented()
+        return removed
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM kept_comments").fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+
+def read_kept_hashes(db_path, legacy_json_path=None, scope=GLOBAL_SCOPE):
+    """
+    Hashes visibles depuis une portée, lus sans rien modifier sur le disque (ni création de la base,
+    ni migration de l'ancien JSON, ni compactage) : utilisé par la ligne de commande.
+    Sans base migrée, l'ancien fichier kept_comments.json est lu directement.
+    """
+    if os.path.exists(db_path):
+        # Journal WAL présent (application ouverte) : lecture seule classique, qui en tient compte ;
+        # sinon immutable, qui ne crée pas non plus les fichiers -wal et -shm
+        flag = "mode=ro" if os.path.exists(db_path + "-wal") else "immutable=1"
+        connection = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?{flag}", uri=True)
+        try:
+            if connection.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                rows = connection.execute(
+                    "SELECT digest FROM kept_comments WHERE scope IN (?, ?)", (GLOBAL_SCOPE, scope)
+                )
+                return {digest.hex() for (digest,) in rows}
+        finally:
+            connection.close()
+    hashes = _load_legacy_json(legacy_json_path)
+    return {digest.hex() for digest in _digests(hashes)} if hashes else set()
+
+
+def _load_legacy_json(legacy_json_path):
+    """Liste de hashes de l'ancien fichier kept_comments.json, ou None s'il est absent ou illisible."""
+    if not legacy_json_path or not os.path.exists(legacy_json_path):
+        return None
+    try:
+        with open(legacy_json_path, "r") as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"Erreur lecture {legacy_json_path}: {e}")
+        return None
+
+
+def _digests(comment_hashes):
+    """Hashes hexadécimaux -> octets ; les valeurs invalides sont ignorées."""
+    for comment_hash in comment_hashes:
+        try:
+            yield bytes.fromhex(comment_hash)
+        except (TypeError, ValueError):
+            continue
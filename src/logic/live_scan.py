@@ -0,0 +1,220 @@
+import os
+
+from src.logic import file_processor
+from src.logic.ignore_rules import IgnoreMatcher
+from src.logic.walker import relative_root_of
+from src.logic.watcher import create_watcher, watch_changes
+
+
+class _LiveScan:
+    """
+    Résultat d'un scan tenu à jour pendant le suivi d'un dossier.
+    apply(batch) renvoie les remplacements (première ligne, lignes remplacées, nouvelles lignes)
+    à appliquer dans l'ordre au texte affiché (voir OutputStore.replace_lines).
+    """
+
+    def __init__(self, mode, base_path, ignored_extensions=None, ignored_folders=None, use_gitignore=False):
+        self.mode = mode
+        self.base_path = base_path
+        self.ignored_extensions = ignored_extensions
+        self.ignored_folders = ignored_folders
+        self.use_gitignore = use_gitignore
+
+    def create_watcher(self):
+        """Surveillance du dossier avec les mêmes règles d'exclusion que le scan (à fermer par l'appelant)."""
+        return create_watcher(self.base_path, IgnoreMatcher(self.ignored_extensions, self.ignored_folders),
+                              self.use_gitignore)
+
+    def watch(self, watcher, stop):
+        """
+        Yield (ChangeBatch, remplacements) pour chaque lot d'événements, jusqu'à ce que stop soit levé.
+        Pour un lot en débordement (événements perdus), les remplacements valent None : rescan nécessaire.
+        """
+        for batch in watch_changes(watcher, stop):
+            yield batch, None if batch.overflow else self.apply(batch)
+
+    def apply(self, batch):
+        raise NotImplementedError
+
+
+def shown_block(header, content):
+    """Entrée de ContentLiveScan pour un bloc produit par un scan en mode contenu."""
+    label, relative_path = file_processor.parse_block_header(header)
+    original = file_processor.parse_duplicate_reference(content) if label == "DOUBLON" else None
+    return relative_path, header.count('\n') + content.count('\n'), label == "ASSET", original
+
+
+class ContentLiveScan(_LiveScan):
+    """
+    Modes contenu. blocks : entrées (chemin relatif, nombre de lignes, est_un_asset, première copie ou None)
+    des blocs affichés, dans l'ordre (voir shown_block).
+    Un fichier modifié n'est relu que lui-même ; une création ou suppression relance le listage
+    des candidats (sans lecture) et seuls les blocs apparus ou disparus sont lus ou retirés.
+    Un fichier « créé » qui a déjà son bloc (remplacement atomique) est relu comme un fichier modifié.
+    Un bloc [DOUBLON] dont la première copie est modifiée ou retirée est relu en entier : son renvoi
+    ne serait plus vrai. Les blocs relus pendant le suivi ne sont jamais dédupliqués.
+    """
+
+    def __init__(self, mode, base_path, blocks, ignored_extensions=None, ignored_folders=None, use_gitignore=False,
+                 binary_files=file_processor.BINARY_LABEL, large_file_threshold=None):
+        super().__init__(mode, base_path, ignored_extensions, ignored_folders, use_gitignore)
+        self.binary_files = binary_files
+        self.large_file_threshold = large_file_threshold
+        self.paths = [rel for rel, _, _, _ in blocks]
+        self.line_counts = [line_count for _, line_count, _, _ in blocks]
+        self.assets = [is_asset for _, _, is_asset, _ in blocks]
+        # Première copie -> blocs [DOUBLON] qui y renvoient
+        self.duplicates = {}
+        for rel, _, _, original in blocks:
+            if original is not None:
+                self.duplicates.setdefault(original, set()).add(rel)
+        self._removed = []  # chemins des blocs retirés pendant le lot en cours
+        # Seul le premier bloc n'est pas précédé d'une ligne vide
+        self.leads = [position > 0 for position in range(len(blocks))]
+        self.skipped = set()  # candidats omis à la lecture (binaires) : relus seulement s'ils changent
+        self._reindex()
+
+    def _reindex(self):
+        self.index = {rel: position for position, rel in enumerate(self.paths)}
+
+    def _start_line(self, position):
+        return sum(self.line_counts[:position])
+
+    def _read(self, file_path, rel, is_asset, position):
+        text = file_processor.read_file_block((file_path, rel, is_asset), position == 0, self.binary_files,
+                                              self.large_file_threshold)
+        return None if text is None else text.split('\n')[:-1]
+
+    def apply(self, batch):
+        edits = []
+        touched = set()
+        modified = {}
+        for path in batch.modified:
+            rel = relative_root_of(path, self.base_path)[:-1]
+            modified[rel] = path
+        self._removed = []
+        if batch.structural or any(rel in self.skipped for rel in modified):
+            touched = self._sync_structure(edits, modified)
+        for rel in list(modified) + self._removed:
+            for duplicate in self.duplicates.pop(rel, ()):
+                if duplicate in self.index:
+                    modified.setdefault(duplicate, os.path.join(self.base_path, duplicate))
+
+        for rel, path in modified.items():
+            position = self.index.get(rel)
+            if rel in touched or position is None or self.assets[position]:
+                continue
+            lines = self._read(path, rel, False, position)
+            if lines is None:
+                self._remove(position, edits)
+                self.skipped.add(rel)
+                self._reindex()
+                self._fix_leading_lines(edits)
+            else:
+                edits.append((self._start_line(position), self.line_counts[position], lines))
+                self.line_counts[position] = len(lines)
+                self.leads[position] = position > 0
+        return edits
+
+    def _remove(self, position, edits):
+        edits.append((self._start_line(position), self.line_counts[position], []))
+        self._removed.append(self.paths[position])
+        del self.paths[position], self.line_counts[position], self.assets[position], self.leads[position]
+
+    def _sync_structure(self, edits, modified):
+        """Aligne les blocs sur la liste actuelle des candidats ; renvoie les chemins relus."""
+        candidates = list(file_processor.iter_candidates(self.mode, self.base_path, self.ignored_extensions,
+                                                         self.ignored_folders, self.use_gitignore))
+        wanted = {rel for _, rel, _ in candidates}
+        for position in range(len(self.paths) - 1, -1, -1):
+            if self.paths[position] not in wanted:
+                self._remove(position, edits)
+        self.skipped &= wanted
+        self._reindex()
+
+        touched = set()
+        position = 0
+        for file_path, rel, is_asset in candidates:
+            if position < len(self.paths) and self.paths[position] == rel:
+                position += 1
+                continue
+            if rel in self.index or (rel in self.skipped and rel not in modified):
+                continue
+            lines = self._read(file_path, rel, is_asset, position)
+            if lines is None:
+                self.skipped.add(rel)
+                continue
+            self.skipped.discard(rel)
+            edits.append((self._start_line(position), 0, lines))
+            self.paths.insert(position, rel)
+            self.line_counts.insert(position, len(lines))
+            self.assets.insert(position, is_asset)
+            self.leads.insert(position, position > 0)
+            touched.add(rel)
+            position += 1
+
+        self._reindex()
+        self._fix_leading_lines(edits)
+        return touched
+
+    def _fix_leading_lines(self, edits):
+        """Ajoute ou retire la ligne vide de tête des blocs arrivés en première position ou qui l'ont quittée."""
+        start = 0
+        for position, lead in enumerate(self.leads):
+            if lead != (position > 0):
+                if lead:
+                    edits.append((start, 1, []))
+                    self.line_counts[position] -= 1
+                else:
+                    edits.append((start, 0, [""]))
+                    self.line_counts[position] += 1
+                self.leads[position] = not lead
+            start += self.line_counts[position]
+
+
+class TreeLiveScan(_LiveScan):
+    """
+    Modes arbre. Une création ou suppression relance le rendu de l'arbre (listage seul, aucune lecture)
+    et seule la plage de lignes qui diffère est remplacée ; les modifications de contenu sont ignorées.
+    """
+
+    def __init__(self, mode, base_path, lines, ignored_extensions=None, ignored_folders=None, use_gitignore=False):
+        super().__init__(mode, base_path, ignored_extensions, ignored_folders, use_gitignore)
+        self.lines = lines
+
+    def apply(self, batch):
+        if not batch.structural:
+            return []
+        tree = file_processor.process_directory_architecture(
+            self.base_path, self.mode == 'folders_only', self.ignored_extensions, self.ignored_folders,
+            self.use_gitignore)
+        new_lines = [line[:-1] for _, line, _ in tree]
+
+        old_lines = self.lines
+        prefix = 0
+        limit = min(len(old_lines), len(new_lines))
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+            suffix += 1
+
+        self.lines = new_lines
+        if prefix == len(old_lines) == len(new_lines):
+            return []
+        return [(prefix, len(old_lines) - prefix - suffix, new_lines[prefix:len(new_lines) - suffix])]
+
+
+def create_live_scan(mode, base_path, shown, ignored_extensions=None, ignored_folders=None, use_gitignore=False,
+                     binary_files=file_processor.BINARY_LABEL, large_file_threshold=None, max_workers=None,
+                     dedupe=False):
+    """
+    shown : blocs affichés (modes contenu, voir ContentLiveScan) ou lignes de l'arbre (modes arbre).
+    Accepte les options de processor_options_from_settings ; max_workers n'est pas utilisé, et dedupe
+    ne s'applique pas aux blocs relus pendant le suivi (un refresh rétablit les renvois [DOUBLON]) :
+    les doublons affichés sont relus quand leur première copie change.
+    """
+    if mode in file_processor.TREE_MODES:
+        return TreeLiveScan(mode, base_path, shown, ignored_extensions, ignored_folders, use_gitignore)
+    return ContentLiveScan(mode, base_path, shown, ignored_extensions, ignored_folders, use_gitignore,
+                           binary_files, large_file_threshold)
@@ -0,0 +1,176 @@
+import threading
+
+# Nombre de lignes par bloc scellé : la ligne n se trouve dans le bloc n // LINES_PER_CHUNK
+LINES_PER_CHUNK = 1024
+
+
+def _line_offset(text, line_index):
+    """Position du début de la ligne line_index dans text (lignes séparées par '\\n')."""
+    position = 0
+    for _ in range(line_index):
+        position = text.find('\n', position) + 1
+        if position == 0:
+            return len(text)
+    return position
+
+
+def _iter_snapshot(chunks, last):
+    for chunk in chunks:
+        yield chunk + '\n'
+    if last:
+        yield last
+
+
+class OutputStore:
+    """
+    Stockage du résultat d'un scan hors du widget Tk.
+    Le texte est découpé en blocs de LINES_PER_CHUNK lignes, ce qui permet d'accéder
+    à n'importe quelle fenêtre de lignes sans parcourir tout le contenu.
+    Un seul thread écrit (append, replace_lines) ; les lectures peuvent venir d'un autre thread (export).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._chunks = []       # Blocs complets : LINES_PER_CHUNK lignes jointes par '\n'
+            self._open_lines = []   # Lignes complètes du bloc en cours
+            self._partial = ""      # Dernière ligne, sans '\n' final
+            self._size = 0
+            self._split_cache = (None, None)
+
+    def __len__(self):
+        """Nombre de caractères stockés."""
+        return self._size
+
+    @property
+    def line_count(self):
+        """Nombre de lignes affichables (la dernière ligne, même vide, compte comme dans un widget Text)."""
+        return len(self._chunks) * LINES_PER_CHUNK + len(self._open_lines) + 1
+
+    def append(self, text):
+        if not text:
+            return
+        with self._lock:
+            self._size += len(text)
+            lines = (self._partial + text).split('\n')
+            self._partial = lines.pop()
+
+            open_lines = self._open_lines
+            start = 0
+            while start < len(lines):
+                room = LINES_PER_CHUNK - len(open_lines)
+                open_lines.extend(lines[start:start + room])
+                start += room
+                if len(open_lines) == LINES_PER_CHUNK:
+                    self._chunks.append('\n'.join(open_lines))
+                    open_lines = self._open_lines = []
+
+    def replace_lines(self, start, count, new_lines):
+        """
+        Remplace les lignes complètes [start, start + count[ par new_lines (sans '\n').
+        Seuls les blocs à partir de celui de start sont redécoupés ; la ligne partielle n'est pas concernée.
+        """
+        with self._lock:
+            first_chunk = start // LINES_PER_CHUNK
+            tail = []
+            for chunk in self._chunks[first_chunk:]:
+                tail.extend(chunk.split('\n'))
+            tail.extend(self._open_lines)
+
+            offset = start - first_chunk * LINES_PER_CHUNK
+            removed = tail[offset:offset + count]
+            tail[offset:offset + count] = new_lines
+            self._size += sum(len(line) + 1 for line in new_lines) - sum(len(line) + 1 for line in removed)
+
+            del self._chunks[first_chunk:]
+            sealed = len(tail) - len(tail) % LINES_PER_CHUNK
+            for position in range(0, sealed, LINES_PER_CHUNK):
+                self._chunks.append('\n'.join(tail[position:position + LINES_PER_CHUNK]))
+            self._open_lines = tail[sealed:]
+            self._split_cache = (None, None)
+
+    def _chunk_lines(self, chunk_index):
+        """Lignes d'un bloc (le dernier bloc inclut la ligne partielle)."""
+        if chunk_index < len(self._chunks):
+            cached_index, cached_lines = self._split_cache
+            if cached_index == chunk_index:
+                return cached_lines
+            lines = self._chunks[chunk_index].split('\n')
+            self._split_cache = (chunk_index, lines)
+            return lines
+        return self._open_lines + [self._partial]
+
+    def get_lines(self, start, count):
+        """Texte des lignes [start, start + count[, jointes par '\\n'."""
+        with self._lock:
+            start = max(0, start)
+            end = min(start + count, self.line_count)
+            result = []
+            line = start
+            while line < end:
+                chunk_index, offset = divmod(line, LINES_PER_CHUNK)
+                lines = self._chunk_lines(chunk_index)
+                taken = lines[offset:offset + (end - line)]
+                result.extend(taken)
+                line += len(taken)
+                if not taken:
+                    break
+            return '\n'.join(result)
+
+    def _chunk_text(self, chunk_index):
+        if chunk_index < len(self._chunks):
+            return self._chunks[chunk_index]
+        return '\n'.join(self._open_lines + [self._partial])
+
+    def iter_text(self):
+        """
+        Parcourt le contenu bloc par bloc, tel qu'il était à l'appel : seule la liste des blocs (chaînes
+        immuables) est copiée, et un append, replace_lines ou clear ultérieur (suivi, refresh) n'y apparaît pas.
+        """
+        with self._lock:
+            chunks = list(self._chunks)
+            last = self._chunk_text(len(chunks))
+        return _iter_snapshot(chunks, last)
+
+    def get_text(self):
+        return ''.join(self.iter_text())
+
+    def find(self, query, start_line=0, start_col=0, backwards=False, ignore_case=True):
+        """
+        Recherche query à partir de (start_line, start_col), vers l'avant ou vers l'arrière.
+        Renvoie (ligne, colonne) de la première occurrence trouvée, ou None.
+        Une occurrence ne peut pas chevaucher deux blocs.
+        """
+        if not query:
+            return None
+        if ignore_case:
+            query = query.lower()
+
+        with self._lock:
+            chunk_count = len(self._chunks) + 1
+            start_line = min(max(0, start_line), self.line_count - 1)
+            first_chunk, line_in_chunk = divmod(start_line, LINES_PER_CHUNK)
+            chunk_indexes = range(first_chunk, -1, -1) if backwards else range(first_chunk, chunk_count)
+
+            for chunk_index in chunk_indexes:
+                text = self._chunk_text(chunk_index)
+                if ignore_case:
+                    text = text.lower()
+
+                if chunk_index == first_chunk:
+                    origin = _line_offset(text, line_in_chunk) + start_col
+                    if backwards:
+                        position = text.rfind(query, 0, max(0, origin))
+                    else:
+                        position = text.find(query, origin)
+                else:
+                    position = text.rfind(query) if backwards else text.find(query)
+
+                if position != -1:
+                    line = chunk_index * LINES_PER_CHUNK + text.count('\n', 0, position)
+                    column = position - (text.rfind('\n', 0, position) + 1)
+                    return line, column
+        return None
@@ -0,0 +1,47 @@
+import os
+import threading
+
+
+class ScanCache:
+    """
+    Cache d'un répertoire scanné : pour chaque fichier, le bloc déjà rendu
+    et la signature (st_mtime_ns, st_size) qui l'a produit.
+    Un refresh ne relit que les fichiers dont la signature a changé.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def signature(file_path):
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def begin_scan(self):
+        with self._lock:
+            self._seen = set()
+
+    def lookup(self, file_path, signature):
+        """Renvoie le bloc rendu si le fichier n'a pas changé, sinon None."""
+        with self._lock:
+            self._seen.add(file_path)
+            entry = self._entries.get(file_path)
+        if entry is None or entry[0] != signature:
+            return None
+        return entry[1]
+
+    def store(self, file_path, signature, block):
+        with self._lock:
+            self._entries[file_path] = (signature, block)
+
+    def end_scan(self):
+        """Oublie les fichiers supprimés (non revus pendant un scan complet)."""
+        with self._lock:
+            for file_path in self._entries.keys() - self._seen:
+                del self._entries[file_path]
+            self._seen = set()
@@ -0,0 +1,107 @@
+import os
+import queue
+import tempfile
+import threading
+from collections import deque
+
+# Texte en attente d'affichage au-delà duquel le thread de scan est mis en pause
+DEFAULT_BUDGET_CHARS = 8 * 1024 * 1024
+
+
+class ScanChannel:
+    """
+    File bornée entre le thread de scan et l'interface, mesurée en caractères de texte en attente
+    (≈ octets pour du code source) plutôt qu'en nombre de messages.
+    Budget dépassé : put() bloque le producteur jusqu'à ce que l'interface ait consommé (backpressure),
+    ou, avec spill=True, écrit le texte dans un fichier temporaire relu dans l'ordre par get_nowait().
+    Un message plus gros que le budget passe seul quand la file est vide.
+    Même interface que queue.Queue pour le consommateur : get_nowait() (queue.Empty) et empty().
+    """
+
+    def __init__(self, budget_chars=DEFAULT_BUDGET_CHARS, spill=False):
+        self.budget_chars = max(1, budget_chars)
+        self.spill = spill
+        self._condition = threading.Condition()
+        # (message, taille), ou (None, (type, job, position, octets)) pour un message débordé sur disque
+        self._items = deque()
+        self._pending_chars = 0
+        self._spill_file = None
+        self._spilled_items = 0
+        self._closed = False
+        self.peak_chars = 0
+        self.spilled_chars = 0
+
+    def put(self, message, size=0):
+        """
+        Ajoute un message (type, job, données) ; size est la longueur du texte qu'il porte.
+        Renvoie False si le canal est fermé (scan abandonné) : le message est ignoré.
+        """
+        with self._condition:
+            while self._pending_chars and self._pending_chars + size > self.budget_chars:
+                if self._closed:
+                    return False
+                if self.spill and size:
+                    return self._spill(message, size)
+                self._condition.wait()
+            if self._closed:
+                return False
+            self._items.append((message, size))
+            self._pending_chars += size
+            self.peak_chars = max(self.peak_chars, self._pending_chars)
+            return True
+
+    def _spill(self, message, size):
+        """Message débordé : ses données sont écrites sur disque, seule sa position reste en mémoire."""
+        msg_type, job, text = message
+        data = text.encode('utf-8')
+        try:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix="scan_spill_")
+            self._spill_file.seek(0, os.SEEK_END)
+            position = self._spill_file.tell()
+            self._spill_file.write(data)
+        except OSError as e:
+            # Disque indisponible : on revient à l'attente classique
+            print(f"Erreur écriture du fichier de débordement : {e}")
+            self.spill = False
+            return self.put(message, size)
+        self._items.append((None, (msg_type, job, position, len(data))))
+        self._spilled_items += 1
+        self.spilled_chars += size
+        return True
+
+    def get_nowait(self):
+        with self._condition:
+            if not self._items:
+                raise queue.Empty
+            message, size = self._items.popleft()
+            if message is None:
+                return self._read_spilled(*size)
+            self._pending_chars -= size
+            self._condition.notify_all()
+            return message
+
+    def _read_spilled(self, msg_type, job, position, length):
+        self._spilled_items -= 1
+        self._spill_file.seek(position)
+        text = self._spill_file.read(length).decode('utf-8')
+        if not self._spilled_items:
+            # Tout le débordement a été relu : le fichier est vidé
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+        return msg_type, job, text
+
+    def empty(self):
+        with self._condition:
+            return not self._items
+
+    def close(self):
+        """Abandonne les messages en attente, débloque les producteurs et supprime le fichier de débordement."""
+        with self._condition:
+            self._closed = True
+            self._items.clear()
+            self._pending_chars = 0
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+            self._condition.notify_all()
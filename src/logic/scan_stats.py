@@ -0,0 +1,219 @@
+import cProfile
+import heapq
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Nombre de fichiers les plus lents conservés dans le rapport
+SLOWEST_FILES = 10
+# Allocations les plus lourdes listées dans le rapport JSON (le détail est dans l'instantané tracemalloc)
+TOP_ALLOCATIONS = 15
+
+# Phases mesurées, dans l'ordre du pipeline
+PHASES = ("walk", "filter", "read", "decode", "wait", "queue", "render")
+PHASE_LABELS = {
+    "walk": "parcours",
+    "filter": "filtrage",
+    "read": "lecture",
+    "decode": "décodage",
+    "wait": "attente des lectures",
+    "queue": "mise en file",
+    "render": "affichage",
+}
+
+
+class ScanStats:
+    """
+    Compteurs et chronomètres d'un scan, alimentés par le parcours, les threads de lecture et l'interface.
+    Chaque mise à jour est une addition sous verrou, négligeable devant une lecture disque.
+    Les lectures étant parallèles, "read" et "decode" cumulent le temps de tous les threads :
+    la somme des phases peut dépasser la durée du scan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.finished = None
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.dirs_seen = 0
+        self.files_seen = 0
+        self.files_read = 0
+        self.files_emitted = 0
+        self.cache_hits = 0
+        self.bytes_read = 0
+        self.duplicate_files = 0
+        self.duplicate_bytes_saved = 0  # Octets de texte non produits grâce aux renvois [DOUBLON]
+        self.skipped_files = {}  # règle -> fichiers écartés
+        self.pruned_dirs = {}    # règle -> dossiers non parcourus
+        self._slowest = []       # tas (durée, fichier, octets) des fichiers les plus lents
+
+    def add_time(self, phase, seconds):
+        with self._lock:
+            self.phase_seconds[phase] += seconds
+
+    def count_listing(self, dirs, files):
+        with self._lock:
+            self.dirs_seen += dirs
+            self.files_seen += files
+
+    def skip(self, rule, files=0, dirs=0):
+        """Fichiers écartés et dossiers élagués par une règle (paramètres, .gitignore, mode de scan...)."""
+        if not files and not dirs:
+            return
+        with self._lock:
+            if files:
+                self.skipped_files[rule] = self.skipped_files.get(rule, 0) + files
+            if dirs:
+                self.pruned_dirs[rule] = self.pruned_dirs.get(rule, 0) + dirs
+
+    def record_file(self, file_path, read_seconds, decode_seconds, size):
+        with self._lock:
+            self.phase_seconds["read"] += read_seconds
+            self.phase_seconds["decode"] += decode_seconds
+            self.files_read += 1
+            self.bytes_read += size
+            entry = (read_seconds + decode_seconds, file_path, size)
+            if len(self._slowest) < SLOWEST_FILES:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def count_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def count_duplicate(self, saved_bytes):
+        with self._lock:
+            self.duplicate_files += 1
+            self.duplicate_bytes_saved += saved_bytes
+
+    def count_emitted(self):
+        with self._lock:
+            self.files_emitted += 1
+
+    def finish(self):
+        if self.finished is None:
+            self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def slowest_files(self):
+        """[(durée, fichier, octets)] du plus lent au moins lent."""
+        with self._lock:
+            return sorted(self._slowest, reverse=True)
+
+    def dominant_phase(self):
+        phase = max(PHASES, key=self.phase_seconds.get)
+        return phase if self.phase_seconds[phase] else None
+
+    def summary(self):
+        """Résumé court pour la barre de statut."""
+        parts = [f"{self.files_emitted} fichiers", f"{self.bytes_read / 1e6:.1f} Mo lus"]
+        skipped = sum(self.skipped_files.values())
+        if skipped:
+            parts.append(f"{skipped} ignorés")
+        if self.duplicate_files:
+            parts.append(f"{self.duplicate_files} doublons ({self.duplicate_bytes_saved / 1e6:.1f} Mo évités)")
+        phase = self.dominant_phase()
+        if phase:
+            parts.append(f"{PHASE_LABELS[phase]} {self.phase_seconds[phase]:.1f} s")
+        return " · ".join(parts)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "elapsed_seconds": round(self.elapsed, 6),
+                "phase_seconds": {phase: round(seconds, 6) for phase, seconds in self.phase_seconds.items()},
+                "dirs_seen": self.dirs_seen,
+                "files_seen": self.files_seen,
+                "files_read": self.files_read,
+                "files_emitted": self.files_emitted,
+                "cache_hits": self.cache_hits,
+                "bytes_read": self.bytes_read,
+                "duplicate_files": self.duplicate_files,
+                "duplicate_bytes_saved": self.duplicate_bytes_saved,
+                "skipped_files": dict(self.skipped_files),
+                "pruned_dirs": dict(self.pruned_dirs),
+                "slowest_files": [
+                    {"path": file_path, "seconds": round(seconds, 6), "bytes": size}
+                    for seconds, file_path, size in sorted(self._slowest, reverse=True)
+                ],
+            }
+
+
+class ScanProfiler:
+    """
+    Profilage optionnel d'un scan, écrit dans directory :
+    scan-<date>.prof (cProfile du thread de scan, lisible avec pstats ou snakeviz),
+    scan-<date>.tracemalloc (instantané des allocations de tout le processus, voir Snapshot.load)
+    et scan-<date>.json (compteurs de ScanStats, pic mémoire et principales allocations).
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.stem = time.strftime("scan-%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+        self._profile = cProfile.Profile()
+        self._owns_tracemalloc = False
+        self.peak_memory = None
+        self.top_allocations = []
+
+    def path(self, suffix):
+        return os.path.join(self.directory, self.stem + suffix)
+
+    def start(self):
+        """À appeler depuis le thread de scan : cProfile ne suit que le thread qui l'active."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        try:
+            self._profile.enable()
+        except ValueError as e:
+            # Un autre profileur est actif (scan précédent encore en cours d'arrêt) : profil omis
+            print(f"Erreur démarrage du profil {self.stem}: {e}")
+            self._profile = None
+
+    def stop(self):
+        """Arrête les mesures et écrit le profil et l'instantané mémoire."""
+        if self._profile is not None:
+            self._profile.disable()
+        # tracemalloc est global : un scan plus ancien a pu l'arrêter entre-temps
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if snapshot is not None:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            self.top_allocations = [
+                {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+            ]
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._profile is not None:
+                self._profile.dump_stats(self.path(".prof"))
+            if snapshot is not None:
+                snapshot.dump(self.path(".tracemalloc"))
+        except OSError as e:
+            print(f"Erreur écriture du profil {self.stem}: {e}")
+
+    def write_report(self, stats, **context):
+        """Écrit le rapport JSON ; renvoie son chemin, ou None en cas d'échec."""
+        report = dict(context)
+        report.update(stats.to_dict())
+        report["peak_memory_bytes"] = self.peak_memory
+        report["top_allocations"] = self.top_allocations
+        report["profile"] = self.path(".prof") if self._profile is not None else None
+        report["tracemalloc_snapshot"] = self.path(".tracemalloc") if self.peak_memory is not None else None
+        path = self.path(".json")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            print(f"Erreur écriture du rapport {path}: {e}")
+            return None
+        return path
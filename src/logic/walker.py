@@ -0,0 +1,128 @@
+import os
+import time
+
+from src.logic.gitignore import GitignoreFilter
+
+
+def relative_root_of(root, base_path):
+    """Chemin relatif d'un dossier par rapport à la racine du scan : '' ou 'a/b/'."""
+    relative_root = os.path.relpath(root, base_path).replace('\\', '/')
+    return "" if relative_root == "." else relative_root + "/"
+
+
+def _scan_entries(path):
+    """
+    Liste un dossier avec os.scandir en s'appuyant sur le type fourni par DirEntry
+    (aucun stat supplémentaire hors liens symboliques).
+    Renvoie (dossiers, fichiers, dossiers atteints par un lien symbolique) ou None si illisible.
+    """
+    dirs, files, linked_dirs = [], [], set()
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dirs.append(entry.name)
+                    if entry.is_symlink():
+                        linked_dirs.add(entry.name)
+                else:
+                    files.append(entry.name)
+    except OSError:
+        return None
+    return dirs, files, linked_dirs
+
+
+class DirectoryTraversal:
+    """
+    Cœur de parcours commun aux lecteurs de contenu et au rendu en arbre.
+    Chaque dossier est listé une seule fois (os.scandir), puis filtré par les règles
+    des paramètres et, en option, par les .gitignore, avant toute descente.
+    Comme os.walk, les liens symboliques vers des dossiers sont listés mais pas parcourus.
+    stats : ScanStats optionnel (temps de listage et de filtrage, entrées écartées par règle).
+    cancel : threading.Event optionnel ; une fois levé, le parcours s'arrête au dossier suivant.
+    """
+
+    def __init__(self, base_path, matcher=None, use_gitignore=False, filter_files=True, stats=None, cancel=None):
+        self.base_path = base_path
+        self.matcher = matcher
+        self.filter_files = filter_files
+        self.gitignore = GitignoreFilter(base_path) if use_gitignore else None
+        self.stats = stats
+        self.cancel = cancel
+
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    def listing(self, root, relative_root):
+        """(dossiers, fichiers, dossiers_non_parcourables) filtrés pour un dossier, ou None si illisible."""
+        if self.stats is None:
+            return self._listing(root, relative_root)
+
+        started = time.perf_counter()
+        scanned = _scan_entries(root)
+        listed = time.perf_counter()
+        self.stats.add_time("walk", listed - started)
+        if scanned is None:
+            return None
+        self.stats.count_listing(len(scanned[0]), len(scanned[1]))
+        listing = self._filter(root, relative_root, *scanned)
+        self.stats.add_time("filter", time.perf_counter() - listed)
+        return listing
+
+    def _listing(self, root, relative_root):
+        scanned = _scan_entries(root)
+        if scanned is None:
+            return None
+        return self._filter(root, relative_root, *scanned)
+
+    def _filter(self, root, relative_root, dirs, files, linked_dirs):
+        stats = self.stats
+        if self.gitignore is not None:
+            chain = self.gitignore.enter(root, relative_root, files)
+
+        if self.matcher is not None:
+            dir_count, file_count = len(dirs), len(files)
+            dirs = self.matcher.filter_dirs(dirs, relative_root)
+            if self.filter_files:
+                files = self.matcher.filter_files(files, relative_root)
+            if stats is not None:
+                stats.skip("ignore_rules", file_count - len(files), dir_count - len(dirs))
+
+        if self.gitignore is not None:
+            dir_count, file_count = len(dirs), len(files)
+            dirs = self.gitignore.filter_dirs(chain, dirs, relative_root)
+            files = self.gitignore.filter_files(chain, files, relative_root)
+            if stats is not None:
+                stats.skip("gitignore", file_count - len(files), dir_count - len(dirs))
+
+        return dirs, files, linked_dirs
+
+    def walk(self):
+        """
+        Parcours descendant dans l'ordre d'os.walk. Yield (root, relative_root, dirs, files) ;
+        dirs peut être filtré ou trié sur place par l'appelant avant la descente.
+        """
+        stack = [(self.base_path, "")]
+        while stack and not self.cancelled():
+            root, relative_root = stack.pop()
+            listing = self.listing(root, relative_root)
+            if listing is None:
+                continue
+            dirs, files, linked_dirs = listing
+
+            yield root, relative_root, dirs, files
+
+            for name in reversed(dirs):
+                if name not in linked_dirs:
+                    stack.append((os.path.join(root, name), relative_root + name + "/"))
+
+
+def walk_directory(base_path, matcher=None, use_gitignore=False, filter_files=True, stats=None, cancel=None):
+    """
+    Parcours des modes contenu, voir DirectoryTraversal.
+    filter_files : appliquer aussi les règles de fichiers du matcher (sinon, à la charge de l'appelant).
+    """
+    return DirectoryTraversal(base_path, matcher, use_gitignore, filter_files, stats, cancel).walk()
@@ -0,0 +1,273 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from src.logic.walker import DirectoryTraversal, relative_root_of
+
+# Regroupement des rafales (sauvegarde d'éditeur, git checkout...) : un lot part après DEBOUNCE_SECONDS
+# sans nouvel événement, et au plus tard MAX_BATCH_DELAY secondes après le premier
+DEBOUNCE_SECONDS = 0.3
+MAX_BATCH_DELAY = 2.0
+# Attente maximale d'un événement avant de revérifier la demande d'arrêt
+WAIT_SLICE_SECONDS = 0.25
+
+# Scrutation : intervalle minimal, et multiple du coût d'un relevé (≈ 10 % d'un cœur au plus)
+POLL_INTERVAL_SECONDS = 1.0
+POLL_COST_FACTOR = 10
+
+# Constantes de <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_EXCL_UNLINK = 0x04000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+               | _IN_ONLYDIR | _IN_EXCL_UNLINK)
+# struct inotify_event : wd, mask, cookie, len, puis le nom (len octets complétés par des \0)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+# Lot d'événements : chemins à relire, présence de créations/suppressions, événements perdus par le noyau.
+# Les chemins créés sont aussi à relire : une sauvegarde atomique (fichier temporaire renommé par-dessus
+# l'original : write_lines_atomically, sed -i, éditeurs) n'arrive que comme création (IN_MOVED_TO).
+ChangeBatch = namedtuple("ChangeBatch", "modified structural overflow")
+
+
+def _load_libc():
+    """libc avec inotify, ou None hors Linux."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class _TreeWatcher:
+    """Base commune : parcours des dossiers surveillés avec les mêmes règles d'exclusion que le scan."""
+
+    kind = None
+
+    def __init__(self, base_path, matcher=None, use_gitignore=False):
+        self.base_path = base_path
+        self.matcher = matcher
+        self.use_gitignore = use_gitignore
+
+    def _walk_dirs(self, root):
+        """(dossier, fichiers) de root et de ses sous-dossiers non ignorés, dans l'ordre du parcours."""
+        # Les fichiers ne sont pas filtrés : un mode peut afficher un fichier ignoré (assets Flutter)
+        traversal = DirectoryTraversal(self.base_path, self.matcher, self.use_gitignore, filter_files=False)
+        stack = [(root, relative_root_of(root, self.base_path))]
+        while stack:
+            root, relative_root = stack.pop()
+            listing = traversal.listing(root, relative_root)
+            if listing is None:
+                continue
+            dirs, files, linked_dirs = listing
+            yield root, dirs, files
+            for name in reversed(dirs):
+                if name not in linked_dirs:
+                    stack.append((os.path.join(root, name), relative_root + name + "/"))
+
+    def read_events(self, timeout):
+        """Événements (type, chemin) reçus en au plus timeout secondes ; type vaut
+        "modified", "created", "deleted" ou "overflow"."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(_TreeWatcher):
+    """
+    Surveillance par inotify (Linux), appelé via ctypes : une surveillance par dossier non ignoré,
+    ajoutée au fil de l'eau pour les dossiers créés. Lève OSError si inotify est indisponible
+    ou si la limite fs.inotify.max_user_watches est atteinte.
+    """
+
+    kind = "inotify"
+
+    def __init__(self, base_path, matcher=None, use_gitignore=False):
+        super().__init__(base_path, matcher, use_gitignore)
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify indisponible")
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 : {os.strerror(error)}")
+        self._dirs = {}  # descripteur de surveillance -> dossier
+        try:
+            self._watch_tree(base_path)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, root):
+        for path, _, _ in self._walk_dirs(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = path
+                continue
+            error = ctypes.get_errno()
+            # Dossier disparu ou illisible entre-temps : rien à surveiller
+            if error not in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                raise OSError(error, f"inotify_add_watch {path} : {os.strerror(error)}")
+
+    def read_events(self, timeout):
+        if self._fd is None:
+            return []
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                events.append(("overflow", self.base_path))
+                continue
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                if mask & _IN_ISDIR:
+                    self._watch_new_dir(path)
+                events.append(("created", path))
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                events.append(("deleted", path))
+            elif mask & (_IN_MODIFY | _IN_CLOSE_WRITE):
+                events.append(("modified", path))
+        return events
+
+    def _watch_new_dir(self, path):
+        # Les fichiers créés avant la pose de la surveillance sont rattrapés par le lot structurel
+        try:
+            self._watch_tree(path)
+        except OSError as e:
+            print(f"Erreur surveillance du dossier {path}: {e}")
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class PollingWatcher(_TreeWatcher):
+    """
+    Repli sans inotify (autres systèmes, limite de surveillances atteinte) : relevé périodique
+    de (st_mtime_ns, st_size) des fichiers. L'intervalle s'allonge avec le coût d'un relevé.
+    """
+
+    kind = "scrutation"
+
+    def __init__(self, base_path, matcher=None, use_gitignore=False):
+        super().__init__(base_path, matcher, use_gitignore)
+        self._interval = POLL_INTERVAL_SECONDS
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + self._interval
+
+    def _take_snapshot(self):
+        started = time.perf_counter()
+        snapshot = {}
+        for root, dirs, files in self._walk_dirs(self.base_path):
+            for name in dirs:
+                snapshot[os.path.join(root, name)] = None  # dossier : seule sa présence compte
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        self._interval = max(POLL_INTERVAL_SECONDS, (time.perf_counter() - started) * POLL_COST_FACTOR)
+        return snapshot
+
+    def read_events(self, timeout):
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+
+        previous = self._snapshot
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + self._interval
+
+        events = []
+        for path, signature in self._snapshot.items():
+            if path not in previous:
+                events.append(("created", path))
+            elif previous[path] != signature:
+                events.append(("modified", path))
+        events.extend(("deleted", path) for path in previous.keys() - self._snapshot.keys())
+        return events
+
+
+def create_watcher(base_path, matcher=None, use_gitignore=False):
+    """InotifyWatcher si possible, sinon PollingWatcher."""
+    try:
+        return InotifyWatcher(base_path, matcher, use_gitignore)
+    except OSError as e:
+        if e.errno != errno.ENOSYS:
+            print(f"Erreur inotify, repli sur la scrutation : {e}")
+        return PollingWatcher(base_path, matcher, use_gitignore)
+
+
+def watch_changes(watcher, stop, quiet_seconds=DEBOUNCE_SECONDS, max_delay=MAX_BATCH_DELAY):
+    """Produit un ChangeBatch par rafale d'événements, jusqu'à ce que stop (threading.Event) soit levé."""
+    while not stop.is_set():
+        events = watcher.read_events(WAIT_SLICE_SECONDS)
+        if not events:
+            continue
+
+        first = last = time.monotonic()
+        while not stop.is_set():
+            now = time.monotonic()
+            remaining = min(last + quiet_seconds, first + max_delay) - now
+            if remaining <= 0:
+                break
+            more = watcher.read_events(min(remaining, WAIT_SLICE_SECONDS))
+            if more:
+                events.extend(more)
+                last = time.monotonic()
+        if stop.is_set():
+            return
+
+        kinds = {kind for kind, _ in events}
+        yield ChangeBatch(
+            modified={path for kind, path in events if kind in ("modified", "created")},
+            structural=bool(kinds & {"created", "deleted"}),
+            overflow="overflow" in kinds,
+        )
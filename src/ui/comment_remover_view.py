@@ -13,6 +13,10 @@ class CommentRemoverView(ttk.Frame):
         self.file_path_label = ttk.Label(self, text="Aucun projet sélectionné", style="Secondary.TLabel")
         self.file_path_label.pack(pady=(0, 5))
 
+        self.progress_label = ttk.Label(self, text="", style="Secondary.TLabel")
+        self.progress_label.pack(pady=(0, 5))
+        self.waiting = False
+
         context_label = ttk.Label(self, text="Contexte du commentaire :", font=("Segoe UI Variable", 14))
         context_label.pack()
 
@@ -27,19 +31,51 @@ class CommentRemoverView(ttk.Frame):
         self.keep_button.pack(side=tk.LEFT, padx=10)
 
         self.discard_button = ttk.Button(button_frame, text="❌ Jeter", command=self.controller.discard_comment, style="Danger.TButton")
-        self.discard_button.pack(side=tk.RIGHT, padx=10)
+        self.discard_button.pack(side=tk.LEFT, padx=10)
+
+        self.discard_group_button = ttk.Button(button_frame, text="❌ Jeter toutes les occurrences",
+                                               command=self.controller.discard_comment_group, style="Danger.TButton")
+        self.discard_group_button.pack(side=tk.LEFT, padx=10)
+
+        self.occurrences_label = ttk.Label(self, text="", style="Secondary.TLabel")
+        self.occurrences_label.pack()
 
         self.disable_buttons()
 
     def disable_buttons(self):
         self.keep_button.config(state=tk.DISABLED)
         self.discard_button.config(state=tk.DISABLED)
+        self.discard_group_button.config(state=tk.DISABLED)
+        self.occurrences_label.config(text="")
 
-    def enable_buttons(self):
+    def enable_buttons(self, occurrences=1):
         self.keep_button.config(state=tk.NORMAL)
         self.discard_button.config(state=tk.NORMAL)
+        self.discard_group_button.config(state=tk.NORMAL if occurrences > 1 else tk.DISABLED)
+
+    def update_progress(self, text):
+        self.progress_label.config(text=text)
+
+    def _show_message(self, message):
+        self.context_text.config(state=tk.NORMAL)
+        self.context_text.delete(1.0, tk.END)
+        self.context_text.insert(tk.END, message)
+        self.context_text.config(state=tk.DISABLED)
+        self.disable_buttons()
+
+    def show_indexing(self, project_path):
+        self.file_path_label.config(text=f"Projet : {project_path}")
+        self.progress_label.config(text="Indexation des commentaires...")
+        self.waiting = False
+        self._show_message("Analyse des fichiers en cours...")
+
+    def show_waiting(self, message):
+        if not self.waiting:
+            self.waiting = True
+            self._show_message(message)
 
-    def update_display(self, file_path, comment_info, lines):
+    def update_display(self, file_path, comment_info, lines, occurrences=1, occurrence_files=1):
+        self.waiting = False
         self.file_path_label.config(text=f"Fichier : {file_path}")
         start = comment_info["start_line"]
         end = comment_info["end_line"]
@@ -55,12 +91,17 @@ class CommentRemoverView(ttk.Frame):
             else:
                 self.context_text.insert(tk.END, f"{i + 1:4d}   {lines[i]}")
         self.context_text.config(state=tk.DISABLED)
-        self.enable_buttons()
+        self.enable_buttons(occurrences)
+        if occurrences > 1:
+            # Garder s'applique toujours à toutes les occurrences (même texte)
+            self.occurrences_label.config(
+                text=f"Commentaire identique présent {occurrences} fois dans {occurrence_files} fichiers")
+            self.discard_group_button.config(text=f"❌ Jeter les {occurrences} occurrences")
+        else:
+            self.occurrences_label.config(text="")
+            self.discard_group_button.config(text="❌ Jeter toutes les occurrences")
 
     def show_final_message(self, message):
         self.file_path_label.config(text="Terminé !")
-        self.context_text.config(state=tk.NORMAL)
-        self.context_text.delete(1.0, tk.END)
-        self.context_text.insert(tk.END, message)
-        self.context_text.config(state=tk.DISABLED)
-        self.disable_buttons()
\ No newline at end of file
+        self.waiting = False
+        self._show_message(message)
\ No newline at end of file
@@ -12,18 +12,67 @@ class SettingsView(ttk.Frame):
         title_label = ttk.Label(self, text="Paramètres", font=("Segoe UI Variable", 16, "bold"))
         title_label.pack(pady=10)
 
-        ext_label = ttk.Label(self, text="Extensions de fichiers à ignorer (ex: .exe)", 
+        ext_label = ttk.Label(self, text="Extensions ou motifs de fichiers à ignorer (ex: .exe, src/**/generated/*.dart, !garder.json)", 
                               style="Secondary.TLabel")
         ext_label.pack(pady=(5, 0))
         self.extensions_text = scrolledtext.ScrolledText(self, width=60, height=8, font=("Consolas", 9))
         self.extensions_text.pack(pady=5, padx=10)
 
-        folder_label = ttk.Label(self, text="Noms de dossiers à ignorer (ex: node_modules)", 
+        folder_label = ttk.Label(self, text="Noms ou motifs de dossiers à ignorer (ex: node_modules, ios/Pods, *.egg-info)", 
                                  style="Secondary.TLabel")
         folder_label.pack(pady=(10, 0))
         self.folders_text = scrolledtext.ScrolledText(self, width=60, height=8, font=("Consolas", 9))
         self.folders_text.pack(pady=5, padx=10)
 
+        options_frame = ttk.Frame(self)
+        options_frame.pack(pady=(10, 0))
+        workers_label = ttk.Label(options_frame, text="Threads de lecture", style="Secondary.TLabel")
+        workers_label.pack(side=tk.LEFT)
+        self.workers_var = tk.IntVar()
+        self.workers_spinbox = ttk.Spinbox(options_frame, from_=1, to=64, width=5, textvariable=self.workers_var)
+        self.workers_spinbox.pack(side=tk.LEFT, padx=10)
+
+        threshold_label = ttk.Label(options_frame, text="Extrait au-delà de (Mo)", style="Secondary.TLabel")
+        threshold_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.threshold_var = tk.DoubleVar()
+        self.threshold_spinbox = ttk.Spinbox(options_frame, from_=0, to=1024, increment=1, width=5,
+                                             textvariable=self.threshold_var)
+        self.threshold_spinbox.pack(side=tk.LEFT, padx=10)
+
+        self.skip_binary_var = tk.BooleanVar()
+        skip_binary_check = ttk.Checkbutton(options_frame, text="Omettre les fichiers binaires",
+                                            variable=self.skip_binary_var)
+        skip_binary_check.pack(side=tk.LEFT, padx=10)
+
+        self.gitignore_var = tk.BooleanVar()
+        gitignore_check = ttk.Checkbutton(options_frame, text="Respecter les .gitignore",
+                                          variable=self.gitignore_var)
+        gitignore_check.pack(side=tk.LEFT, padx=10)
+
+        self.kept_per_project_var = tk.BooleanVar()
+        kept_per_project_check = ttk.Checkbutton(self, text="Commentaires gardés propres à chaque projet",
+                                                 variable=self.kept_per_project_var)
+        kept_per_project_check.pack(pady=(10, 0))
+        forget_kept_btn = ttk.Button(self, text="Oublier les commentaires gardés",
+                                     command=self.controller.forget_kept_comments)
+        forget_kept_btn.pack(pady=(5, 0))
+
+        self.profile_scans_var = tk.BooleanVar()
+        profile_scans_check = ttk.Checkbutton(self, text="Rapport de performance à chaque scan (profil et mémoire)",
+                                              variable=self.profile_scans_var)
+        profile_scans_check.pack(pady=(5, 0))
+
+        self.spill_var = tk.BooleanVar()
+        spill_check = ttk.Checkbutton(self, text="Texte en attente d'affichage sur disque au-delà de "
+                                                 "la file mémoire (la lecture n'est plus ralentie)",
+                                      variable=self.spill_var)
+        spill_check.pack(pady=(5, 0))
+
+        self.dedupe_var = tk.BooleanVar()
+        dedupe_check = ttk.Checkbutton(self, text="Fichiers identiques : afficher un renvoi vers la première copie",
+                                       variable=self.dedupe_var)
+        dedupe_check.pack(pady=(5, 0))
+
         btn_frame = ttk.Frame(self)
         btn_frame.pack(pady=20)
 
@@ -40,6 +89,14 @@ class SettingsView(ttk.Frame):
         folders = self.controller.ignored_folders
         self.folders_text.delete('1.0', tk.END)
         self.folders_text.insert('1.0', "\n".join(folders))
+        self.workers_var.set(self.controller.scan_options["read_workers"])
+        self.threshold_var.set(self.controller.scan_options["large_file_threshold_mb"])
+        self.skip_binary_var.set(self.controller.scan_options["binary_files"] == "skip")
+        self.gitignore_var.set(self.controller.scan_options["use_gitignore"])
+        self.kept_per_project_var.set(self.controller.scan_options["kept_comments_per_project"])
+        self.profile_scans_var.set(self.controller.scan_options["profile_scans"])
+        self.spill_var.set(self.controller.scan_options["spill_to_disk"])
+        self.dedupe_var.set(self.controller.scan_options["dedupe_content"])
 
     def save_settings(self):
         raw_ext = self.extensions_text.get('1.0', tk.END).strip()
@@ -47,4 +104,24 @@ class SettingsView(ttk.Frame):
         raw_folders = self.folders_text.get('1.0', tk.END).strip()
         new_folders = [line.strip() for line in raw_folders.split('\n') if line.strip()]
 
-        self.controller.update_settings(new_extensions, new_folders)
\ No newline at end of file
+        try:
+            read_workers = max(1, int(self.workers_spinbox.get()))
+        except ValueError:
+            read_workers = self.controller.scan_options["read_workers"]
+        try:
+            large_file_threshold_mb = max(0.0, float(self.threshold_spinbox.get()))
+        except ValueError:
+            large_file_threshold_mb = self.controller.scan_options["large_file_threshold_mb"]
+        new_scan_options = dict(
+            self.controller.scan_options,
+            read_workers=read_workers,
+            large_file_threshold_mb=large_file_threshold_mb,
+            binary_files="skip" if self.skip_binary_var.get() else "label",
+            use_gitignore=self.gitignore_var.get(),
+            kept_comments_per_project=self.kept_per_project_var.get(),
+            profile_scans=self.profile_scans_var.get(),
+            spill_to_disk=self.spill_var.get(),
+            dedupe_content=self.dedupe_var.get(),
+        )
+
+        self.controller.update_settings(new_extensions, new_folders, new_scan_options)
\ No newline at end of file
@@ -1,32 +1,200 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, font as tkfont
+
+from src.logic.output_store import OutputStore
+
+# Lignes rendues en plus de celles visibles (lignes repliées, redimensionnement)
+RENDER_MARGIN_LINES = 20
+WHEEL_SCROLL_LINES = 3
 
 
 class TextView(ttk.Frame):
+    """
+    Vue virtualisée : le contenu vit dans un OutputStore et seule la fenêtre
+    de lignes visible est rendue dans le widget Text.
+    La barre de défilement, la copie et la recherche travaillent sur le store.
+    """
+
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
-        self.text_area = scrolledtext.ScrolledText(
-            self, wrap=tk.WORD, font=("Segoe UI Variable", 10),
-            relief=tk.FLAT, borderwidth=0, undo=True
+        self.store = OutputStore()
+        self.top_line = 0
+        self.rendered_lines = 0
+        self.search_match = None  # (ligne, colonne) de l'occurrence surlignée
+
+        self.text_font = tkfont.Font(family="Segoe UI Variable", size=10)
+        text_frame = ttk.Frame(self)
+        text_frame.pack(expand=True, fill=tk.BOTH)
+
+        self.scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text_area = tk.Text(
+            text_frame, wrap=tk.WORD, font=self.text_font,
+            relief=tk.FLAT, borderwidth=0, undo=False
         )
         self.text_area.pack(expand=True, fill=tk.BOTH)
+        self.text_area.tag_config("search", background="#FDDC5C", foreground="black")
         self.text_area.config(state=tk.DISABLED)
 
+        self._create_search_bar()
+
+        self.text_area.bind("<Configure>", lambda e: self._render())
+        self.text_area.bind("<MouseWheel>", self._on_mousewheel)
+        self.text_area.bind("<Button-4>", lambda e: self.scroll_lines(-WHEEL_SCROLL_LINES))
+        self.text_area.bind("<Button-5>", lambda e: self.scroll_lines(WHEEL_SCROLL_LINES))
+        self.text_area.bind("<Button-1>", lambda e: self.text_area.focus_set())
+        self.text_area.bind("<Up>", lambda e: self._scroll_and_break(-1))
+        self.text_area.bind("<Down>", lambda e: self._scroll_and_break(1))
+        self.text_area.bind("<Prior>", lambda e: self._scroll_and_break(-self._visible_lines()))
+        self.text_area.bind("<Next>", lambda e: self._scroll_and_break(self._visible_lines()))
+        self.text_area.bind("<Control-Home>", lambda e: self._scroll_and_break(-self.store.line_count))
+        self.text_area.bind("<Control-End>", lambda e: self._scroll_and_break(self.store.line_count))
+        self.text_area.bind("<Control-f>", lambda e: self.show_search_bar())
+
+    def _create_search_bar(self):
+        self.search_frame = ttk.Frame(self, padding=(0, 5, 0, 0))
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(self.search_frame, textvariable=self.search_var, width=40)
+        self.search_entry.pack(side=tk.LEFT)
+        self.search_entry.bind("<Return>", lambda e: self.search(backwards=False))
+        self.search_entry.bind("<Shift-Return>", lambda e: self.search(backwards=True))
+        self.search_entry.bind("<Escape>", lambda e: self.hide_search_bar())
+        ttk.Button(self.search_frame, text="▲", width=3,
+                   command=lambda: self.search(backwards=True)).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(self.search_frame, text="▼", width=3,
+                   command=lambda: self.search(backwards=False)).pack(side=tk.LEFT, padx=5)
+        self.search_status = ttk.Label(self.search_frame, text="", style="Secondary.TLabel")
+        self.search_status.pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.search_frame, text="✕", width=3, command=self.hide_search_bar).pack(side=tk.RIGHT)
+
+    # --- Contenu ---
+
     def set_text(self, text):
-        self.text_area.config(state=tk.NORMAL)
-        self.text_area.delete('1.0', tk.END)
-        self.text_area.insert('1.0', text)
-        self.text_area.config(state=tk.DISABLED)
+        self.store.clear()
+        self.store.append(text)
+        self.top_line = 0
+        self.search_match = None
+        self._render()
 
     def append_text(self, text):
-        self.text_area.config(state=tk.NORMAL)
-        self.text_area.insert(tk.END, text)
-        self.text_area.config(state=tk.DISABLED)
+        previous_count = self.store.line_count
+        self.store.append(text)
+        # On ne re-rend que si les nouvelles lignes tombent dans la fenêtre affichée
+        if previous_count <= self.top_line + self._visible_lines():
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def apply_edits(self, edits):
+        """Applique des remplacements (première ligne, lignes remplacées, nouvelles lignes) puis re-rend une fois."""
+        for start, count, new_lines in edits:
+            self.store.replace_lines(start, count, new_lines)
+        # Les positions ont pu se décaler : l'occurrence surlignée n'est plus fiable
+        self.search_match = None
+        self._render()
 
     def clear(self):
+        self.store.clear()
+        self.top_line = 0
+        self.search_match = None
+        self._render()
+
+    def get_content(self):
+        return self.store.get_text().strip()
+
+    # --- Rendu de la fenêtre visible ---
+
+    def _visible_lines(self):
+        height = self.text_area.winfo_height()
+        return max(1, height // max(1, self.text_font.metrics("linespace")))
+
+    def _render(self):
+        line_count = self.store.line_count
+        visible = self._visible_lines()
+        self.top_line = max(0, min(self.top_line, line_count - visible))
+        self.rendered_lines = visible + RENDER_MARGIN_LINES
+        window = self.store.get_lines(self.top_line, self.rendered_lines)
+
         self.text_area.config(state=tk.NORMAL)
         self.text_area.delete('1.0', tk.END)
+        self.text_area.insert('1.0', window)
+        if self.search_match is not None:
+            line, column = self.search_match
+            if self.top_line <= line < self.top_line + self.rendered_lines:
+                start = f"{line - self.top_line + 1}.{column}"
+                self.text_area.tag_add("search", start, f"{start}+{len(self.search_var.get())}c")
         self.text_area.config(state=tk.DISABLED)
+        self._update_scrollbar()
 
-    def get_content(self):
-        return self.text_area.get('1.0', tk.END).strip()
\ No newline at end of file
+    def _update_scrollbar(self):
+        line_count = max(1, self.store.line_count)
+        first = self.top_line / line_count
+        last = min(1.0, (self.top_line + self._visible_lines()) / line_count)
+        self.scrollbar.set(first, last)
+
+    # --- Défilement ---
+
+    def scroll_lines(self, delta):
+        self.scroll_to(self.top_line + delta)
+
+    def scroll_to(self, line):
+        previous = self.top_line
+        self.top_line = max(0, min(line, self.store.line_count - self._visible_lines()))
+        if self.top_line != previous:
+            self._render()
+
+    def _scroll_and_break(self, delta):
+        self.scroll_lines(delta)
+        return "break"
+
+    def _on_mousewheel(self, event):
+        self.scroll_lines(-WHEEL_SCROLL_LINES if event.delta > 0 else WHEEL_SCROLL_LINES)
+        return "break"
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * self.store.line_count))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self._visible_lines() if unit == "pages" else 1
+            self.scroll_lines(amount * step)
+
+    # --- Recherche ---
+
+    def show_search_bar(self):
+        self.search_frame.pack(fill=tk.X)
+        self.search_entry.focus_set()
+        self.search_entry.select_range(0, tk.END)
+        return "break"
+
+    def hide_search_bar(self):
+        self.search_frame.pack_forget()
+        self.search_match = None
+        self.search_status.config(text="")
+        self._render()
+
+    def search(self, backwards=False):
+        query = self.search_var.get()
+        if not query:
+            return
+        if self.search_match is not None:
+            line, column = self.search_match
+            start = (line, column) if backwards else (line, column + 1)
+        else:
+            start = (self.top_line, 0)
+
+        match = self.store.find(query, start[0], start[1], backwards=backwards)
+        if match is None:
+            # Reprise depuis l'autre extrémité
+            wrap_start = (self.store.line_count - 1, len(self.store)) if backwards else (0, 0)
+            match = self.store.find(query, wrap_start[0], wrap_start[1], backwards=backwards)
+
+        self.search_match = match
+        if match is None:
+            self.search_status.config(text="Aucun résultat")
+            self._render()
+            return
+        self.search_status.config(text=f"Ligne {match[0] + 1}")
+        # L'occurrence est placée au tiers de la fenêtre visible
+        self.top_line = max(0, match[0] - self._visible_lines() // 3)
+        self._render()
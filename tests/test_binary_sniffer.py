@@ -0,0 +1,58 @@
+from src.logic.binary_sniffer import SETTLE_COUNT, BinarySniffer, looks_binary
+
+
+def test_ascii_magic_alone_is_text():
+    assert not looks_binary(b"BZh, notes sur la compression\n")
+    assert not looks_binary(b"RIFF et WAVE : format des fichiers audio\n")
+    assert not looks_binary(b"ID3 tags\n")
+
+
+def test_ascii_magic_with_control_bytes_is_binary():
+    assert looks_binary(b"RIFF\x24\x08\x01\x00WAVEfmt ")
+    assert looks_binary(b"GIF89a\x01\x02" + b"x" * 100)
+    assert looks_binary(b"\x89PNG\r\n\x1a\n")
+
+
+def test_text_extension_is_never_settled_as_binary():
+    sniffer = BinarySniffer()
+    for i in range(SETTLE_COUNT + 1):
+        assert sniffer.is_binary(f"archive{i}.txt", b"\x1f\x8b\x08\x00")
+    assert not sniffer.known_binary("notes.txt")
+    assert not sniffer.is_binary("notes.txt", b"texte ordinaire\n")
+
+
+def test_verdicts():
+    assert not looks_binary(b"")
+    assert not looks_binary("texte accentué, éàü\n".encode("utf-8"))
+    assert looks_binary(b"texte\x00avec NUL")
+    assert looks_binary(b"\x7fELF\x02\x01\x01")
+    assert looks_binary(bytes(range(1, 32)) * 4)
+    assert not looks_binary("é".encode("utf-8")[:1].rjust(100, b"a"))  # multi-octets coupé par la fenêtre
+
+
+def test_binary_extension_settles_and_is_no_longer_read():
+    sniffer = BinarySniffer()
+    for i in range(SETTLE_COUNT):
+        assert not sniffer.known_binary(f"f{i}.bin")
+        assert sniffer.is_binary(f"f{i}.bin", b"\x00\x01\x02")
+    assert sniffer.known_binary("autre.BIN")
+    assert not sniffer.known_binary("sans_extension")
+
+
+def test_text_extension_settles_to_a_nul_check():
+    sniffer = BinarySniffer()
+    for i in range(SETTLE_COUNT):
+        assert not sniffer.is_binary(f"f{i}.log", b"texte\n")
+    # Figée comme texte : seule la présence d'octets NUL est encore vérifiée
+    assert not sniffer.is_binary("g.log", bytes(range(1, 32)))
+    assert sniffer.is_binary("h.log", b"texte\x00")
+
+
+def test_mixed_extension_is_never_settled():
+    sniffer = BinarySniffer()
+    sniffer.is_binary("a.dat", b"\x00\x00")
+    sniffer.is_binary("b.dat", b"texte\n")
+    for i in range(SETTLE_COUNT):
+        sniffer.is_binary(f"c{i}.dat", b"\x00\x00")
+    assert not sniffer.known_binary("d.dat")
+    assert not sniffer.is_binary("e.dat", b"texte\n")
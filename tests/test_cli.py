@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_closed_stdout_exits_quietly(tmp_path):
+    for i in range(200):
+        (tmp_path / f"f{i}.txt").write_text("ligne\n" * 500, encoding="utf-8")
+    process = subprocess.Popen([sys.executable, str(ROOT / "cli.py"), "scan", str(tmp_path), "--no-config"],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=ROOT)
+    process.stdout.readline()
+    process.stdout.close()  # Comme `| head -1`
+    stderr = process.stderr.read().decode("utf-8", errors="replace")
+    process.stderr.close()
+
+    assert process.wait(30) == 1
+    assert "Traceback" not in stderr
+    assert "Exception ignored" not in stderr
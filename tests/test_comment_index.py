@@ -0,0 +1,60 @@
+from src.logic.comment_index import CommentIndex
+from src.logic.comment_processor import ReviewSession, find_comments_in_file
+
+
+def _index(*file_paths):
+    index = CommentIndex()
+    for file_path in file_paths:
+        index.add_file(file_path, list(find_comments_in_file(file_path, set())))
+    return index
+
+
+def test_different_blocks_on_one_line_are_separate_groups(tmp_path):
+    file_path = tmp_path / "a.c"
+    file_path.write_text("int a = 1; /* one */ int b = 2; /* two */\n", encoding="utf-8")
+    index = _index(str(file_path))
+
+    assert len(index) == 2
+    one, two = index.group_at(0), index.group_at(1)
+    assert len(one) == len(two) == 1
+
+    # Jeter le groupe de "one" ne touche pas "two"
+    removed, errors = ReviewSession().discard_in_files(index.removals_for(one))
+    assert (removed, errors) == (1, [])
+    assert file_path.read_text(encoding="utf-8") == "int a = 1;  int b = 2; /* two */\n"
+
+    # "two" est retrouvé malgré la ligne modifiée
+    session = ReviewSession()
+    assert session.discard(two[0], [])
+    assert session.close() == []
+    assert file_path.read_text(encoding="utf-8") == "int a = 1;  int b = 2;\n"
+
+
+def test_same_block_on_different_lines_is_one_group(tmp_path):
+    first = tmp_path / "a.c"
+    second = tmp_path / "b.c"
+    first.write_text("int a; /* TODO */\n", encoding="utf-8")
+    second.write_text("/* TODO */ int b;\nint c; /* TODO */\n", encoding="utf-8")
+    index = _index(str(first), str(second))
+
+    assert len(index) == 1
+    assert len(index.group_at(0)) == 3
+    # Le hash des commentaires gardés reste celui des lignes complètes
+    assert len({comment["hash"] for comment in index.group_at(0)}) == 3
+
+
+def test_group_discard_reports_a_failing_file_and_continues(tmp_path):
+    good = tmp_path / "good.c"
+    good.write_text("int a; /* TODO */\n", encoding="utf-8")
+    index = _index(str(good))
+    bad = str(tmp_path / "bad.c")
+    (tmp_path / "bad.c").write_bytes(b"int \xff; /* TODO */\n")
+    comment = dict(index.group_at(0)[0], file_path=bad)
+    removals = index.removals_for(index.group_at(0))
+    removals[bad] = [(comment, [])]
+
+    removed, errors = ReviewSession().discard_in_files(removals)
+
+    assert removed == 1
+    assert len(errors) == 1 and errors[0].startswith(bad)
+    assert good.read_text(encoding="utf-8") == "int a;\n"
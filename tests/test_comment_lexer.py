@@ -0,0 +1,66 @@
+import pytest
+
+from src.logic.comment_lexer import language_for_path, scan_comments
+from src.logic.comment_processor import scan_python_comments
+
+
+def _comments(extension, source):
+    return [source[start:end] for _, start, end in scan_comments(source, language_for_path("f" + extension))]
+
+
+@pytest.mark.parametrize("extension, source, expected", [
+    # Dart : interpolation, chaînes brutes, chaînes triples, blocs imbriqués
+    (".dart", 'var s = "// pas ici ${a /* expr */ + "}"}"; // fin\n', ["/* expr */", "// fin"]),
+    (".dart", "var r = r'\\'; // après brute\n", ["// après brute"]),
+    (".dart", "var t = '''\n// dans la chaîne\n'''; /* a /* b */ c */ x;\n", ["/* a /* b */ c */"]),
+    # JavaScript / TypeScript : regex littérales, gabarits avec interpolation
+    (".js", "const re = /\\/\\/ pas un commentaire/g; // vrai\n", ["// vrai"]),
+    (".js", "const q = a / b; // division\n", ["// division"]),
+    (".js", "const r = [/[/]/, 1]; /* bloc */\n", ["/* bloc */"]),
+    (".ts", "const t = `// ${x /* dans l'expression */} /* texte */`; // fin\n",
+     ["/* dans l'expression */", "// fin"]),
+    # C# : verbatim (guillemets doublés), interpolées (accolades doublées), chaînes brutes
+    (".cs", 'var p = @"C:\\dossier\\""// pas ici"; // vrai\n', ["// vrai"]),
+    (".cs", 'var i = $"{{// littéral}} {x /* expr */}"; // fin\n', ["/* expr */", "// fin"]),
+    (".cs", 'var raw = """\n// pas ici\n"""; // fin\n', ["// fin"]),
+    # Java : blocs de texte ; Kotlin : gabarits et blocs imbriqués
+    (".java", 'String s = """\n/* pas ici */\n"""; // fin\n', ["// fin"]),
+    (".kt", 'val s = "${"// pas ici"}" /* a /* b */ c */\n', ["/* a /* b */ c */"]),
+    # Go : chaînes brutes multilignes
+    (".go", "s := `\n// pas ici\n` // fin\n", ["// fin"]),
+    # C / C++ : caractères, échappements, chaînes brutes avec délimiteur
+    (".c", "char c = '\"'; char *s = \"\\\" // pas ici\"; /* vrai */\n", ["/* vrai */"]),
+    (".cpp", 'auto r = R"x(// )" pas ici)x"; // fin\n', ["// fin"]),
+    (".cpp", 'auto u = u8R"(/* pas ici */)"; /* non imbriqué /* */ x;\n', ["/* non imbriqué /* */"]),
+])
+def test_language_table(extension, source, expected):
+    assert _comments(extension, source) == expected
+
+
+def test_unterminated_simple_string_stops_at_end_of_line():
+    assert _comments(".c", 'char *s = "non fermée\n// vrai\n') == ["// vrai"]
+
+
+def test_python_comments_and_docstrings():
+    lines = [
+        '"""Module."""\n',
+        's = "# pas ici"  # vrai\n',
+        'def f():\n',
+        '    """Doc."""\n',
+        '    return f"{x}#"\n',
+    ]
+    spans = scan_python_comments(lines)
+    assert [(span.type, span.start_line) for span in spans] == [
+        ("python_doc", 0), ("python_single", 1), ("python_doc", 3)
+    ]
+
+
+@pytest.mark.parametrize("source, expected", [
+    ('def f(): \'doc\'\n', [("python_doc", 0)]),
+    ('class A:\n    r"""doc"""\n', [("python_doc", 1)]),
+    ('def f(\n    a,\n):  \\\n    "doc"\n', [("python_doc", 3)]),
+    ('x = "pas un docstring"\ndef f(a):\n    return a\n', []),
+])
+def test_python_prefilter_never_hides_a_docstring(source, expected):
+    spans = scan_python_comments(source.splitlines(keepends=True))
+    assert [(span.type, span.start_line) for span in spans] == expected
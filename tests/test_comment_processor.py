@@ -0,0 +1,53 @@
+from src.logic.comment_processor import strip_comments_from_file
+
+
+def _strip(tmp_path, source):
+    file_path = tmp_path / "module.py"
+    file_path.write_text(source, encoding="utf-8")
+    removed, _, error = strip_comments_from_file(str(file_path), set())
+    assert error is None
+    return removed, file_path.read_text(encoding="utf-8")
+
+
+def test_docstring_followed_by_statement_on_same_line(tmp_path):
+    removed, result = _strip(tmp_path, 'class A:\n    def g(self): "inline doc"; return 2\n')
+    assert removed == 1
+    assert result == "class A:\n    def g(self): return 2\n"
+    compile(result, "module.py", "exec")
+
+
+def test_docstring_alone_in_body_becomes_pass(tmp_path):
+    source = (
+        'class MyError(Exception):\n'
+        '    """doc"""\n'
+        '\n'
+        '\n'
+        'def f():\n'
+        '    """Only doc.\n'
+        '\n'
+        '    multi\n'
+        '    """\n'
+        '\n'
+        '\n'
+        'def h(): "one liner"\n'
+    )
+    removed, result = _strip(tmp_path, source)
+    assert removed == 3
+    assert result == (
+        'class MyError(Exception):\n'
+        '    pass\n'
+        '\n'
+        '\n'
+        'def f():\n'
+        '    pass\n'
+        '\n'
+        '\n'
+        'def h(): pass\n'
+    )
+    compile(result, "module.py", "exec")
+
+
+def test_docstring_before_other_statements_is_removed(tmp_path):
+    removed, result = _strip(tmp_path, 'def k():\n    """doc"""\n    return 3\n')
+    assert removed == 1
+    assert result == "def k():\n    return 3\n"
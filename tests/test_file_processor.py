@@ -0,0 +1,74 @@
+from src.logic import file_processor
+from src.logic.scan_stats import ScanStats
+
+
+def _write_lines(path, count):
+    lines = [f"ligne {i:06d}\n" for i in range(count)]
+    path.write_text("".join(lines))
+    return lines
+
+
+def _read(path, threshold):
+    return file_processor.read_file_block((str(path), path.name, False), True, file_processor.BINARY_LABEL,
+                                          threshold)
+
+
+def test_file_slightly_over_threshold_is_read_whole(tmp_path):
+    path = tmp_path / "moyen.txt"
+    lines = _write_lines(path, 3000)  # ~39 Ko : les deux extraits de 32 Kio le couvriraient
+
+    text = _read(path, 30_000)
+
+    assert text == f"-- {path.name} --\n" + "".join(lines) + "\n"
+
+
+def test_large_file_excerpt_omits_the_middle(tmp_path):
+    path = tmp_path / "gros.txt"
+    lines = _write_lines(path, 20000)
+
+    text = _read(path, 30_000)
+
+    assert text.startswith(f"-- [EXTRAIT] {path.name} --\n{lines[0]}")
+    assert lines[10000] not in text
+    assert text.rstrip("\n").endswith(lines[-1].rstrip("\n"))
+    omitted = int(text.split("fichier tronqué : ")[1].split(" ")[0])
+    assert 0 < omitted < len(lines)
+
+
+def _content(base_path, **options):
+    stats = ScanStats()
+    blocks = [(header, content) for _, header, content, _ in
+              file_processor.create_processor('content', str(base_path), stats=stats, **options)]
+    return blocks, stats
+
+
+def test_dedupe_replaces_identical_files_with_a_reference(tmp_path):
+    body = "contenu partagé assez long pour valoir un renvoi\n" * 3
+    (tmp_path / "a.txt").write_text(body, encoding="utf-8")
+    (tmp_path / "b.txt").write_text(body, encoding="utf-8")
+    (tmp_path / "c.txt").write_text("autre\n", encoding="utf-8")
+    (tmp_path / "d.txt").write_text(body, encoding="utf-8")
+
+    blocks, stats = _content(tmp_path, dedupe=True)
+
+    assert blocks[0] == ("-- a.txt --\n", body + "\n")
+    assert blocks[1] == ("\n-- [DOUBLON] b.txt --\n", "(Identique à a.txt)\n")
+    assert blocks[2] == ("\n-- c.txt --\n", "autre\n\n")
+    assert blocks[3] == ("\n-- [DOUBLON] d.txt --\n", "(Identique à a.txt)\n")
+    assert stats.duplicate_files == 2
+    assert file_processor.parse_duplicate_reference(blocks[1][1]) == "a.txt"
+
+
+def test_dedupe_keeps_small_duplicates_and_is_off_by_default(tmp_path):
+    (tmp_path / "a.txt").write_text("x\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("x\n", encoding="utf-8")
+
+    # Le renvoi serait plus long que le contenu : rien n'est remplacé
+    blocks, stats = _content(tmp_path, dedupe=True)
+    assert [header for header, _ in blocks] == ["-- a.txt --\n", "\n-- b.txt --\n"]
+    assert stats.duplicate_files == 0
+
+    (tmp_path / "a.txt").write_text("y\n" * 100, encoding="utf-8")
+    (tmp_path / "b.txt").write_text("y\n" * 100, encoding="utf-8")
+    blocks, _ = _content(tmp_path)
+    assert "DOUBLON" not in "".join(header for header, _ in blocks)
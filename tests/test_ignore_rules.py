@@ -0,0 +1,42 @@
+from src.logic.ignore_rules import IgnoreMatcher
+from src.logic.walker import walk_directory
+
+
+def test_file_negation_matches_exact_name():
+    matcher = IgnoreMatcher([".json", "!keep.json"], [])
+    assert not matcher.ignores_file("keep.json")
+    assert not matcher.ignores_file("keep.json", "config/")
+    assert matcher.ignores_file("mykeep.json")
+    assert matcher.ignores_file("data.json")
+
+
+def test_folder_negation_under_excluded_parent(tmp_path):
+    for relative_path in ("vendor/ma_lib/lib.py", "vendor/ma_lib/sub/deep.py", "vendor/other/b.py",
+                          "vendor/top.py", "src/main.py"):
+        file_path = tmp_path / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("x = 1\n", encoding="utf-8")
+
+    matcher = IgnoreMatcher([], ["vendor", "!vendor/ma_lib"])
+    found = sorted(relative_root + name
+                   for _, relative_root, _, files in walk_directory(str(tmp_path), matcher)
+                   for name in files)
+    assert found == ["src/main.py", "vendor/ma_lib/lib.py", "vendor/ma_lib/sub/deep.py"]
+
+
+def test_excluded_folder_without_negation_is_pruned():
+    matcher = IgnoreMatcher([], ["vendor", "!vendor/ma_lib"])
+    assert matcher.ignores_dir("node_modules") is False
+    assert matcher.ignores_dir("other", "vendor/")
+    assert not matcher.ignores_dir("ma_lib", "vendor/")
+    assert IgnoreMatcher([], ["vendor"]).ignores_dir("vendor")
+
+
+def test_folder_negation_under_excluded_path_pattern():
+    matcher = IgnoreMatcher([], ["ios/Pods", "!ios/Pods/Keep"])
+    assert not matcher.ignores_dir("Pods", "ios/")
+    assert matcher.ignores_dir("Other", "ios/Pods/")
+    assert not matcher.ignores_dir("Keep", "ios/Pods/")
+    assert not matcher.ignores_dir("sub", "ios/Pods/Keep/")
+    assert matcher.ignores_file("a.swift", "ios/Pods/")
+    assert not matcher.ignores_file("a.swift", "ios/Pods/Keep/sub/")
@@ -0,0 +1,51 @@
+import hashlib
+
+from src.logic.kept_comments import GLOBAL_SCOPE, KeptCommentStore
+
+
+def _hashes(count, salt=""):
+    return [hashlib.sha256(f"{salt}{i}".encode()).hexdigest() for i in range(count)]
+
+
+def _pages(store):
+    connection = store._connection
+    return (connection.execute("PRAGMA page_count").fetchone()[0],
+            connection.execute("PRAGMA freelist_count").fetchone()[0])
+
+
+def test_remove_many_only_touches_its_scope(tmp_path):
+    store = KeptCommentStore(str(tmp_path / "kept.sqlite3"))
+    hashes = _hashes(3)
+    store.add_many(hashes, GLOBAL_SCOPE)
+    store.add_many(hashes, "/projet")
+
+    assert store.remove_many(hashes[:2], "/projet") == 2
+    assert len(store) == 4
+    assert store.hashes_for("/projet") == set(hashes)
+    assert store.remove_many(hashes, GLOBAL_SCOPE) == 3
+    assert store.hashes_for("/projet") == {hashes[2]}
+    store.close()
+
+
+def test_clear_compacts_the_database(tmp_path):
+    db_path = str(tmp_path / "kept.sqlite3")
+    store = KeptCommentStore(db_path)
+    store.add_many(_hashes(5000), GLOBAL_SCOPE)
+    store.add_many(_hashes(5000, "p"), "/projet")
+    full_pages, _ = _pages(store)
+
+    assert store.clear("/projet") == 5000
+    assert len(store) == 5000
+    pages, free_pages = _pages(store)
+    assert free_pages == 0
+    assert pages < full_pages
+
+    assert store.clear() == 5000
+    assert len(store) == 0
+    assert _pages(store)[1] == 0
+    store.close()
+
+    # Les suppressions sont persistées
+    store = KeptCommentStore(db_path)
+    assert len(store) == 0
+    store.close()
@@ -0,0 +1,76 @@
+import threading
+
+from src.logic import file_processor
+from src.logic.comment_processor import write_lines_atomically
+from src.logic.live_scan import create_live_scan, shown_block
+from src.logic.output_store import OutputStore
+from src.logic.watcher import ChangeBatch, watch_changes
+
+
+def _scan(base_path, dedupe=False):
+    """Texte et blocs d'un scan en mode contenu, relevés comme le fait l'interface."""
+    text = []
+    blocks = []
+    for _, header, content, _ in file_processor.create_processor('content', str(base_path), dedupe=dedupe):
+        text.append(header + content)
+        blocks.append(shown_block(header, content))
+    return "".join(text), blocks
+
+
+def _next_batch(watcher, timeout=10):
+    stop = threading.Event()
+    timer = threading.Timer(timeout, stop.set)
+    timer.start()
+    try:
+        return next(watch_changes(watcher, stop), None)
+    finally:
+        timer.cancel()
+
+
+def test_atomic_replace_rereads_existing_block(tmp_path):
+    (tmp_path / "a.txt").write_text("one\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("other\n", encoding="utf-8")
+    text, blocks = _scan(tmp_path)
+    store = OutputStore()
+    store.append(text)
+
+    live_scan = create_live_scan('content', str(tmp_path), blocks)
+    watcher = live_scan.create_watcher()
+    try:
+        # Fichier temporaire voisin renommé par-dessus a.txt : seul un IN_MOVED_TO est émis
+        write_lines_atomically(str(tmp_path / "a.txt"), ["two\n"])
+        batch = _next_batch(watcher)
+    finally:
+        watcher.close()
+
+    assert batch is not None
+    edits = live_scan.apply(batch)
+    assert edits
+    for start, count, new_lines in edits:
+        store.replace_lines(start, count, new_lines)
+    assert store.get_text() == _scan(tmp_path)[0]
+    assert "two" in store.get_text() and "one" not in store.get_text()
+
+
+def _apply(live_scan, store, batch):
+    for start, count, new_lines in live_scan.apply(batch):
+        store.replace_lines(start, count, new_lines)
+
+
+def test_duplicate_blocks_are_reread_when_their_original_changes(tmp_path):
+    body = "une ligne assez longue pour valoir un renvoi\n"
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_text(body, encoding="utf-8")
+    text, blocks = _scan(tmp_path, dedupe=True)
+    assert "(Identique à a.txt)" in text
+    store = OutputStore()
+    store.append(text)
+    live_scan = create_live_scan('content', str(tmp_path), blocks, dedupe=True)
+
+    (tmp_path / "a.txt").write_text("modifié\n", encoding="utf-8")
+    _apply(live_scan, store, ChangeBatch({str(tmp_path / "a.txt")}, False, False))
+    assert store.get_text() == _scan(tmp_path)[0]
+
+    (tmp_path / "a.txt").unlink()
+    _apply(live_scan, store, ChangeBatch(set(), True, False))
+    assert store.get_text() == _scan(tmp_path)[0]
@@ -0,0 +1,51 @@
+from src.logic.output_store import LINES_PER_CHUNK, OutputStore
+
+
+def _store(line_count):
+    store = OutputStore()
+    store.append("".join(f"ligne {i}\n" for i in range(line_count)))
+    return store
+
+
+def test_iter_text_is_a_snapshot(tmp_path):
+    store = _store(3 * LINES_PER_CHUNK + 10)
+    expected = store.get_text()
+
+    chunks = store.iter_text()
+    store.replace_lines(5, 2, ["remplacée"])
+    store.append("ajoutée\n")
+    store.clear()
+
+    assert "".join(chunks) == expected
+
+
+def test_replace_lines_across_a_chunk_edge():
+    line_count = 2 * LINES_PER_CHUNK + 5
+    store = _store(line_count)
+    lines = [f"ligne {i}" for i in range(line_count)]
+
+    start = LINES_PER_CHUNK - 2
+    store.replace_lines(start, 4, ["a", "b"])
+    lines[start:start + 4] = ["a", "b"]
+    assert store.get_text() == "\n".join(lines) + "\n"
+    assert store.line_count == len(lines) + 1
+    assert len(store) == len(store.get_text())
+    assert store.get_lines(start - 1, 4) == "\n".join(lines[start - 1:start + 3])
+
+    # Insertion qui fait déborder un bloc sur le suivant
+    store.replace_lines(10, 0, ["x"] * LINES_PER_CHUNK)
+    lines[10:10] = ["x"] * LINES_PER_CHUNK
+    assert store.get_text() == "\n".join(lines) + "\n"
+
+
+def test_find_across_chunks():
+    store = _store(3 * LINES_PER_CHUNK)
+    store.append("fin partielle")
+    target = 2 * LINES_PER_CHUNK + 7
+
+    assert store.find(f"LIGNE {target}", 5) == (target, 0)
+    assert store.find("ligne 5", target, 0, backwards=True) == (599, 0)
+    assert store.find("ligne 0", LINES_PER_CHUNK, 0, backwards=True) == (0, 0)
+    assert store.find("partielle", 0) == (3 * LINES_PER_CHUNK, 4)
+    assert store.find("Ligne 1", 0, ignore_case=False) is None
+    assert store.find("introuvable", 0) is None
@@ -0,0 +1,55 @@
+import os
+
+from src.logic import file_processor
+from src.logic.scan_cache import ScanCache
+from src.logic.scan_stats import ScanStats
+
+
+def _scan(base_path, cache):
+    stats = ScanStats()
+    text = "".join(header + content for _, header, content, _ in
+                   file_processor.create_processor('content', str(base_path), cache=cache, stats=stats))
+    return text, stats.cache_hits
+
+
+def test_unchanged_files_are_served_from_the_cache(tmp_path):
+    (tmp_path / "a.txt").write_text("un\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("deux\n", encoding="utf-8")
+    cache = ScanCache()
+
+    first, hits = _scan(tmp_path, cache)
+    assert hits == 0 and len(cache) == 2
+    second, hits = _scan(tmp_path, cache)
+    assert second == first and hits == 2
+
+
+def test_mtime_or_size_change_invalidates_an_entry(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("abc\n", encoding="utf-8")
+    cache = ScanCache()
+    _scan(tmp_path, cache)
+
+    # Même taille, date différente
+    stat = os.stat(path)
+    path.write_text("xyz\n", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    text, hits = _scan(tmp_path, cache)
+    assert hits == 0 and "xyz" in text
+
+    # Même date, taille différente
+    stat = os.stat(path)
+    path.write_text("plus long\n", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    text, hits = _scan(tmp_path, cache)
+    assert hits == 0 and "plus long" in text
+
+
+def test_deleted_files_are_forgotten_after_a_complete_scan(tmp_path):
+    (tmp_path / "a.txt").write_text("un\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("deux\n", encoding="utf-8")
+    cache = ScanCache()
+    _scan(tmp_path, cache)
+
+    (tmp_path / "b.txt").unlink()
+    _scan(tmp_path, cache)
+    assert len(cache) == 1
@@ -0,0 +1,74 @@
+import queue
+import threading
+
+import pytest
+
+from src.logic.scan_channel import ScanChannel
+
+
+def _drain(channel):
+    messages = []
+    while True:
+        try:
+            messages.append(channel.get_nowait())
+        except queue.Empty:
+            return messages
+
+
+def test_put_blocks_until_the_consumer_catches_up():
+    channel = ScanChannel(budget_chars=10)
+    assert channel.put(("append", 1, "a" * 8), 8)
+    done = threading.Event()
+
+    def produce():
+        channel.put(("append", 1, "b" * 8), 8)
+        done.set()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    assert not done.wait(0.2)  # budget dépassé : le producteur attend
+
+    assert channel.get_nowait() == ("append", 1, "a" * 8)
+    assert done.wait(5)
+    assert channel.get_nowait() == ("append", 1, "b" * 8)
+    assert channel.peak_chars == 8
+
+
+def test_oversized_message_passes_alone():
+    channel = ScanChannel(budget_chars=4)
+    assert channel.put(("append", 1, "x" * 100), 100)
+    assert channel.get_nowait()[2] == "x" * 100
+    with pytest.raises(queue.Empty):
+        channel.get_nowait()
+
+
+def test_close_releases_a_blocked_producer():
+    channel = ScanChannel(budget_chars=4)
+    channel.put(("append", 1, "abcd"), 4)
+    results = []
+    producer = threading.Thread(target=lambda: results.append(channel.put(("append", 1, "efgh"), 4)),
+                                daemon=True)
+    producer.start()
+    channel.close()
+    producer.join(5)
+    assert results == [False]
+    assert channel.empty()
+
+
+def test_spill_keeps_order_without_blocking():
+    channel = ScanChannel(budget_chars=10, spill=True)
+    texts = [f"bloc {i} é\n" for i in range(50)]
+    for text in texts:
+        assert channel.put(("append", 7, text), len(text))
+    channel.put(("done", 7, None))
+
+    assert channel.spilled_chars > 0
+    messages = _drain(channel)
+    assert [text for _, _, text in messages[:-1]] == texts
+    assert messages[-1] == ("done", 7, None)
+
+    # Débordement entièrement relu : le fichier temporaire est vidé et réutilisé
+    channel.put(("append", 7, "a" * 8), 8)
+    channel.put(("append", 7, "b" * 8), 8)
+    assert [text for _, _, text in _drain(channel)] == ["a" * 8, "b" * 8]
+    channel.close()